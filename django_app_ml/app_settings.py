@@ -42,6 +42,198 @@ class AppSettings:
             secret_key=self.mlflow_bucket_secret_key,
         ) if self.storage_class == 'storages.backends.s3boto3.S3Boto3Storage' else FileSystemStorage()
     
+    # Dataset audit configuration
+    @property
+    def audit_backend(self):
+        """Default audit backend for datasets ('pandas' or 'arrow')"""
+        return self._setting('APP_ML_AUDIT_BACKEND', 'pandas')
+
+    @property
+    def audit_backends(self):
+        """Extra audit backends: name -> dotted path of a BaseDatasetAuditor subclass"""
+        return self._setting('APP_ML_AUDIT_BACKENDS', {})
+
+    @property
+    def audit_mode(self):
+        """Default audit mode: "memory" or "streaming" (chunked reads)"""
+        return self._setting('APP_ML_AUDIT_MODE', 'memory')
+
+    @property
+    def audit_chunk_size(self):
+        """Number of rows per chunk read by the streaming audit"""
+        return self._setting('APP_ML_AUDIT_CHUNK_SIZE', 100_000)
+
+    @property
+    def audit_tdigest_compression(self):
+        """t-digest compression used to estimate the median in streaming mode"""
+        return self._setting('APP_ML_AUDIT_TDIGEST_COMPRESSION', 200)
+
+    @property
+    def audit_categorical_mode(self):
+        """Categorical stats: "exact", "approximate" (sketches) or "auto" (by row count)"""
+        return self._setting('APP_ML_AUDIT_CATEGORICAL_MODE', 'auto')
+
+    @property
+    def audit_sketch_threshold(self):
+        """Row count above which "auto" categorical stats switch to sketches"""
+        return self._setting('APP_ML_AUDIT_SKETCH_THRESHOLD', 1_000_000)
+
+    @property
+    def audit_hll_precision(self):
+        """HyperLogLog precision (2**p registers) for approximate unique counts"""
+        return self._setting('APP_ML_AUDIT_HLL_PRECISION', 14)
+
+    @property
+    def audit_top_k_capacity(self):
+        """Space-Saving capacity for approximate top values"""
+        return self._setting('APP_ML_AUDIT_TOP_K_CAPACITY', 100)
+
+    @property
+    def audit_quick_sample_size(self):
+        """Number of rows sampled by the quick audit mode"""
+        return self._setting('APP_ML_AUDIT_QUICK_SAMPLE_SIZE', 50_000)
+
+    @property
+    def audit_quick_confidence(self):
+        """Confidence level of the intervals reported by the quick audit"""
+        return self._setting('APP_ML_AUDIT_QUICK_CONFIDENCE', 0.95)
+
+    @property
+    def audit_quick_follow_up(self):
+        """Enqueue a full audit after a quick audit completes"""
+        return self._setting('APP_ML_AUDIT_QUICK_FOLLOW_UP', True)
+
+    @property
+    def audit_workers(self):
+        """Number of processes the in-memory audit shards columns across (1 = sequential)"""
+        return self._setting('APP_ML_AUDIT_WORKERS', 1)
+
+    @property
+    def dataset_read_workers(self):
+        """Number of parts of a multi-file dataset read concurrently"""
+        return self._setting('APP_ML_DATASET_READ_WORKERS', 4)
+
+    @property
+    def audit_shared_memory_dir(self):
+        """Directory of the Arrow IPC file shared with audit workers (default /dev/shm)"""
+        return self._setting('APP_ML_AUDIT_SHARED_MEMORY_DIR', None)
+
+    @property
+    def audit_parquet_footer(self):
+        """Answer basic info and missing values from the Parquet footer statistics"""
+        return self._setting('APP_ML_AUDIT_PARQUET_FOOTER', True)
+
+    # CSV to Parquet conversion on ingest
+    @property
+    def ingest_convert_csv_to_parquet(self):
+        """Convert uploaded CSV datasets to Parquet stored next to the original"""
+        return self._setting('APP_ML_INGEST_CONVERT_CSV_TO_PARQUET', False)
+
+    @property
+    def csv_inference_sample_rows(self):
+        """Number of leading CSV rows used to infer the Parquet schema"""
+        return self._setting('APP_ML_CSV_INFERENCE_SAMPLE_ROWS', 10_000)
+
+    @property
+    def csv_column_types(self):
+        """Arrow types forced for CSV columns during conversion (column name -> type alias)"""
+        return self._setting('APP_ML_CSV_COLUMN_TYPES', {})
+
+    @property
+    def parquet_row_group_size(self):
+        """Number of rows per row group of the converted Parquet files"""
+        return self._setting('APP_ML_PARQUET_ROW_GROUP_SIZE', 500_000)
+
+    @property
+    def parquet_compression(self):
+        """Compression codec of the converted Parquet files"""
+        return self._setting('APP_ML_PARQUET_COMPRESSION', 'zstd')
+
+    # S3 clients and streaming uploads
+    @property
+    def s3_max_pool_connections(self):
+        """Size of the connection pool of each shared S3 client"""
+        return self._setting('APP_ML_S3_MAX_POOL_CONNECTIONS', 32)
+
+    @property
+    def s3_max_attempts(self):
+        """Maximum number of attempts of an S3 request (standard retry mode)"""
+        return self._setting('APP_ML_S3_MAX_ATTEMPTS', 5)
+
+    @property
+    def s3_reconcile_interval(self):
+        """Seconds between two runs of the self-rescheduling dataset S3 state reconciler"""
+        return self._setting('APP_ML_S3_RECONCILE_INTERVAL', 900)
+
+    @property
+    def upload_part_size(self):
+        """Size in bytes of the multipart transfer parts (at least 5 MiB)"""
+        return self._setting('APP_ML_UPLOAD_PART_SIZE', 64 * 1024 ** 2)
+
+    @property
+    def upload_max_workers(self):
+        """Number of multipart transfer parts sent or received concurrently"""
+        return self._setting('APP_ML_UPLOAD_MAX_WORKERS', 4)
+
+    @property
+    def s3_range_coalesce_gap(self):
+        """Largest gap in bytes between two ranges fetched in a single ranged GET"""
+        return self._setting('APP_ML_S3_RANGE_COALESCE_GAP', 1024 ** 2)
+
+    @property
+    def s3_range_max_size(self):
+        """Largest coalesced ranged GET in bytes, so big reads still run in parallel"""
+        return self._setting('APP_ML_S3_RANGE_MAX_SIZE', 32 * 1024 ** 2)
+
+    @property
+    def s3_range_max_workers(self):
+        """Number of ranged GETs of one object run concurrently"""
+        return self._setting('APP_ML_S3_RANGE_MAX_WORKERS', 8)
+
+    @property
+    def s3_multipart_threshold(self):
+        """Size in bytes above which file transfers switch to multipart"""
+        return self._setting('APP_ML_S3_MULTIPART_THRESHOLD', 64 * 1024 ** 2)
+
+    @property
+    def s3_max_bandwidth(self):
+        """Maximum bandwidth in bytes per second of a file transfer (None = unlimited)"""
+        return self._setting('APP_ML_S3_MAX_BANDWIDTH', None)
+
+    # Kaggle ingest
+    @property
+    def kaggle_upload_concurrency(self):
+        """Number of files of a Kaggle archive uploaded concurrently"""
+        return self._setting('APP_ML_KAGGLE_UPLOAD_CONCURRENCY', 4)
+
+    @property
+    def kaggle_upload_retries(self):
+        """Extra attempts for a Kaggle file whose upload failed"""
+        return self._setting('APP_ML_KAGGLE_UPLOAD_RETRIES', 3)
+
+    @property
+    def kaggle_download_dir(self):
+        """Directory receiving the Kaggle archives while they are ingested (default system temp dir)"""
+        return self._setting('APP_ML_KAGGLE_DOWNLOAD_DIR', None)
+
+    # Local S3 object cache configuration
+    @property
+    def s3_cache_enabled(self):
+        """Serve S3 datasets from a local on-disk copy revalidated by ETag (opt-in: uses local disk)"""
+        return self._setting('APP_ML_S3_CACHE_ENABLED', False)
+
+    @property
+    def s3_cache_dir(self):
+        """Directory holding the cached S3 objects (defaults to a temporary directory)"""
+        import os
+        import tempfile
+        return self._setting('APP_ML_S3_CACHE_DIR', os.path.join(tempfile.gettempdir(), "app_ml_s3_cache"))
+
+    @property
+    def s3_cache_max_size(self):
+        """Maximum size in bytes of the S3 object cache, least recently used objects are evicted"""
+        return self._setting('APP_ML_S3_CACHE_MAX_SIZE', 10 * 1024 ** 3)
+
     # Template configuration
     @property
     def templates_dir(self):
@@ -94,6 +286,57 @@ class AppSettings:
         """Notebook viewer template name"""
         return self._setting('APP_ML_NOTEBOOK_VIEWER_TEMPLATE_NAME', 'django_app_ml/notebook_viewer.html')
     
+    @property
+    def redis_max_connections(self):
+        """Maximum Redis connections per process for the result backend and task events"""
+        return self._setting('APP_ML_REDIS_MAX_CONNECTIONS', 20)
+
+    @property
+    def redis_pool_timeout(self):
+        """Seconds to wait for a free Redis connection before failing"""
+        return self._setting('APP_ML_REDIS_POOL_TIMEOUT', 5)
+
+    @property
+    def redis_health_check_interval(self):
+        """Seconds after which an idle Redis connection is PINGed before reuse"""
+        return self._setting('APP_ML_REDIS_HEALTH_CHECK_INTERVAL', 30)
+
+    @property
+    def redis_socket_timeout(self):
+        """Redis connect and read timeout in seconds"""
+        return self._setting('APP_ML_REDIS_SOCKET_TIMEOUT', 5)
+
+    @property
+    def redis_retries(self):
+        """Retries, with reconnection, of Redis commands failing on a connection error"""
+        return self._setting('APP_ML_REDIS_RETRIES', 3)
+
+    @property
+    def task_events_redis_url(self):
+        """Redis URL used for task status events (default: settings.REDIS_URL)"""
+        from django.conf import settings
+        return self._setting('APP_ML_TASK_EVENTS_REDIS_URL', None) or getattr(settings, 'REDIS_URL', 'redis://localhost:6379/0')
+
+    @property
+    def task_events_ttl(self):
+        """Seconds the last status event of a task is kept for late subscribers"""
+        return self._setting('APP_ML_TASK_EVENTS_TTL', 3600)
+
+    @property
+    def task_events_timeout(self):
+        """Seconds a task event stream stays open before the client reconnects"""
+        return self._setting('APP_ML_TASK_EVENTS_TIMEOUT', 300)
+
+    @property
+    def task_events_heartbeat(self):
+        """Seconds between keep-alive comments on an idle task event stream"""
+        return self._setting('APP_ML_TASK_EVENTS_HEARTBEAT', 15)
+
+    @property
+    def task_status_batch_max(self):
+        """Maximum number of task ids accepted by one batch status request"""
+        return self._setting('APP_ML_TASK_STATUS_BATCH_MAX', 200)
+
     @property
     def mlflow_train_template_name(self):
         """MLflow training template name"""
@@ -10,7 +10,7 @@ class MlAppConfig(AppConfig):
 
     def ready(self):
         """
-        Set the default media storage to the app_settings.storage
+        Set the default media storage to the app_settings.storage and connect signal handlers
         """
         from django.conf import settings
         settings.DEFAULT_MEDIA_STORAGE = app_settings.storage
@@ -18,4 +18,6 @@ class MlAppConfig(AppConfig):
             logger.warning("django_app_ml is installed without storages not installed")
             logger.info("Adding storages to INSTALLED_APPS")
             settings.INSTALLED_APPS.append("storages")
+        # Invalidate shared S3 clients when a Bucket changes
+        from django_app_ml import signals  # noqa: F401
 
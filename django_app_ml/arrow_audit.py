@@ -0,0 +1,175 @@
+"""
+Backend d'audit Arrow
+
+Le dataset est lu en ``pyarrow.Table`` et toutes les statistiques sont calculées
+avec ``pyarrow.compute`` : les colonnes de chaînes ne sont jamais converties en
+``object`` pandas. Le rapport produit est identique à celui de
+``PandasDatasetAuditor`` (mêmes types de colonnes au sens pandas), à l'exception
+de ``memory_usage`` qui mesure ici la taille des buffers Arrow.
+"""
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .app_settings import app_settings
+from .audit_accumulators import CategoricalColumnAccumulator, is_numeric_dtype
+from .dataset_audit import BaseDatasetAuditor, CATEGORICAL_MODES, pandas_column_types
+from .logging import get_logger
+from .schema.audit import (
+    AuditReport,
+    BasicInfo,
+    MissingValues,
+    DescriptiveStats,
+    CategoricalStats,
+    DescriptiveStatsColumn,
+    CategoricalStatsColumn,
+)
+
+logger = get_logger(__name__)
+
+
+def _as_float(value) -> float:
+    return np.nan if value is None else float(value)
+
+
+class ArrowDatasetAuditor(BaseDatasetAuditor):
+    """
+    Auditeur gardant les données au format Arrow de bout en bout
+    """
+
+    auditor_type = "arrow"
+    supported_modes = ("memory",)
+
+    def load_table(self, dataset_path: str) -> pa.Table:
+        """
+        Charge un dataset (parquet ou csv, local ou S3) en ``pyarrow.Table``
+        """
+        import pyarrow.csv as pv
+        import pyarrow.parquet as pq
+
+        if not dataset_path.endswith((".parquet", ".csv")):
+            raise ValueError(f"Format de fichier non supporté: {dataset_path}")
+        with self.open_source(dataset_path) as f:
+            if dataset_path.endswith(".parquet"):
+                table = pq.read_table(f)
+            else:
+                # Mêmes conventions que pandas.read_csv : chaînes vides = valeurs
+                # manquantes, dates laissées sous forme de chaînes, colonnes
+                # entièrement vides en float64
+                table = pv.read_csv(f, convert_options=pv.ConvertOptions(strings_can_be_null=True))
+                for i, field in enumerate(table.schema):
+                    if pa.types.is_temporal(field.type):
+                        table = table.set_column(i, field.name, pc.cast(table.column(i), pa.string()))
+                    elif pa.types.is_null(field.type):
+                        table = table.set_column(i, field.name, pc.cast(table.column(i), pa.float64()))
+        logger.info(f"Dataset chargé avec succès en Arrow: {dataset_path}")
+        return table
+
+    @staticmethod
+    def _missing_mask(column: pa.ChunkedArray) -> pa.ChunkedArray:
+        # pandas compte les NaN comme valeurs manquantes
+        return pc.is_null(column, nan_is_null=True)
+
+    @staticmethod
+    def _valid_floats(column: pa.ChunkedArray) -> pa.ChunkedArray:
+        values = pc.cast(column, pa.float64())
+        return pc.drop_null(pc.if_else(pc.is_nan(values), None, values))
+
+    def get_missing_values(self, table: pa.Table) -> MissingValues:
+        return MissingValues({
+            name: int(pc.sum(self._missing_mask(table.column(name))).as_py() or 0)
+            for name in table.column_names
+        })
+
+    def get_basic_info(self, table: pa.Table, missing_values: MissingValues) -> BasicInfo:
+        return BasicInfo(
+            row_count=table.num_rows,
+            column_count=table.num_columns,
+            column_names=list(table.column_names),
+            column_types=pandas_column_types(table.schema, missing_values.root),
+            memory_usage=table.nbytes,
+        )
+
+    def get_descriptive_stats(self, table: pa.Table, numeric_columns: List[str]) -> DescriptiveStats:
+        stats = {}
+        for col in numeric_columns:
+            values = self._valid_floats(table.column(col))
+            if len(values) == 0:
+                stats[col] = DescriptiveStatsColumn(mean=np.nan, std=np.nan, min=np.nan, max=np.nan, median=np.nan)
+                continue
+            min_max = pc.min_max(values).as_py()
+            stats[col] = DescriptiveStatsColumn(
+                mean=_as_float(pc.mean(values).as_py()),
+                std=_as_float(pc.stddev(values, ddof=1).as_py()) if len(values) > 1 else np.nan,
+                min=_as_float(min_max["min"]),
+                max=_as_float(min_max["max"]),
+                median=_as_float(pc.quantile(values, q=0.5, interpolation="linear")[0].as_py()),
+            )
+        return DescriptiveStats(stats)
+
+    def get_categorical_stats(self, table: pa.Table, categorical_columns: List[str]) -> CategoricalStats:
+        categorical_mode = app_settings.audit_categorical_mode
+        if categorical_mode not in CATEGORICAL_MODES:
+            raise ValueError(f"Mode catégoriel non supporté: {categorical_mode}")
+        approximate = categorical_mode == "approximate" or (
+            categorical_mode == "auto" and table.num_rows > app_settings.audit_sketch_threshold
+        )
+
+        stats = {}
+        for col in categorical_columns:
+            counts = pc.value_counts(pc.drop_null(table.column(col)))
+            if approximate:
+                # Sketches alimentés par les effectifs Arrow, sans conversion pandas de la colonne
+                values = counts.field("values")
+                if pa.types.is_dictionary(values.type):
+                    values = values.dictionary_decode()
+                accumulator = CategoricalColumnAccumulator(
+                    approximate=True,
+                    hll_precision=app_settings.audit_hll_precision,
+                    top_k_capacity=app_settings.audit_top_k_capacity,
+                )
+                accumulator.update_counts(pd.Series(
+                    counts.field("counts").to_numpy(zero_copy_only=False),
+                    index=values.to_numpy(zero_copy_only=False),
+                ))
+                stats[col] = accumulator.to_schema()
+                continue
+            # Tri stable : à effectif égal, ordre de première apparition comme pandas
+            order = pc.sort_indices(counts.field("counts"), sort_keys=[("", "descending")])
+            ranked = counts.take(order)
+            values = ranked.field("values").to_pylist()
+            frequencies = ranked.field("counts").to_pylist()
+            stats[col] = CategoricalStatsColumn(
+                unique_count=len(counts),
+                top_values=dict(zip(values[:10], frequencies[:10])),
+            )
+        return CategoricalStats(stats)
+
+    def audit_table(self, table: pa.Table, dataset_path: str) -> AuditReport:
+        """
+        Audit d'une table Arrow déjà chargée
+        """
+        missing_values = self.get_missing_values(table)
+        basic_info = self.get_basic_info(table, missing_values)
+        numeric_columns = [col for col, dtype in basic_info.column_types.items() if is_numeric_dtype(dtype)]
+        # Même sélection que pandas ``select_dtypes(include=["object", "category"])``
+        string_columns = table.schema.empty_table().to_pandas().select_dtypes(
+            include=["object", "category"]
+        ).columns
+        categorical_columns = [
+            col for col, dtype in basic_info.column_types.items() if col in string_columns or dtype == "object"
+        ]
+        return AuditReport(
+            dataset_path=dataset_path,
+            auditor_type=self.auditor_type,
+            basic_info=basic_info,
+            missing_values=missing_values,
+            descriptive_stats=self.get_descriptive_stats(table, numeric_columns),
+            categorical_stats=self.get_categorical_stats(table, categorical_columns),
+        )
+
+    def run_audit(self, dataset_path: str, mode: str, **options) -> AuditReport:
+        return self.audit_table(self.load_table(dataset_path), dataset_path)
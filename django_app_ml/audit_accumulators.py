@@ -0,0 +1,498 @@
+"""
+Accumulateurs fusionnables pour l'audit de dataset en streaming.
+
+Chaque accumulateur consomme un DataFrame (un chunk CSV ou un batch Parquet)
+via ``update`` et peut être combiné avec un autre accumulateur via ``merge``.
+La mémoire consommée ne dépend que de la taille d'un chunk et du nombre de
+colonnes, jamais du nombre total de lignes du dataset.
+
+L'état de chaque accumulateur s'exporte en JSON (``to_state`` / ``from_state``)
+pour être enregistré avec l'``AuditReport`` et repris lors d'un audit incrémental.
+"""
+import warnings
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .schema.audit import (
+    AuditReport,
+    BasicInfo,
+    MissingValues,
+    DescriptiveStats,
+    CategoricalStats,
+    DescriptiveStatsColumn,
+    CategoricalStatsColumn,
+    CategoricalErrorBound,
+)
+from .sketches import HyperLogLog, SpaceSaving, TDigest, hash_values
+
+NUMERIC_KINDS = "iuf"
+
+
+def merge_dtypes(left: Optional[str], right: str) -> str:
+    """
+    Réconcilie le type d'une colonne observé sur deux chunks différents
+
+    Un chunk CSV sans valeur manquante est lu en ``int64`` alors que le suivant
+    peut l'être en ``float64`` : on promeut comme le ferait ``pd.concat``.
+    """
+    if left is None or left == right:
+        return right
+    try:
+        left_dtype, right_dtype = np.dtype(left), np.dtype(right)
+    except TypeError:
+        return "object"
+    if left_dtype.kind in NUMERIC_KINDS and right_dtype.kind in NUMERIC_KINDS:
+        return str(np.promote_types(left_dtype, right_dtype))
+    return "object"
+
+
+def _to_json(value):
+    """
+    Scalaire sérialisable en JSON (types numpy convertis, NaN remplacé par None)
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def _from_json(value) -> float:
+    return np.nan if value is None else value
+
+
+def is_numeric_dtype(dtype: str) -> bool:
+    try:
+        return np.dtype(dtype).kind in NUMERIC_KINDS
+    except TypeError:
+        return pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(dtype))
+
+
+class BasicInfoAccumulator:
+    """
+    Nombre de lignes, colonnes, types et mémoire cumulés sur les chunks
+    """
+
+    def __init__(self):
+        self.row_count = 0
+        self.column_names: List[str] = []
+        self.column_types: Dict[str, str] = {}
+        self.memory_usage = 0
+
+    def _add_columns(self, column_types: Dict[str, str]):
+        for col, dtype in column_types.items():
+            if col not in self.column_types:
+                self.column_names.append(col)
+            self.column_types[col] = merge_dtypes(self.column_types.get(col), dtype)
+
+    def update(self, df: pd.DataFrame):
+        self.row_count += len(df)
+        self.memory_usage += int(df.memory_usage(deep=True).sum())
+        self._add_columns(df.dtypes.astype(str).to_dict())
+
+    def merge(self, other: "BasicInfoAccumulator"):
+        self.row_count += other.row_count
+        self.memory_usage += other.memory_usage
+        self._add_columns({col: other.column_types[col] for col in other.column_names})
+
+    def to_schema(self) -> BasicInfo:
+        return BasicInfo(
+            row_count=self.row_count,
+            column_count=len(self.column_names),
+            column_names=list(self.column_names),
+            column_types=dict(self.column_types),
+            memory_usage=self.memory_usage,
+        )
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "row_count": self.row_count,
+            "column_names": list(self.column_names),
+            "column_types": dict(self.column_types),
+            "memory_usage": self.memory_usage,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "BasicInfoAccumulator":
+        accumulator = cls()
+        accumulator.row_count = state["row_count"]
+        accumulator.column_names = list(state["column_names"])
+        accumulator.column_types = dict(state["column_types"])
+        accumulator.memory_usage = state["memory_usage"]
+        return accumulator
+
+
+class MissingValuesAccumulator:
+    """
+    Nombre de valeurs manquantes par colonne
+    """
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+
+    def update(self, df: pd.DataFrame):
+        for col, count in df.isnull().sum().items():
+            self.counts[col] = self.counts.get(col, 0) + int(count)
+
+    def merge(self, other: "MissingValuesAccumulator"):
+        for col, count in other.counts.items():
+            self.counts[col] = self.counts.get(col, 0) + count
+
+    def to_schema(self) -> MissingValues:
+        return MissingValues(dict(self.counts))
+
+    def to_state(self) -> Dict[str, Any]:
+        return dict(self.counts)
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "MissingValuesAccumulator":
+        accumulator = cls()
+        accumulator.counts = dict(state)
+        return accumulator
+
+
+class NumericColumnAccumulator:
+    """
+    Moments d'une colonne numérique, fusionnés avec la formule de Chan et al.
+
+    La médiane est estimée par un t-digest de taille bornée.
+    """
+
+    def __init__(self, compression: int = 200):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+        self.digest = TDigest(compression)
+
+    def merge_moments(self, count: int, mean: float, m2: float, vmin: float, vmax: float):
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = vmin if np.isnan(self.min) else min(self.min, vmin)
+        self.max = vmax if np.isnan(self.max) else max(self.max, vmax)
+
+    def update(self, series: pd.Series):
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        mean = float(values.mean())
+        self.merge_moments(
+            len(values),
+            mean,
+            float(((values - mean) ** 2).sum()),
+            float(values.min()),
+            float(values.max()),
+        )
+        self.digest.update(values)
+
+    def merge(self, other: "NumericColumnAccumulator"):
+        self.merge_moments(other.count, other.mean, other.m2, other.min, other.max)
+        self.digest.merge(other.digest)
+
+    def to_schema(self) -> DescriptiveStatsColumn:
+        if self.count == 0:
+            return DescriptiveStatsColumn(mean=np.nan, std=np.nan, min=np.nan, max=np.nan, median=np.nan)
+        std = float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan
+        return DescriptiveStatsColumn(
+            mean=self.mean,
+            std=std,
+            min=self.min,
+            max=self.max,
+            median=self.digest.quantile(0.5),
+        )
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": _to_json(self.mean),
+            "m2": _to_json(self.m2),
+            "min": _to_json(self.min),
+            "max": _to_json(self.max),
+            "digest": self.digest.to_state(),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "NumericColumnAccumulator":
+        accumulator = cls(state["digest"]["compression"])
+        accumulator.count = state["count"]
+        accumulator.mean = _from_json(state["mean"])
+        accumulator.m2 = _from_json(state["m2"])
+        accumulator.min = _from_json(state["min"])
+        accumulator.max = _from_json(state["max"])
+        accumulator.digest = TDigest.from_state(state["digest"])
+        return accumulator
+
+
+class CategoricalColumnAccumulator:
+    """
+    Statistiques d'une colonne catégorielle, exactes ou approximées
+
+    En mode exact les modalités sont comptées dans un ``Counter``. En mode
+    approximé (``approximate=True``, ou dès que ``sketch_threshold`` valeurs
+    ont été vues), la colonne bascule sur un HyperLogLog pour ``unique_count``
+    et un résumé Space-Saving pour ``top_values`` : la mémoire ne dépend plus
+    de la cardinalité.
+    """
+
+    def __init__(
+        self,
+        approximate: bool = False,
+        sketch_threshold: Optional[int] = None,
+        hll_precision: int = 14,
+        top_k_capacity: int = 100,
+    ):
+        self.sketch_threshold = sketch_threshold
+        self.hll_precision = hll_precision
+        self.top_k_capacity = top_k_capacity
+        self.seen = 0
+        self.counts: Optional[Counter] = Counter()
+        self.hll: Optional[HyperLogLog] = None
+        self.heavy_hitters: Optional[SpaceSaving] = None
+        if approximate:
+            self._switch_to_sketches()
+
+    @property
+    def approximate(self) -> bool:
+        return self.counts is None
+
+    def _sketches_from_counts(self, counts: Counter):
+        hll = HyperLogLog(self.hll_precision)
+        if counts:
+            hll.update(list(counts.keys()))
+            heavy_hitters = SpaceSaving.from_counts(pd.Series(counts), self.top_k_capacity)
+        else:
+            heavy_hitters = SpaceSaving(self.top_k_capacity)
+        return hll, heavy_hitters
+
+    def _switch_to_sketches(self):
+        self.hll, self.heavy_hitters = self._sketches_from_counts(self.counts)
+        self.counts = None
+
+    def update(self, series: pd.Series):
+        self.update_counts(series.value_counts())
+
+    def update_counts(self, counts: pd.Series):
+        """
+        Ajoute des effectifs déjà agrégés (index : modalités, valeurs : effectifs)
+
+        Les sketches ne voient que les modalités distinctes : le HyperLogLog est
+        insensible aux doublons et le Space-Saving se construit depuis les effectifs.
+        """
+        # Une colonne ``category`` compte aussi ses catégories absentes (à 0)
+        counts = counts[counts > 0]
+        self.seen += int(counts.sum())
+        if self.approximate:
+            self.hll.update_hashes(hash_values(counts.index))
+            self.heavy_hitters.merge(SpaceSaving.from_counts(counts, self.top_k_capacity))
+            return
+        self.counts.update(counts.to_dict())
+        if self.sketch_threshold is not None and self.seen > self.sketch_threshold:
+            self._switch_to_sketches()
+
+    def merge(self, other: "CategoricalColumnAccumulator"):
+        self.seen += other.seen
+        if not self.approximate and not other.approximate:
+            self.counts.update(other.counts)
+            if self.sketch_threshold is not None and self.seen > self.sketch_threshold:
+                self._switch_to_sketches()
+            return
+        if not self.approximate:
+            self._switch_to_sketches()
+        if other.approximate:
+            hll, heavy_hitters = other.hll, other.heavy_hitters
+        else:
+            hll, heavy_hitters = self._sketches_from_counts(other.counts)
+        self.hll.merge(hll)
+        self.heavy_hitters.merge(heavy_hitters)
+
+    def to_schema(self, top: int = 10) -> CategoricalStatsColumn:
+        if not self.approximate:
+            return CategoricalStatsColumn(
+                unique_count=len(self.counts),
+                top_values=dict(self.counts.most_common(top)),
+            )
+        return CategoricalStatsColumn(
+            unique_count=self.hll.count(),
+            top_values=dict(self.heavy_hitters.top(top)),
+            error_bound=CategoricalErrorBound(
+                unique_count_relative_error=self.hll.relative_error,
+                top_values_max_error=self.heavy_hitters.max_error(top),
+            ),
+        )
+
+    def to_state(self) -> Dict[str, Any]:
+        state = {
+            "sketch_threshold": self.sketch_threshold,
+            "hll_precision": self.hll_precision,
+            "top_k_capacity": self.top_k_capacity,
+            "seen": self.seen,
+        }
+        if self.approximate:
+            state["hll"] = self.hll.to_state()
+            state["heavy_hitters"] = self.heavy_hitters.to_state()
+        else:
+            # Liste de paires : les modalités ne sont pas forcément des chaînes
+            state["counts"] = [[_to_json(value), count] for value, count in self.counts.items()]
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "CategoricalColumnAccumulator":
+        accumulator = cls(
+            sketch_threshold=state["sketch_threshold"],
+            hll_precision=state["hll_precision"],
+            top_k_capacity=state["top_k_capacity"],
+        )
+        accumulator.seen = state["seen"]
+        if "counts" in state:
+            accumulator.counts = Counter({value: count for value, count in state["counts"]})
+        else:
+            accumulator.counts = None
+            accumulator.hll = HyperLogLog.from_state(state["hll"])
+            accumulator.heavy_hitters = SpaceSaving.from_state(state["heavy_hitters"])
+        return accumulator
+
+
+class AuditAccumulator:
+    """
+    Regroupe les accumulateurs de chaque section de l'``AuditReport``
+    """
+
+    def __init__(
+        self,
+        tdigest_compression: int = 200,
+        categorical_mode: str = "exact",
+        sketch_threshold: int = 1_000_000,
+        hll_precision: int = 14,
+        top_k_capacity: int = 100,
+    ):
+        self.tdigest_compression = tdigest_compression
+        self.categorical_mode = categorical_mode
+        self.sketch_threshold = sketch_threshold
+        self.hll_precision = hll_precision
+        self.top_k_capacity = top_k_capacity
+        self.basic_info = BasicInfoAccumulator()
+        self.missing_values = MissingValuesAccumulator()
+        self.numeric: Dict[str, NumericColumnAccumulator] = {}
+        self.categorical: Dict[str, CategoricalColumnAccumulator] = {}
+
+    def _categorical_accumulator(self) -> CategoricalColumnAccumulator:
+        return CategoricalColumnAccumulator(
+            approximate=self.categorical_mode == "approximate",
+            sketch_threshold=self.sketch_threshold if self.categorical_mode == "auto" else None,
+            hll_precision=self.hll_precision,
+            top_k_capacity=self.top_k_capacity,
+        )
+
+    def update(self, df: pd.DataFrame):
+        """
+        Intègre un chunk dans l'état courant
+        """
+        self.basic_info.update(df)
+        self.missing_values.update(df)
+        self._update_numeric(df.select_dtypes(include=["number"]))
+        for col in df.select_dtypes(include=["object", "category"]).columns:
+            self.categorical.setdefault(col, self._categorical_accumulator()).update(df[col])
+
+    def _update_numeric(self, numeric: pd.DataFrame):
+        """
+        Moments de toutes les colonnes numériques du chunk en une passe NumPy
+        """
+        if numeric.shape[1] == 0:
+            return
+        block = numeric.to_numpy(dtype="float64", na_value=np.nan)
+        with warnings.catch_warnings():
+            # Colonnes entièrement vides dans ce chunk
+            warnings.simplefilter("ignore", RuntimeWarning)
+            counts = np.count_nonzero(~np.isnan(block), axis=0)
+            means = np.nanmean(block, axis=0)
+            m2s = np.nansum((block - means) ** 2, axis=0)
+            mins = np.nanmin(block, axis=0)
+            maxs = np.nanmax(block, axis=0)
+        for i, col in enumerate(numeric.columns):
+            accumulator = self.numeric.setdefault(col, NumericColumnAccumulator(self.tdigest_compression))
+            if counts[i] == 0:
+                continue
+            accumulator.merge_moments(int(counts[i]), means[i], m2s[i], mins[i], maxs[i])
+            accumulator.digest.update(block[:, i])
+
+    def merge(self, other: "AuditAccumulator"):
+        """
+        Fusionne l'état d'un autre accumulateur (autre worker, autre fichier)
+        """
+        self.basic_info.merge(other.basic_info)
+        self.missing_values.merge(other.missing_values)
+        for col, acc in other.numeric.items():
+            self.numeric.setdefault(col, NumericColumnAccumulator(self.tdigest_compression)).merge(acc)
+        for col, acc in other.categorical.items():
+            self.categorical.setdefault(col, self._categorical_accumulator()).merge(acc)
+
+    def get_descriptive_stats(self) -> DescriptiveStats:
+        column_types = self.basic_info.column_types
+        return DescriptiveStats({
+            col: acc.to_schema()
+            for col, acc in self.numeric.items()
+            if is_numeric_dtype(column_types[col])
+        })
+
+    def get_categorical_stats(self) -> CategoricalStats:
+        column_types = self.basic_info.column_types
+        return CategoricalStats({
+            col: acc.to_schema()
+            for col, acc in self.categorical.items()
+            if not is_numeric_dtype(column_types[col])
+        })
+
+    def to_report(self, dataset_path: str, auditor_type: str = "pandas") -> AuditReport:
+        return AuditReport(
+            dataset_path=dataset_path,
+            auditor_type=auditor_type,
+            basic_info=self.basic_info.to_schema(),
+            missing_values=self.missing_values.to_schema(),
+            descriptive_stats=self.get_descriptive_stats(),
+            categorical_stats=self.get_categorical_stats(),
+        )
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        État JSON complet, à persister pour reprendre l'audit plus tard
+        """
+        return {
+            "tdigest_compression": self.tdigest_compression,
+            "categorical_mode": self.categorical_mode,
+            "sketch_threshold": self.sketch_threshold,
+            "hll_precision": self.hll_precision,
+            "top_k_capacity": self.top_k_capacity,
+            "basic_info": self.basic_info.to_state(),
+            "missing_values": self.missing_values.to_state(),
+            "numeric": {col: acc.to_state() for col, acc in self.numeric.items()},
+            "categorical": {col: acc.to_state() for col, acc in self.categorical.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "AuditAccumulator":
+        accumulator = cls(
+            tdigest_compression=state["tdigest_compression"],
+            categorical_mode=state["categorical_mode"],
+            sketch_threshold=state["sketch_threshold"],
+            hll_precision=state["hll_precision"],
+            top_k_capacity=state["top_k_capacity"],
+        )
+        accumulator.basic_info = BasicInfoAccumulator.from_state(state["basic_info"])
+        accumulator.missing_values = MissingValuesAccumulator.from_state(state["missing_values"])
+        accumulator.numeric = {
+            col: NumericColumnAccumulator.from_state(acc) for col, acc in state["numeric"].items()
+        }
+        accumulator.categorical = {
+            col: CategoricalColumnAccumulator.from_state(acc) for col, acc in state["categorical"].items()
+        }
+        return accumulator
@@ -0,0 +1,178 @@
+"""
+Cache des rapports d'audit adressé par le contenu du dataset
+
+Un rapport d'audit est associé à une empreinte du contenu effectivement
+audité (``DataSet.read_location``, soit la copie Parquet convertie à
+l'ingestion quand elle existe) : ETag, taille et date de modification pour un
+objet S3 (obtenus par un simple HEAD), SHA-256 pour un fichier local, ETags
+et tailles actuels des parts pour un dataset multi-fichiers (un listing par
+préfixe, voir ``object_states``). L'empreinte inclut aussi la configuration
+de l'audit (backend du dataset, mode catégoriel et paramètres des sketches) :
+un rapport calculé avec une autre configuration n'est pas réutilisé. Tant que
+l'empreinte ne change pas, le dernier ``AuditReport`` enregistré est renvoyé
+sans relancer d'audit.
+
+Le SHA-256 d'un fichier local est mémorisé dans le cache Django par chemin,
+taille et date de modification : il n'est recalculé que si le fichier change.
+"""
+import hashlib
+import json
+import os
+from typing import Optional
+
+from .app_settings import app_settings
+from .logging import get_logger
+from .s3 import object_states
+
+logger = get_logger(__name__)
+
+HITS_KEY = "app_ml:audit_cache:hits"
+MISSES_KEY = "app_ml:audit_cache:misses"
+FILE_HASH_KEY = "app_ml:audit_cache:sha256:{}"
+
+
+def _file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _memoized_file_sha256(path: str) -> str:
+    """
+    SHA-256 d'un fichier local, recalculé seulement si sa taille ou sa date de modification change
+    """
+    from django.core.cache import cache
+
+    stat = os.stat(path)
+    identity = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    key = FILE_HASH_KEY.format(hashlib.sha256(identity.encode("utf-8")).hexdigest())
+    try:
+        digest = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Impossible de lire l'empreinte mémorisée de {path}: {e}")
+        digest = None
+    if digest is None:
+        digest = _file_sha256(path)
+        try:
+            cache.set(key, digest, timeout=None)
+        except Exception as e:
+            logger.warning(f"Impossible de mémoriser l'empreinte de {path}: {e}")
+    return digest
+
+
+def audit_config_fingerprint(dataset) -> str:
+    """
+    Empreinte des paramètres qui changent le contenu d'un rapport d'audit
+    """
+    config = {
+        "auditor": getattr(dataset, "auditor", None),
+        "categorical_mode": app_settings.audit_categorical_mode,
+        "sketch_threshold": app_settings.audit_sketch_threshold,
+        "hll_precision": app_settings.audit_hll_precision,
+        "top_k_capacity": app_settings.audit_top_k_capacity,
+        "tdigest_compression": app_settings.audit_tdigest_compression,
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def dataset_content_fingerprint(dataset) -> Optional[str]:
+    """
+    Calcule l'empreinte du contenu d'un dataset, sans la configuration d'audit
+
+    Args:
+        dataset: Instance de ``DataSet``
+
+    Returns:
+        str: Empreinte, ou None si le contenu ne peut pas être identifié
+        (URL HTTP, objet inaccessible) ; le dataset n'est alors pas mis en cache
+    """
+    location = dataset.read_location or ""
+    try:
+        if dataset.read_parts:
+            # Dataset multi-fichiers : état actuel des parts, une part réécrite change l'empreinte
+            keys = dataset.s3_keys
+            states = object_states(dataset.bucket.s3_client, dataset.bucket.bucket_name, keys)
+            if any(states.get(key) is None for key in keys):
+                return None
+            parts = ",".join(f"{key}:{states[key]['etag']}:{states[key]['size']}" for key in keys)
+            return f"manifest:{hashlib.sha256(parts.encode('utf-8')).hexdigest()}"
+        if location.startswith("s3://"):
+            if dataset.bucket is None:
+                return None
+            bucket_name, _, key = location[5:].partition("/")
+            head = dataset.bucket.s3_client.head_object(Bucket=bucket_name, Key=key)
+            return "s3:{etag}:{size}:{modified}".format(
+                etag=head["ETag"].strip('"'),
+                size=head["ContentLength"],
+                modified=head["LastModified"].isoformat(),
+            )
+        if os.path.isfile(location):
+            return f"sha256:{_memoized_file_sha256(location)}:{os.path.getsize(location)}"
+    except Exception as e:
+        logger.warning(f"Impossible de calculer l'empreinte du dataset {dataset.id}: {e}")
+    return None
+
+
+def dataset_fingerprint(dataset) -> Optional[str]:
+    """
+    Empreinte d'un rapport d'audit : contenu du dataset et configuration de l'audit
+
+    Args:
+        dataset: Instance de ``DataSet``
+
+    Returns:
+        str: Empreinte, ou None si le contenu ne peut pas être identifié
+    """
+    content = dataset_content_fingerprint(dataset)
+    if content is None:
+        return None
+    return f"{content}:config:{audit_config_fingerprint(dataset)}"
+
+
+def get_cached_report(dataset, fingerprint: Optional[str]):
+    """
+    Retourne le dernier ``AuditReport`` du dataset ayant cette empreinte
+    """
+    report = None
+    if fingerprint is not None:
+        report = (
+            dataset.reports.filter(fingerprint=fingerprint)
+            .exclude(report=None)
+            .order_by("-created_at")
+            .first()
+        )
+    if report is not None:
+        logger.info(f"Rapport d'audit {report.id} servi depuis le cache pour le dataset {dataset.id}")
+    return report
+
+
+def record_cache_result(hit: bool):
+    """
+    Comptabilise un hit ou un miss dans les métriques du cache d'audit
+    """
+    from django.core.cache import cache
+
+    key = HITS_KEY if hit else MISSES_KEY
+    try:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+    except Exception as e:
+        logger.warning(f"Impossible de mettre à jour les métriques du cache d'audit: {e}")
+
+
+def audit_cache_stats() -> dict:
+    """
+    Métriques du cache d'audit : nombre de hits, de misses et taux de hit
+    """
+    from django.core.cache import cache
+
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+    }
@@ -1,16 +1,36 @@
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterator, Tuple, TYPE_CHECKING
+import importlib
 import json
-import boto3
+import multiprocessing
+from abc import ABC, abstractmethod
+import os
+import tempfile
+import warnings
+from statistics import NormalDist
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from pathlib import Path
-from smart_open import open as s_open
 import pandas as pd
+from .app_settings import app_settings
+from .audit_accumulators import AuditAccumulator, CategoricalColumnAccumulator, is_numeric_dtype
+from .loaders import DatasetLoader, DatasetPath, Filter, column_chunk_ranges, iter_row_group_batches
+from .s3 import RangedS3File
 from .logging import get_logger
-from .models import Bucket
-from .schema.audit import AuditReport, BasicInfo, MissingValues, DescriptiveStats, CategoricalStats, DescriptiveStatsColumn, CategoricalStatsColumn
+from .schema.audit import AuditReport, BasicInfo, MissingValues, DescriptiveStats, CategoricalStats, DescriptiveStatsColumn, CategoricalStatsColumn, ConfidenceInterval, SamplingInfo
+
+if TYPE_CHECKING:
+    # Import différé : les workers du pool d'audit importent ce module sans Django initialisé
+    from .models import Bucket
 
 logger = get_logger(__name__)
 
+AUDIT_MODES = ("memory", "streaming", "incremental", "quick")
+# Paramètres d'accumulateur qui doivent être identiques pour reprendre un état
+ACCUMULATOR_CONFIG_KEYS = (
+    "tdigest_compression", "categorical_mode", "sketch_threshold", "hll_precision", "top_k_capacity",
+)
+CATEGORICAL_MODES = ("auto", "exact", "approximate")
+
 
 def convert_numpy_types(obj):
     """
@@ -30,70 +50,750 @@ def convert_numpy_types(obj):
         return obj
 
 
-# Alternative avec pandas si daft n'est pas disponible
-class PandasDatasetAuditor:
+def pandas_column_types(schema, null_counts: Dict[str, int]) -> Dict[str, str]:
     """
-    Alternative à DatasetAuditor utilisant pandas au lieu de daft
+    Types pandas qu'aurait ``to_pandas()`` pour un schéma Arrow, sans lire de données
+
+    pyarrow convertit les entiers/booléens contenant des nulls en float64/object.
+    """
+    column_types = {}
+    for col, dtype in schema.empty_table().to_pandas().dtypes.astype(str).items():
+        if null_counts.get(col, 0) > 0 and dtype.startswith(("int", "uint")):
+            dtype = "float64"
+        elif null_counts.get(col, 0) > 0 and dtype == "bool":
+            dtype = "object"
+        column_types[col] = dtype
+    return column_types
+
+
+def _audit_column_shard(
+    ipc_path: str,
+    numeric_columns: List[str],
+    categorical_columns: List[str],
+    columns: List[str],
+    categorical_mode: str,
+) -> Dict[str, Any]:
     """
+    Audite un sous-ensemble de colonnes dans un processus du pool
 
-    def __init__(self, bucket: Bucket):
+    Les données sont lues par memory-map depuis le fichier Arrow IPC écrit par
+    le processus parent : seules les colonnes du shard sont converties en pandas.
+    """
+    import pyarrow as pa
+
+    with pa.memory_map(ipc_path) as source:
+        table = pa.ipc.open_file(source).read_all().select(columns)
+    df = table.to_pandas()
+    auditor = PandasDatasetAuditor(bucket=None)
+    return {
+        "memory_usage": int(df.memory_usage(deep=True, index=False).sum()),
+        "missing_values": convert_numpy_types(df.isnull().sum().to_dict()),
+        "descriptive_stats": auditor.get_descriptive_stats(df, numeric_columns).root,
+        "categorical_stats": auditor.get_categorical_stats(df, categorical_columns, categorical_mode).root,
+    }
+
+
+class BaseDatasetAuditor(ABC):
+    """
+    Interface commune des backends d'audit
+
+    Un backend implémente ``run_audit`` pour les modes qu'il déclare dans
+    ``supported_modes`` ; l'accès aux fichiers (local ou S3), la validation
+    du mode et la sauvegarde du rapport sont partagés.
+    """
+
+    auditor_type: str = ""
+    supported_modes: Tuple[str, ...] = AUDIT_MODES
+    # Le backend accepte l'option ``parts`` (datasets multi-fichiers)
+    supports_parts: bool = False
+
+    def __init__(self, bucket: "Bucket"):
         self.audit_results = None
+        self.audit_state = None
         self.bucket = bucket
+        self.loader = DatasetLoader(bucket)
 
-    def open_dataset_from_s3(self, dataset_path: str):
+    def _s3_transport_params(self) -> Dict[str, Any]:
         """
-        Ouvre un dataset depuis S3
+        Paramètres smart_open pour accéder au bucket du dataset
         """
-        session = boto3.session.Session(
-            aws_access_key_id=self.bucket.access_key,
-            aws_secret_access_key=self.bucket.secret_key,
-        )
+        return self.loader._s3_transport_params()
 
-        client = session.client("s3", endpoint_url=self.bucket.endpoint)
+    def open_source(self, dataset_path: str, ranged: bool = False):
+        """
+        Ouvre le fichier du dataset en lecture binaire (local ou S3)
 
-        # 2. Préparer les paramètres pour smart_open
-        transport_params = {"client": client}
+        ``ranged`` : seule une partie de l'objet sera lue (footer, row groups
+        choisis), le cache local est contourné (voir ``DatasetLoader.open``).
+        """
+        return self.loader.open(dataset_path, ranged=ranged)
 
-        with s_open(dataset_path, "rb", transport_params=transport_params) as s3_file:
-            if dataset_path.endswith(".parquet"):
-                df = pd.read_parquet(s3_file)
-            elif dataset_path.endswith(".csv"):
-                df = pd.read_csv(s3_file)
-            else:
-                raise ValueError(f"Format de fichier non supporté: {dataset_path}")
-        return df
+    @abstractmethod
+    def run_audit(self, dataset_path: str, mode: str, **options) -> AuditReport:
+        """
+        Calcule le rapport d'audit dans un mode de ``supported_modes``
+        """
+
+    def full_audit(
+        self,
+        dataset_path: str,
+        save_report: bool = True,
+        report_path: Optional[str] = None,
+        mode: Optional[str] = None,
+        **options,
+    ) -> AuditReport:
+        """
+        Effectue un audit complet du dataset
+
+        Args:
+            dataset_path: Chemin vers le dataset
+            save_report: Si True, sauvegarde le rapport
+            report_path: Chemin pour sauvegarder le rapport
+            mode: Mode d'audit (par défaut ``app_settings.audit_mode``)
+            **options: Options propres au backend (``workers``, ``previous_state``, ``parts``)
 
-    def load_dataset(self, dataset_path: str):
+        Returns:
+            AuditReport: Rapport d'audit
+        """
+        try:
+            mode = mode or app_settings.audit_mode
+            if mode not in self.supported_modes:
+                raise ValueError(f"Mode d'audit non supporté par le backend {self.auditor_type}: {mode}")
+            logger.info(f"Début de l'audit du dataset avec {self.auditor_type} ({mode}): {dataset_path}")
+
+            audit_results = self.run_audit(dataset_path, mode, **options)
+
+            # Sauvegarder le rapport si demandé
+            if save_report:
+                if report_path is None:
+                    report_path = f"audit_report_{self.auditor_type}_{Path(dataset_path).stem}.json"
+
+                with open(report_path, "w", encoding="utf-8") as f:
+                    json.dump(audit_results.model_dump(), f, indent=2, default=convert_numpy_types)
+
+                logger.info(f"Rapport d'audit {self.auditor_type} sauvegardé: {report_path}")
+
+            self.audit_results = audit_results
+            return audit_results
+
+        except Exception as e:
+            logger.error(f"Erreur lors de l'audit complet avec {self.auditor_type}: {e}")
+            raise
+
+
+# Alternative avec pandas si daft n'est pas disponible
+class PandasDatasetAuditor(BaseDatasetAuditor):
+    """
+    Alternative à DatasetAuditor utilisant pandas au lieu de daft
+    """
+
+    auditor_type = "pandas"
+    supports_parts = True
+
+    def new_accumulator(self) -> AuditAccumulator:
+        """
+        Accumulateur configuré depuis ``app_settings``
+        """
+        return AuditAccumulator(
+            tdigest_compression=app_settings.audit_tdigest_compression,
+            categorical_mode=app_settings.audit_categorical_mode,
+            sketch_threshold=app_settings.audit_sketch_threshold,
+            hll_precision=app_settings.audit_hll_precision,
+            top_k_capacity=app_settings.audit_top_k_capacity,
+        )
+
+    def open_dataset_from_s3(
+        self,
+        dataset_path: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[List[Filter]] = None,
+    ):
+        """
+        Ouvre un dataset depuis S3
+        """
+        return self.loader.read(dataset_path, columns=columns, filters=filters)
+
+    def load_dataset(
+        self,
+        dataset_path: DatasetPath,
+        columns: Optional[List[str]] = None,
+        filters: Optional[List[Filter]] = None,
+    ):
         """
         Charge un dataset avec pandas
 
         Args:
-            dataset_path: Chemin vers le fichier dataset (parquet, csv, etc.)
+            dataset_path: Chemin vers le fichier dataset (parquet, csv, etc.),
+                ou liste des parts d'un dataset multi-fichiers
+            columns: Colonnes à lire (toutes par défaut)
+            filters: Filtres ``(colonne, opérateur, valeur)`` poussés dans le lecteur
 
         Returns:
             pandas.DataFrame: Dataset chargé
         """
         try:
-            # Si c'est un chemin S3, utiliser open_dataset_from_s3
-            if dataset_path.startswith("s3://"):
-                df = self.open_dataset_from_s3(dataset_path)
+            if isinstance(dataset_path, str) and dataset_path.startswith("s3://"):
+                df = self.open_dataset_from_s3(dataset_path, columns=columns, filters=filters)
                 logger.info(f"Dataset chargé avec succès depuis S3: {dataset_path}")
                 return df
 
-            # Sinon, charger localement
-            if dataset_path.endswith(".parquet"):
-                df = pd.read_parquet(dataset_path)
-            elif dataset_path.endswith(".csv"):
-                df = pd.read_csv(dataset_path)
-            else:
-                raise ValueError(f"Format de fichier non supporté: {dataset_path}")
-
+            df = self.loader.read(dataset_path, columns=columns, filters=filters)
             logger.info(f"Dataset chargé avec succès: {dataset_path}")
             return df
         except Exception as e:
             logger.error(f"Erreur lors du chargement du dataset: {e}")
             raise
 
+    def iter_dataset_chunks(
+        self,
+        dataset_path: DatasetPath,
+        chunk_size: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[List[Filter]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Lit un dataset par morceaux sans jamais le matérialiser entièrement
+
+        Les CSV sont lus par blocs de ``chunk_size`` lignes, les Parquet
+        groupe de lignes par groupe de lignes (découpés en batches d'au plus
+        ``chunk_size`` lignes).
+
+        Args:
+            dataset_path: Chemin local ou S3 vers le dataset, ou liste de ses parts
+            chunk_size: Nombre maximal de lignes par chunk
+            columns: Colonnes à lire (toutes par défaut)
+            filters: Filtres ``(colonne, opérateur, valeur)`` ; les row groups
+                Parquet exclus par les statistiques du footer ne sont pas lus
+
+        Yields:
+            pandas.DataFrame: Un chunk du dataset
+        """
+        return self.loader.iter_chunks(dataset_path, chunk_size, columns=columns, filters=filters)
+
+    def streaming_audit(
+        self,
+        dataset_path: str,
+        chunk_size: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[List[Filter]] = None,
+        parts: Optional[List[str]] = None,
+    ) -> AuditReport:
+        """
+        Audit du dataset chunk par chunk via des accumulateurs fusionnables
+
+        Le pic mémoire est borné par la taille d'un chunk, quel que soit le
+        volume du dataset. Le rapport produit a le même schéma que l'audit
+        en mémoire ; la médiane est estimée par un t-digest.
+
+        Args:
+            dataset_path: Chemin vers le dataset
+            chunk_size: Nombre maximal de lignes par chunk
+            columns: Colonnes à auditer (toutes par défaut)
+            filters: Filtres ``(colonne, opérateur, valeur)`` sur les lignes
+            parts: Fichiers d'un dataset multi-fichiers, lus l'un après l'autre
+
+        Returns:
+            AuditReport: Rapport d'audit
+        """
+        accumulator = self.new_accumulator()
+        chunk_count = 0
+        for chunk in self.iter_dataset_chunks(parts or dataset_path, chunk_size, columns=columns, filters=filters):
+            accumulator.update(chunk)
+            chunk_count += 1
+        logger.info(f"Audit en streaming terminé: {chunk_count} chunks lus pour {dataset_path}")
+        return accumulator.to_report(dataset_path, auditor_type="pandas")
+
+    def list_parquet_parts(self, dataset_path: str) -> List[str]:
+        """
+        Liste les fichiers Parquet qui composent un dataset
+
+        Un dataset est soit un fichier ``.parquet``, soit un répertoire local ou
+        un préfixe S3 contenant des parts ``.parquet`` ajoutées au fil du temps.
+        """
+        if dataset_path.endswith(".parquet"):
+            return [dataset_path]
+        if dataset_path.startswith("s3://"):
+            bucket_name, _, prefix = dataset_path[5:].partition("/")
+            client = self._s3_transport_params()["client"]
+            parts = []
+            for page in client.get_paginator("list_objects_v2").paginate(Bucket=bucket_name, Prefix=prefix):
+                parts.extend(
+                    f"s3://{bucket_name}/{obj['Key']}"
+                    for obj in page.get("Contents", [])
+                    if obj["Key"].endswith(".parquet")
+                )
+            return sorted(parts)
+        if os.path.isdir(dataset_path):
+            return sorted(
+                os.path.join(dataset_path, name)
+                for name in os.listdir(dataset_path)
+                if name.endswith(".parquet")
+            )
+        raise ValueError(f"Audit incrémental non supporté pour: {dataset_path}")
+
+    def parquet_manifest(self, parts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Décrit chaque part par ses row groups (lignes, taille), lus dans le footer
+        """
+        import pyarrow.parquet as pq
+
+        manifest = []
+        for part in parts:
+            with self.open_source(part, ranged=True) as f:
+                metadata = pq.ParquetFile(f).metadata
+                manifest.append({
+                    "path": part,
+                    "row_groups": [
+                        [metadata.row_group(rg).num_rows, metadata.row_group(rg).total_byte_size]
+                        for rg in range(metadata.num_row_groups)
+                    ],
+                })
+        return manifest
+
+    @staticmethod
+    def manifest_delta(
+        previous: List[Dict[str, Any]], current: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, List[int]]]:
+        """
+        Row groups à auditer pour passer de ``previous`` à ``current``
+
+        Returns:
+            Dict part -> indices des nouveaux row groups, ou None si des données
+            déjà auditées ont été modifiées ou supprimées (audit complet requis)
+        """
+        current_by_path = {part["path"]: part["row_groups"] for part in current}
+        for part in previous:
+            row_groups = current_by_path.get(part["path"])
+            known = [list(rg) for rg in part["row_groups"]]
+            if row_groups is None or [list(rg) for rg in row_groups[:len(known)]] != known:
+                return None
+        previous_counts = {part["path"]: len(part["row_groups"]) for part in previous}
+        delta = {}
+        for part in current:
+            start = previous_counts.get(part["path"], 0)
+            if start < len(part["row_groups"]):
+                delta[part["path"]] = list(range(start, len(part["row_groups"])))
+        return delta
+
+    def incremental_audit(
+        self, dataset_path: str, previous_state: Optional[Dict[str, Any]] = None
+    ) -> Tuple[AuditReport, Dict[str, Any]]:
+        """
+        Audit d'un dataset Parquet qui grossit par ajout de parts ou de row groups
+
+        L'état des accumulateurs du précédent audit est repris et seuls les
+        row groups apparus depuis sont lus. Si des données déjà auditées ont
+        changé, ou si la configuration des accumulateurs diffère, tout le
+        dataset est ré-audité.
+
+        Args:
+            dataset_path: Fichier Parquet, répertoire ou préfixe S3 de parts
+            previous_state: État retourné par un précédent ``incremental_audit``
+
+        Returns:
+            Tuple (rapport d'audit, nouvel état à persister)
+        """
+        import pyarrow.parquet as pq
+
+        manifest = self.parquet_manifest(self.list_parquet_parts(dataset_path))
+        accumulator = self.new_accumulator()
+        delta = None
+        if previous_state is not None:
+            previous = previous_state["accumulator"]
+            if all(previous[key] == getattr(accumulator, key) for key in ACCUMULATOR_CONFIG_KEYS):
+                delta = self.manifest_delta(previous_state["manifest"], manifest)
+            if delta is not None:
+                accumulator = AuditAccumulator.from_state(previous)
+            else:
+                logger.info(f"État d'audit précédent inutilisable, audit complet de {dataset_path}")
+        if delta is None:
+            delta = {part["path"]: list(range(len(part["row_groups"]))) for part in manifest}
+
+        for part, row_groups in delta.items():
+            with self.open_source(part, ranged=True) as f:
+                for batch in iter_row_group_batches(
+                    f, pq.ParquetFile(f), row_groups, None, app_settings.audit_chunk_size
+                ):
+                    accumulator.update(batch.to_pandas())
+        logger.info(
+            f"Audit incrémental de {dataset_path}: "
+            f"{sum(len(rgs) for rgs in delta.values())} row groups lus dans {len(delta)} parts"
+        )
+        state = {"manifest": manifest, "accumulator": accumulator.to_state()}
+        return accumulator.to_report(dataset_path, auditor_type="pandas"), state
+
+    def sample_dataset(
+        self, dataset_path: str, sample_size: int, seed: Optional[int] = None
+    ) -> Tuple[pd.DataFrame, int, str]:
+        """
+        Échantillon aléatoire de ``sample_size`` lignes du dataset
+
+        Parquet : des row groups tirés au hasard sont lus jusqu'à réunir assez
+        de lignes, puis un sous-échantillon uniforme en est extrait ; seuls ces
+        row groups sont téléchargés. CSV : échantillonnage réservoir (les
+        ``sample_size`` plus petites clés aléatoires) sur une lecture par chunks.
+
+        Returns:
+            Tuple (échantillon, nombre total de lignes, méthode d'échantillonnage)
+        """
+        import pyarrow.parquet as pq
+
+        rng = np.random.default_rng(seed)
+        if not dataset_path.endswith((".parquet", ".csv")):
+            raise ValueError(f"Format de fichier non supporté: {dataset_path}")
+
+        if dataset_path.endswith(".parquet"):
+            with self.open_source(dataset_path, ranged=True) as f:
+                parquet_file = pq.ParquetFile(f)
+                metadata = parquet_file.metadata
+                population = metadata.num_rows
+                # Row groups tirés d'après le footer, puis téléchargés ensemble
+                row_groups, rows = [], 0
+                for rg in rng.permutation(metadata.num_row_groups):
+                    if rows >= sample_size:
+                        break
+                    row_groups.append(int(rg))
+                    rows += metadata.row_group(int(rg)).num_rows
+                if isinstance(f, RangedS3File):
+                    f.prefetch(column_chunk_ranges(metadata, row_groups, None))
+                tables = [parquet_file.read_row_group(rg) for rg in row_groups]
+                df = pd.concat([table.to_pandas() for table in tables], ignore_index=True) if tables \
+                    else parquet_file.schema_arrow.empty_table().to_pandas()
+            method = "row_groups"
+        else:
+            population, sample, keys = 0, None, np.empty(0)
+            for chunk in self.iter_dataset_chunks(dataset_path):
+                population += len(chunk)
+                chunk_keys = rng.random(len(chunk))
+                sample = chunk if sample is None else pd.concat([sample, chunk], ignore_index=True)
+                keys = np.concatenate([keys, chunk_keys])
+                if len(sample) > sample_size:
+                    keep = np.sort(np.argpartition(keys, sample_size)[:sample_size])
+                    sample, keys = sample.iloc[keep].reset_index(drop=True), keys[keep]
+            df = sample
+            method = "reservoir"
+
+        if len(df) > sample_size:
+            df = df.sample(n=sample_size, random_state=rng.integers(2**32)).reset_index(drop=True)
+        if len(df) == population:
+            method = "full"
+        return df, population, method
+
+    def quick_audit(
+        self, dataset_path: str, sample_size: Optional[int] = None, seed: Optional[int] = None
+    ) -> AuditReport:
+        """
+        Audit approché sur un échantillon, avec intervalles de confiance
+
+        Le nombre de lignes est exact ; pour un Parquet les types et valeurs
+        manquantes viennent du footer. Les autres sections sont estimées sur
+        l'échantillon : moyenne et médiane avec leur intervalle de confiance
+        (normal pour la moyenne, par statistiques d'ordre pour la médiane),
+        valeurs manquantes et effectifs des modalités extrapolés au dataset.
+        ``unique_count`` est celui de l'échantillon, donc un minorant.
+
+        Args:
+            dataset_path: Chemin vers le dataset
+            sample_size: Taille de l'échantillon (par défaut ``app_settings.audit_quick_sample_size``)
+            seed: Graine du tirage aléatoire
+
+        Returns:
+            AuditReport: Rapport d'audit avec le champ ``sampling`` renseigné
+        """
+        import pyarrow.parquet as pq
+
+        sample_size = sample_size or app_settings.audit_quick_sample_size
+        confidence = app_settings.audit_quick_confidence
+        df, population, method = self.sample_dataset(dataset_path, sample_size, seed)
+        n = len(df)
+        scale = population / n if n else 0.0
+        logger.info(f"Audit rapide de {dataset_path}: {n} lignes échantillonnées sur {population} ({method})")
+
+        missing = {col: round(count * scale) for col, count in self.get_missing_values(df).root.items()}
+        if dataset_path.endswith(".parquet"):
+            with self.open_source(dataset_path, ranged=True) as f:
+                basic_info, footer_missing, _ = self.get_parquet_footer_info(pq.ParquetFile(f))
+            missing.update(footer_missing)
+        else:
+            basic_info = self.get_basic_info(df)
+            basic_info.row_count = population
+            basic_info.memory_usage = round(basic_info.memory_usage * scale)
+
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        descriptive_stats = self.get_descriptive_stats(df)
+        for col, stats in descriptive_stats.root.items():
+            values = np.sort(df[col].to_numpy(dtype="float64", na_value=np.nan))
+            values = values[~np.isnan(values)]
+            m = len(values)
+            if m < 2:
+                continue
+            # Correction de population finie : l'intervalle se referme si tout est lu
+            fpc = np.sqrt((population - n) / (population - 1)) if population > 1 else 0.0
+            half_width = z * stats.std / np.sqrt(m) * fpc
+            stats.mean_ci = ConfidenceInterval(lower=stats.mean - half_width, upper=stats.mean + half_width)
+            lower = max(int(np.floor(m / 2 - z * np.sqrt(m) / 2)), 0)
+            upper = min(int(np.ceil(m / 2 + z * np.sqrt(m) / 2)), m - 1)
+            stats.median_ci = ConfidenceInterval(lower=values[lower], upper=values[upper])
+
+        categorical_stats = self.get_categorical_stats(df)
+        for stats in categorical_stats.root.values():
+            stats.top_values = {value: round(count * scale) for value, count in stats.top_values.items()}
+
+        return AuditReport(
+            dataset_path=dataset_path,
+            auditor_type="pandas",
+            basic_info=basic_info,
+            missing_values=MissingValues({col: missing[col] for col in basic_info.column_names}),
+            descriptive_stats=descriptive_stats,
+            categorical_stats=categorical_stats,
+            sampling=SamplingInfo(
+                method=method,
+                sample_size=n,
+                population_size=population,
+                confidence_level=confidence,
+            ),
+        )
+
+    def get_parquet_footer_info(self, parquet_file) -> Tuple[BasicInfo, Dict[str, int], List[str]]:
+        """
+        Informations de base et valeurs manquantes lues dans le footer Parquet
+
+        Le nombre de lignes, le schéma et les ``null_count`` des statistiques
+        de chaque column chunk suffisent : aucune page de données n'est lue.
+        ``memory_usage`` est estimé par la taille non compressée des row groups.
+
+        Args:
+            parquet_file: pyarrow.parquet.ParquetFile
+
+        Returns:
+            Tuple (BasicInfo, valeurs manquantes connues, colonnes sans statistiques)
+        """
+        metadata = parquet_file.metadata
+        column_names = list(parquet_file.schema_arrow.empty_table().to_pandas().columns)
+
+        null_counts = {col: 0 for col in column_names}
+        without_stats = set()
+        leaf_names = {
+            metadata.schema.column(i).path: i for i in range(metadata.num_columns)
+        }
+        for col in column_names:
+            index = leaf_names.get(col)
+            if index is None:
+                without_stats.add(col)
+                continue
+            for rg in range(metadata.num_row_groups):
+                statistics = metadata.row_group(rg).column(index).statistics
+                if statistics is None or not statistics.has_null_count:
+                    without_stats.add(col)
+                    break
+                null_counts[col] += statistics.null_count
+
+        basic_info = BasicInfo(
+            row_count=metadata.num_rows,
+            column_count=len(column_names),
+            column_names=column_names,
+            column_types=pandas_column_types(parquet_file.schema_arrow, null_counts),
+            memory_usage=sum(
+                metadata.row_group(rg).total_byte_size for rg in range(metadata.num_row_groups)
+            ),
+        )
+        missing = {col: count for col, count in null_counts.items() if col not in without_stats}
+        return basic_info, missing, [col for col in column_names if col in without_stats]
+
+    def parquet_audit(self, dataset_path: str, streaming: bool = False, workers: int = 1) -> AuditReport:
+        """
+        Audit d'un Parquet répondant au maximum depuis le footer
+
+        ``basic_info`` et ``missing_values`` proviennent des métadonnées ; seules
+        les colonnes numériques et catégorielles (et les colonnes sans
+        statistiques) sont lues pour les statistiques que le footer ne fournit pas.
+
+        Args:
+            dataset_path: Chemin local ou S3 vers le fichier Parquet
+            streaming: Si True, lit les colonnes utiles batch par batch
+            workers: Nombre de processus pour les statistiques par colonne (hors streaming)
+
+        Returns:
+            AuditReport: Rapport d'audit
+        """
+        import pyarrow.parquet as pq
+
+        # Seuls le footer et les column chunks utiles sont téléchargés
+        with self.open_source(dataset_path, ranged=True) as f:
+            parquet_file = pq.ParquetFile(f)
+            basic_info, missing, without_stats = self.get_parquet_footer_info(parquet_file)
+            logger.info(
+                f"Footer Parquet lu pour {dataset_path}: {basic_info.row_count} lignes, "
+                f"{len(without_stats)} colonnes sans statistiques"
+            )
+
+            empty_df = parquet_file.schema_arrow.empty_table().to_pandas()
+            numeric_columns = [
+                col for col, dtype in basic_info.column_types.items() if is_numeric_dtype(dtype)
+            ]
+            categorical_columns = empty_df.select_dtypes(include=["object", "category"]).columns.tolist()
+            columns = [
+                col for col in basic_info.column_names
+                if col in numeric_columns or col in categorical_columns or col in without_stats
+            ]
+
+            if streaming:
+                accumulator = self.new_accumulator()
+                for batch in iter_row_group_batches(
+                    f, parquet_file, range(parquet_file.metadata.num_row_groups), columns,
+                    app_settings.audit_chunk_size,
+                ):
+                    accumulator.update(batch.to_pandas())
+                missing.update({col: accumulator.missing_values.counts.get(col, 0) for col in without_stats})
+                descriptive_stats = accumulator.get_descriptive_stats()
+                categorical_stats = accumulator.get_categorical_stats()
+            elif workers > 1 and len(columns) > 1:
+                self.prefetch_columns(f, parquet_file, columns)
+                _, shard_missing, descriptive_stats, categorical_stats = self.parallel_column_stats(
+                    parquet_file.read(columns=columns), numeric_columns, categorical_columns, workers
+                )
+                missing.update({col: shard_missing[col] for col in without_stats})
+            else:
+                self.prefetch_columns(f, parquet_file, columns)
+                df = parquet_file.read(columns=columns).to_pandas()
+                missing.update(convert_numpy_types(df[without_stats].isnull().sum().to_dict()))
+                descriptive_stats = self.get_descriptive_stats(df, numeric_columns)
+                categorical_stats = self.get_categorical_stats(df, categorical_columns)
+
+        return AuditReport(
+            dataset_path=dataset_path,
+            auditor_type="pandas",
+            basic_info=basic_info,
+            missing_values=MissingValues({col: missing[col] for col in basic_info.column_names}),
+            descriptive_stats=descriptive_stats,
+            categorical_stats=categorical_stats,
+        )
+
+    @staticmethod
+    def prefetch_columns(f, parquet_file, columns: List[str]):
+        """
+        Télécharge en parallèle les column chunks de ``columns`` d'un Parquet S3
+        """
+        if isinstance(f, RangedS3File):
+            metadata = parquet_file.metadata
+            f.prefetch(column_chunk_ranges(metadata, range(metadata.num_row_groups), columns))
+
+    def parallel_column_stats(
+        self,
+        table,
+        numeric_columns: List[str],
+        categorical_columns: List[str],
+        workers: int,
+    ) -> Tuple[int, Dict[str, int], DescriptiveStats, CategoricalStats]:
+        """
+        Répartit les colonnes sur un pool de processus et fusionne les résultats
+
+        La table est écrite une seule fois au format Arrow IPC en mémoire
+        partagée (/dev/shm si disponible) ; chaque worker la memory-map au lieu
+        de recevoir une copie picklée.
+
+        Args:
+            table: pyarrow.Table à auditer
+            numeric_columns: Colonnes pour les statistiques descriptives
+            categorical_columns: Colonnes pour les statistiques catégorielles
+            workers: Nombre de processus
+
+        Returns:
+            Tuple (mémoire des colonnes, valeurs manquantes, stats descriptives, stats catégorielles)
+        """
+        import pyarrow as pa
+
+        columns = list(table.column_names)
+        # Le seuil "auto" porte sur le dataset entier, pas sur le shard
+        categorical_mode = app_settings.audit_categorical_mode
+        if categorical_mode == "auto":
+            categorical_mode = "approximate" if table.num_rows > app_settings.audit_sketch_threshold else "exact"
+        shards = [columns[i::workers] for i in range(workers) if columns[i::workers]]
+
+        shm_dir = app_settings.audit_shared_memory_dir
+        if shm_dir is None and os.path.isdir("/dev/shm"):
+            shm_dir = "/dev/shm"
+        fd, ipc_path = tempfile.mkstemp(suffix=".arrow", prefix="audit_", dir=shm_dir)
+        os.close(fd)
+        try:
+            with pa.OSFile(ipc_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            del table
+
+            # forkserver évite de forker un worker Dramatiq multi-threadé
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            with ProcessPoolExecutor(max_workers=len(shards), mp_context=context) as executor:
+                futures = [
+                    executor.submit(
+                        _audit_column_shard,
+                        ipc_path,
+                        [col for col in shard if col in numeric_columns],
+                        [col for col in shard if col in categorical_columns],
+                        shard,
+                        categorical_mode,
+                    )
+                    for shard in shards
+                ]
+                results = [future.result() for future in futures]
+        finally:
+            os.remove(ipc_path)
+
+        memory_usage = sum(result["memory_usage"] for result in results)
+        missing, descriptive, categorical = {}, {}, {}
+        for result in results:
+            missing.update(result["missing_values"])
+            descriptive.update(result["descriptive_stats"])
+            categorical.update(result["categorical_stats"])
+        return (
+            memory_usage,
+            {col: missing[col] for col in columns},
+            DescriptiveStats({col: descriptive[col] for col in numeric_columns if col in descriptive}),
+            CategoricalStats({col: categorical[col] for col in categorical_columns if col in categorical}),
+        )
+
+    def parallel_audit(self, df, dataset_path: str, workers: int) -> Optional[AuditReport]:
+        """
+        Audit en mémoire dont les sections par colonne sont calculées en parallèle
+
+        Args:
+            df: pandas.DataFrame
+            dataset_path: Chemin vers le dataset
+            workers: Nombre de processus
+
+        Returns:
+            AuditReport: Rapport d'audit, ou None si le DataFrame ne peut pas
+            être converti en Arrow (colonnes object de types mélangés)
+        """
+        import pyarrow as pa
+
+        numeric_columns = df.select_dtypes(include=["number"]).columns.tolist()
+        categorical_columns = df.select_dtypes(include=["object", "category"]).columns.tolist()
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            logger.warning(f"Audit parallèle impossible, retour à l'audit séquentiel: {e}")
+            return None
+        memory_usage, missing, descriptive_stats, categorical_stats = self.parallel_column_stats(
+            table, numeric_columns, categorical_columns, workers
+        )
+        basic_info = BasicInfo(
+            row_count=len(df),
+            column_count=len(df.columns),
+            column_names=list(df.columns),
+            column_types=df.dtypes.astype(str).to_dict(),
+            memory_usage=memory_usage + int(df.index.memory_usage()),
+        )
+        return AuditReport(
+            dataset_path=dataset_path,
+            auditor_type="pandas",
+            basic_info=basic_info,
+            missing_values=MissingValues(missing),
+            descriptive_stats=descriptive_stats,
+            categorical_stats=categorical_stats,
+        )
+
     def get_basic_info(self, df) -> BasicInfo:
         """
         Obtient les informations de base sur le dataset
@@ -151,25 +851,41 @@ class PandasDatasetAuditor:
         try:
             if numeric_columns is None:
                 numeric_columns = df.select_dtypes(include=["number"]).columns.tolist()
+            numeric_columns = [col for col in numeric_columns if col in df.columns]
+            if not numeric_columns:
+                return DescriptiveStats({})
+
+            # Un seul bloc float64 : les statistiques sont calculées pour toutes
+            # les colonnes à la fois, la médiane par sélection (np.partition)
+            block = df[numeric_columns].to_numpy(dtype="float64", na_value=np.nan)
+            with warnings.catch_warnings():
+                # Colonnes entièrement vides ou avec une seule valeur
+                warnings.simplefilter("ignore", RuntimeWarning)
+                means = np.nanmean(block, axis=0)
+                stds = np.nanstd(block, axis=0, ddof=1)
+                mins = np.nanmin(block, axis=0)
+                maxs = np.nanmax(block, axis=0)
+                medians = np.nanmedian(block, axis=0)
 
             stats = {}
-            for col in numeric_columns:
-                if col in df.columns:
-                    col_stats = df[col].describe()
-                    stats[col] = DescriptiveStatsColumn(
-                        mean=col_stats["mean"],
-                        std=col_stats["std"],
-                        min=col_stats["min"],
-                        max=col_stats["max"],
-                        median=col_stats["50%"]
-                    )
+            for i, col in enumerate(numeric_columns):
+                stats[col] = DescriptiveStatsColumn(
+                    mean=means[i],
+                    std=stds[i],
+                    min=mins[i],
+                    max=maxs[i],
+                    median=medians[i],
+                )
             return DescriptiveStats(stats)
         except Exception as e:
             logger.error(f"Erreur lors du calcul des statistiques descriptives: {e}")
             raise
 
     def get_categorical_stats(
-        self, df, categorical_columns: Optional[List[str]] = None
+        self,
+        df,
+        categorical_columns: Optional[List[str]] = None,
+        categorical_mode: Optional[str] = None,
     ) -> CategoricalStats:
         """
         Analyse les colonnes catégorielles
@@ -177,6 +893,9 @@ class PandasDatasetAuditor:
         Args:
             df: pandas.DataFrame
             categorical_columns: Liste des colonnes catégorielles à analyser
+            categorical_mode: "exact", "approximate" (HyperLogLog + Space-Saving)
+                ou "auto" (approximé au-delà de ``app_settings.audit_sketch_threshold``
+                lignes). Par défaut ``app_settings.audit_categorical_mode``.
 
         Returns:
             Dict contenant les statistiques des colonnes catégorielles
@@ -186,12 +905,27 @@ class PandasDatasetAuditor:
                 categorical_columns = df.select_dtypes(
                     include=["object", "category"]
                 ).columns.tolist()
+            categorical_mode = categorical_mode or app_settings.audit_categorical_mode
+            if categorical_mode not in CATEGORICAL_MODES:
+                raise ValueError(f"Mode catégoriel non supporté: {categorical_mode}")
+            approximate = categorical_mode == "approximate" or (
+                categorical_mode == "auto" and len(df) > app_settings.audit_sketch_threshold
+            )
 
             stats = {}
             for col in categorical_columns:
-                if col in df.columns:
+                if col in df.columns and approximate:
+                    accumulator = CategoricalColumnAccumulator(
+                        approximate=True,
+                        hll_precision=app_settings.audit_hll_precision,
+                        top_k_capacity=app_settings.audit_top_k_capacity,
+                    )
+                    accumulator.update(df[col])
+                    stats[col] = accumulator.to_schema()
+                elif col in df.columns:
                     unique_count = df[col].nunique()
-                    value_counts = df[col].value_counts().head(10).to_dict()
+                    value_counts = df[col].value_counts()
+                    value_counts = value_counts[value_counts > 0].head(10).to_dict()
                     stats[col] = CategoricalStatsColumn(
                         unique_count=unique_count,
                         top_values=value_counts
@@ -201,29 +935,64 @@ class PandasDatasetAuditor:
             logger.error(f"Erreur lors de l'analyse des colonnes catégorielles: {e}")
             raise
 
-    def full_audit(
+    def run_audit(
         self,
         dataset_path: str,
-        save_report: bool = True,
-        report_path: Optional[str] = None,
+        mode: str,
+        workers: Optional[int] = None,
+        previous_state: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[List[Filter]] = None,
+        parts: Optional[List[str]] = None,
     ) -> AuditReport:
         """
-        Effectue un audit complet du dataset avec pandas
+        Audit du dataset avec pandas
 
         Args:
             dataset_path: Chemin vers le dataset
-            save_report: Si True, sauvegarde le rapport
-            report_path: Chemin pour sauvegarder le rapport
+            mode: "memory" charge tout le dataset, "streaming" le lit par chunks,
+                "incremental" n'audite que les row groups Parquet ajoutés depuis
+                ``previous_state``, "quick" estime les statistiques sur un
+                échantillon
+            workers: Nombre de processus entre lesquels répartir les colonnes en
+                mode mémoire (par défaut ``app_settings.audit_workers``)
+            previous_state: État d'un précédent audit incrémental ; le nouvel
+                état est disponible ensuite dans ``self.audit_state``
+            columns: Colonnes à auditer (toutes par défaut), modes "memory"
+                et "streaming" uniquement
+            filters: Filtres ``(colonne, opérateur, valeur)`` restreignant les
+                lignes auditées, modes "memory" et "streaming" uniquement
+            parts: Fichiers d'un dataset multi-fichiers, lus comme une seule
+                table à la place de ``dataset_path`` (qui ne sert alors qu'à
+                nommer le rapport) ; le mode "incremental" liste lui-même les
+                parts Parquet du préfixe, le mode "quick" ne les supporte pas
 
         Returns:
-            Dict contenant tous les résultats de l'audit
+            AuditReport: Rapport d'audit
         """
-        try:
-            logger.info(f"Début de l'audit du dataset avec pandas: {dataset_path}")
+        workers = workers or app_settings.audit_workers
+        subset = columns is not None or bool(filters)
+        if subset and mode not in ("memory", "streaming"):
+            raise ValueError(f"Colonnes et filtres non supportés en mode {mode}")
+        if parts and mode == "quick":
+            raise ValueError(f"Datasets multi-fichiers non supportés en mode {mode}")
+
+        if mode == "incremental":
+            audit_results, self.audit_state = self.incremental_audit(dataset_path, previous_state)
+            return audit_results
+        if mode == "quick":
+            return self.quick_audit(dataset_path)
+        # Les statistiques du footer décrivent tout le fichier : inutilisables sur un sous-ensemble
+        if dataset_path.endswith(".parquet") and app_settings.audit_parquet_footer and not subset and not parts:
+            return self.parquet_audit(dataset_path, streaming=mode == "streaming", workers=workers)
+        if mode == "streaming":
+            return self.streaming_audit(dataset_path, columns=columns, filters=filters, parts=parts)
 
-            # Charger le dataset
-            df = self.load_dataset(dataset_path)
+        # Charger le dataset (toutes ses parts, lues en parallèle, s'il est multi-fichiers)
+        df = self.load_dataset(parts or dataset_path, columns=columns, filters=filters)
 
+        audit_results = self.parallel_audit(df, dataset_path, workers) if workers > 1 else None
+        if audit_results is None:
             # Effectuer toutes les analyses
             audit_results = AuditReport(
                 dataset_path=dataset_path,
@@ -233,20 +1002,26 @@ class PandasDatasetAuditor:
                 descriptive_stats=self.get_descriptive_stats(df),
                 categorical_stats=self.get_categorical_stats(df),
             )
+        return audit_results
 
-            # Sauvegarder le rapport si demandé
-            if save_report:
-                if report_path is None:
-                    report_path = f"audit_report_pandas_{Path(dataset_path).stem}.json"
 
-                with open(report_path, "w", encoding="utf-8") as f:
-                    json.dump(audit_results.model_dump(), f, indent=2, default=convert_numpy_types)
+AUDITOR_BACKENDS = {
+    "pandas": "django_app_ml.dataset_audit.PandasDatasetAuditor",
+    "arrow": "django_app_ml.arrow_audit.ArrowDatasetAuditor",
+}
 
-                logger.info(f"Rapport d'audit pandas sauvegardé: {report_path}")
 
-            self.audit_results = audit_results
-            return audit_results
+def get_auditor(backend: Optional[str], bucket: "Bucket") -> BaseDatasetAuditor:
+    """
+    Instancie le backend d'audit ``backend`` (par défaut ``app_settings.audit_backend``)
 
-        except Exception as e:
-            logger.error(f"Erreur lors de l'audit complet avec pandas: {e}")
-            raise
+    Des backends supplémentaires peuvent être déclarés via
+    ``APP_ML_AUDIT_BACKENDS`` (nom -> chemin pointé de la classe).
+    """
+    backend = backend or app_settings.audit_backend
+    backends = {**AUDITOR_BACKENDS, **app_settings.audit_backends}
+    if backend not in backends:
+        raise ValueError(f"Backend d'audit inconnu: {backend}")
+    module_path, class_name = backends[backend].rsplit(".", 1)
+    auditor_class = getattr(importlib.import_module(module_path), class_name)
+    return auditor_class(bucket)
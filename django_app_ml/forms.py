@@ -4,7 +4,7 @@ from .models import DataSet, IAModel, Bucket
 class DatasetForm(forms.ModelForm):
     class Meta:
         model = DataSet
-        fields = ['name', 'description', 'link', 'bucket']
+        fields = ['name', 'description', 'link', 'bucket', 'auditor']
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -18,6 +18,7 @@ class DatasetForm(forms.ModelForm):
         self.fields['bucket'].queryset = Bucket.objects.all()
         self.fields['bucket'].required = False
         self.fields['bucket'].empty_label = "Sélectionner un bucket (optionnel)"
+        self.fields['auditor'].widget = forms.Select(attrs={"class": "form-control"}, choices=DataSet.AUDITOR_CHOICES)
 
 class ModelIAForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,407 @@
+"""
+Chargement des datasets (local ou S3) avec projection de colonnes et filtres
+
+Les filtres suivent la convention de ``pyarrow`` / ``pandas.read_parquet`` :
+une liste de tuples ``(colonne, opérateur, valeur)`` combinés par un ET,
+par exemple ``[("AMT_INCOME_TOTAL", ">", 0), ("CODE_GENDER", "in", ["F", "M"])]``.
+Une ligne dont la colonne filtrée est manquante est exclue, comme avec pyarrow.
+
+- Parquet : seules les colonnes demandées sont lues et les row groups dont les
+  statistiques min/max excluent le filtre ne sont pas téléchargés. Sur S3, le
+  footer est lu une fois puis les column chunks utiles sont téléchargés par
+  requêtes ranged parallèles, les plages voisines étant regroupées ; la
+  lecture par morceaux procède row group par row group. Seule la lecture
+  complète d'un fichier passe par le cache local, dont les misses sont
+  eux-mêmes téléchargés par requêtes ranged parallèles.
+- CSV : ``usecols`` limite le parsing aux colonnes utiles et les filtres sont
+  appliqués chunk par chunk, sans matérialiser les lignes rejetées.
+
+Un dataset multi-fichiers (voir ``DataSet.manifest``) est passé comme la liste
+de ses parts : elles sont lues en parallèle et concaténées en une seule table.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+from smart_open import open as s_open
+
+from .app_settings import app_settings
+from .logging import get_logger
+from .s3 import RangedS3File, get_s3_client
+from .s3_cache import get_s3_cache
+
+logger = get_logger(__name__)
+
+Filter = Tuple[str, str, Any]
+
+DatasetPath = Union[str, Sequence[str]]
+
+FILTER_OPERATORS = ("==", "!=", "<", "<=", ">", ">=", "in", "not in")
+
+
+def validate_filters(filters: Optional[Sequence[Filter]]) -> List[Filter]:
+    """
+    Vérifie et normalise une liste de filtres
+    """
+    normalized = []
+    for item in filters or []:
+        if len(item) != 3 or item[1] not in FILTER_OPERATORS:
+            raise ValueError(f"Filtre invalide: {item!r}")
+        column, op, value = item
+        if op in ("in", "not in"):
+            value = list(value)
+        normalized.append((column, op, value))
+    return normalized
+
+
+def filter_mask(df: pd.DataFrame, filters: Sequence[Filter]) -> pd.Series:
+    """
+    Masque booléen des lignes de ``df`` satisfaisant tous les filtres
+    """
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        series = df[column]
+        if op == "==":
+            condition = series == value
+        elif op == "!=":
+            condition = series != value
+        elif op == "<":
+            condition = series < value
+        elif op == "<=":
+            condition = series <= value
+        elif op == ">":
+            condition = series > value
+        elif op == ">=":
+            condition = series >= value
+        elif op == "in":
+            condition = series.isin(value)
+        else:
+            condition = ~series.isin(value)
+        mask &= condition & series.notna()
+    return mask
+
+
+def row_group_may_match(row_group, column_indices: Dict[str, int], filters: Sequence[Filter]) -> bool:
+    """
+    Indique, d'après les statistiques min/max du footer, si un row group peut
+    contenir des lignes satisfaisant les filtres
+
+    Args:
+        row_group: ``pyarrow.parquet.RowGroupMetaData``
+        column_indices: Nom de colonne -> index de la colonne dans le row group
+        filters: Filtres normalisés
+    """
+    for column, op, value in filters:
+        index = column_indices.get(column)
+        statistics = row_group.column(index).statistics if index is not None else None
+        if statistics is None or not statistics.has_min_max:
+            continue
+        low, high = statistics.min, statistics.max
+        try:
+            if op == "==":
+                possible = low <= value <= high
+            elif op == "!=":
+                possible = not (low == high == value)
+            elif op == "<":
+                possible = low < value
+            elif op == "<=":
+                possible = low <= value
+            elif op == ">":
+                possible = high > value
+            elif op == ">=":
+                possible = high >= value
+            elif op == "in":
+                possible = any(low <= item <= high for item in value)
+            else:
+                possible = not (low == high and low in value)
+        except TypeError:
+            # Types non comparables (ex: statistiques binaires) : on ne peut pas élaguer
+            possible = True
+        if not possible:
+            return False
+    return True
+
+
+def matching_row_groups(metadata, filters: Sequence[Filter]) -> List[int]:
+    """
+    Indices des row groups pouvant contenir des lignes satisfaisant les filtres
+    """
+    row_groups = list(range(metadata.num_row_groups))
+    if not filters:
+        return row_groups
+    column_indices = {metadata.schema.column(i).path: i for i in range(metadata.num_columns)}
+    return [rg for rg in row_groups if row_group_may_match(metadata.row_group(rg), column_indices, filters)]
+
+
+def column_chunk_ranges(metadata, row_groups: Sequence[int], columns: Optional[Sequence[str]]) -> List[Tuple[int, int]]:
+    """
+    Plages d'octets ``(début, fin)`` des column chunks à lire dans un fichier Parquet
+
+    Args:
+        metadata: ``pyarrow.parquet.FileMetaData``
+        row_groups: Row groups lus
+        columns: Colonnes lues (toutes si None) ; une colonne imbriquée est
+            désignée par son champ de premier niveau
+    """
+    wanted = set(columns) if columns is not None else None
+    ranges = []
+    for rg in row_groups:
+        row_group = metadata.row_group(rg)
+        for i in range(row_group.num_columns):
+            chunk = row_group.column(i)
+            if wanted is not None and chunk.path_in_schema.split(".")[0] not in wanted:
+                continue
+            start = chunk.data_page_offset
+            if chunk.has_dictionary_page and chunk.dictionary_page_offset:
+                start = min(start, chunk.dictionary_page_offset)
+            ranges.append((start, start + chunk.total_compressed_size))
+    return ranges
+
+
+def iter_row_group_batches(f, parquet_file, row_groups: Sequence[int], columns: Optional[Sequence[str]],
+                           batch_size: int):
+    """
+    Batches des row groups demandés, lus un row group à la fois
+
+    Sur un ``RangedS3File``, les column chunks utiles de chaque row group sont
+    téléchargés en parallèle juste avant sa lecture puis libérés : la mémoire
+    reste bornée par un row group.
+    """
+    ranged = isinstance(f, RangedS3File)
+    for rg in row_groups:
+        if ranged:
+            f.prefetch(column_chunk_ranges(parquet_file.metadata, [rg], columns))
+        yield from parquet_file.iter_batches(batch_size=batch_size, row_groups=[rg], columns=columns)
+        if ranged:
+            f.clear()
+
+
+class DatasetLoader:
+    """
+    Lecture des datasets locaux ou S3 partagée par l'audit et l'entraînement
+    """
+
+    def __init__(self, bucket=None):
+        self.bucket = bucket
+
+    def s3_client(self):
+        """
+        Client S3 partagé du bucket du dataset
+
+        Sans bucket, les identifiants par défaut de boto3 sont utilisés.
+        """
+        if self.bucket is None:
+            return get_s3_client()
+        return self.bucket.s3_client
+
+    def _s3_transport_params(self) -> Dict[str, Any]:
+        """
+        Paramètres smart_open pour accéder au bucket du dataset
+        """
+        return {"client": self.s3_client()}
+
+    def open(self, dataset_path: str, ranged: bool = False):
+        """
+        Ouvre le fichier du dataset en lecture binaire (local ou S3)
+
+        Si le cache S3 local est activé, l'objet est servi depuis sa copie sur
+        disque revalidée par ETag. Sinon smart_open traduit chaque ``seek`` en
+        requête GET ranged : lire le footer d'un Parquet ne télécharge que la
+        fin de l'objet.
+
+        Args:
+            dataset_path: Chemin local ou S3
+            ranged: Le lecteur ne touche qu'une partie de l'objet (footer Parquet,
+                quelques row groups) : le cache est contourné et seuls les octets
+                lus sont téléchargés (``RangedS3File``, footer en une requête)
+        """
+        if dataset_path.startswith("s3://"):
+            bucket_name, _, key = dataset_path[5:].partition("/")
+            if ranged:
+                return RangedS3File(self.s3_client(), bucket_name, key)
+            cache = get_s3_cache()
+            if cache is not None:
+                return cache.open(self.s3_client(), bucket_name, key)
+            return s_open(dataset_path, "rb", transport_params=self._s3_transport_params())
+        return open(dataset_path, "rb")
+
+    @staticmethod
+    def _check_format(dataset_path: str):
+        if not dataset_path.endswith((".parquet", ".csv")):
+            raise ValueError(f"Format de fichier non supporté: {dataset_path}")
+
+    @staticmethod
+    def _csv_usecols(columns: Optional[List[str]], filters: List[Filter]) -> Optional[List[str]]:
+        if columns is None:
+            return None
+        return list(dict.fromkeys(list(columns) + [column for column, _, _ in filters]))
+
+    def count_rows(self, dataset_path: str) -> Optional[int]:
+        """
+        Nombre de lignes d'un fichier Parquet lu dans son footer, None pour un CSV
+
+        Le cache local est contourné : seule la fin de l'objet est téléchargée.
+        """
+        import pyarrow.parquet as pq
+
+        if not dataset_path.endswith(".parquet"):
+            return None
+        with self.open(dataset_path, ranged=True) as f:
+            return pq.ParquetFile(f).metadata.num_rows
+
+    def read(
+        self,
+        dataset_path: DatasetPath,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+    ) -> pd.DataFrame:
+        """
+        Charge un dataset en DataFrame
+
+        Args:
+            dataset_path: Chemin local ou S3 (parquet ou csv), ou liste des parts
+                d'un dataset multi-fichiers
+            columns: Colonnes à lire (toutes par défaut)
+            filters: Filtres ``(colonne, opérateur, valeur)`` sur les lignes
+
+        Returns:
+            pandas.DataFrame: Dataset chargé, réduit aux colonnes et lignes demandées
+        """
+        if not isinstance(dataset_path, str):
+            return self.read_parts(dataset_path, columns=columns, filters=filters)
+        self._check_format(dataset_path)
+        filters = validate_filters(filters)
+        if dataset_path.startswith("s3://") and dataset_path.endswith(".parquet") and (
+            columns is not None or filters or get_s3_cache() is None
+        ):
+            # Lecture partielle : seuls les column chunks utiles sont téléchargés
+            return self._read_parquet_ranges(dataset_path, columns, filters)
+        with self.open(dataset_path) as f:
+            if dataset_path.endswith(".parquet"):
+                # pyarrow élague les row groups d'après les statistiques du footer
+                df = pd.read_parquet(f, columns=columns, filters=filters or None)
+            elif not filters:
+                df = pd.read_csv(f, usecols=columns)
+            else:
+                df = pd.concat(
+                    [
+                        chunk[filter_mask(chunk, filters)]
+                        for chunk in pd.read_csv(
+                            f, usecols=self._csv_usecols(columns, filters), chunksize=app_settings.audit_chunk_size
+                        )
+                    ],
+                    ignore_index=True,
+                )
+        # ``usecols`` ne conserve pas l'ordre demandé
+        return df[columns] if columns is not None else df
+
+    def _read_parquet_ranges(
+        self, dataset_path: str, columns: Optional[List[str]], filters: List[Filter]
+    ) -> pd.DataFrame:
+        """
+        Lit un Parquet S3 en téléchargeant en parallèle les seuls column chunks utiles
+        """
+        import pyarrow.parquet as pq
+
+        bucket_name, _, key = dataset_path[5:].partition("/")
+        read_columns = self._csv_usecols(columns, filters)
+        with RangedS3File(self.s3_client(), bucket_name, key) as f:
+            parquet_file = pq.ParquetFile(f)
+            metadata = parquet_file.metadata
+            row_groups = matching_row_groups(metadata, filters)
+            f.prefetch(column_chunk_ranges(metadata, row_groups, read_columns))
+            df = parquet_file.read_row_groups(row_groups, columns=read_columns).to_pandas()
+            logger.info(
+                f"{dataset_path}: {len(row_groups)}/{metadata.num_row_groups} row groups lus, "
+                f"{f.bytes_fetched}/{f.size} octets en {f.requests} requêtes"
+            )
+        if filters:
+            df = df[filter_mask(df, filters)].reset_index(drop=True)
+        return df[columns] if columns is not None else df
+
+    def read_parts(
+        self,
+        parts: Sequence[str],
+        columns: Optional[List[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        max_workers: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Charge les parts d'un dataset multi-fichiers en parallèle comme une seule table
+
+        Les lignes sont concaténées dans l'ordre des parts ; une colonne absente
+        d'une part y vaut NaN.
+
+        Args:
+            parts: Chemins des parts (parquet ou csv)
+            columns: Colonnes à lire (toutes par défaut)
+            filters: Filtres ``(colonne, opérateur, valeur)`` sur les lignes
+            max_workers: Parts lues simultanément (par défaut ``APP_ML_DATASET_READ_WORKERS``)
+        """
+        if not parts:
+            raise ValueError("Aucune part à lire pour ce dataset")
+        for part in parts:
+            self._check_format(part)
+        filters = validate_filters(filters)
+        max_workers = min(max_workers or app_settings.dataset_read_workers, len(parts))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(executor.map(lambda part: self.read(part, columns=columns, filters=filters), parts))
+        logger.info(f"{len(parts)} parts lues avec {max_workers} workers")
+        return pd.concat(frames, ignore_index=True)
+
+    def iter_chunks(
+        self,
+        dataset_path: DatasetPath,
+        chunk_size: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Lit un dataset par morceaux sans jamais le matérialiser entièrement
+
+        Les CSV sont lus par blocs de ``chunk_size`` lignes, les Parquet
+        groupe de lignes par groupe de lignes (découpés en batches d'au plus
+        ``chunk_size`` lignes) ; les row groups exclus par les filtres sont sautés.
+        Sur S3, les column chunks de chaque row group sont téléchargés en
+        parallèle juste avant sa lecture.
+        Les parts d'un dataset multi-fichiers sont lues l'une après l'autre,
+        pour que la mémoire reste bornée par un chunk.
+
+        Yields:
+            pandas.DataFrame: Un chunk du dataset
+        """
+        import pyarrow.parquet as pq
+
+        if not isinstance(dataset_path, str):
+            for part in dataset_path:
+                yield from self.iter_chunks(part, chunk_size, columns=columns, filters=filters)
+            return
+        self._check_format(dataset_path)
+        chunk_size = chunk_size or app_settings.audit_chunk_size
+        filters = validate_filters(filters)
+        read_columns = self._csv_usecols(columns, filters)
+
+        is_parquet = dataset_path.endswith(".parquet")
+        with self.open(dataset_path, ranged=is_parquet) as f:
+            if is_parquet:
+                parquet_file = pq.ParquetFile(f)
+                metadata = parquet_file.metadata
+                row_groups = matching_row_groups(metadata, filters)
+                if filters:
+                    logger.info(
+                        f"{metadata.num_row_groups - len(row_groups)} row groups sur "
+                        f"{metadata.num_row_groups} élagués pour {dataset_path}"
+                    )
+                if not row_groups:
+                    return
+                batches = (
+                    batch.to_pandas()
+                    for batch in iter_row_group_batches(f, parquet_file, row_groups, read_columns, chunk_size)
+                )
+            else:
+                batches = pd.read_csv(f, usecols=read_columns, chunksize=chunk_size)
+
+            for chunk in batches:
+                if filters:
+                    chunk = chunk[filter_mask(chunk, filters)]
+                yield chunk[columns] if columns is not None else chunk
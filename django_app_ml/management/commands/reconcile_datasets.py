@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from django_app_ml.app_settings import app_settings
+from django_app_ml.models import DataSet
+
+
+class Command(BaseCommand):
+    """
+    Refresh the persisted S3 state of every dataset.
+
+    Without option the reconciliation runs in the command (cron). ``--enqueue``
+    runs it once on a Dramatiq worker; ``--schedule`` starts the
+    self-rescheduling task, which then runs every ``APP_ML_S3_RECONCILE_INTERVAL``
+    seconds and replaces any chain started before.
+    """
+
+    help = "Rafraîchit l'état S3 (existence, ETag, taille) des datasets"
+
+    def add_arguments(self, parser):
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument("--enqueue", action="store_true", help="Lancer une réconciliation sur un worker Dramatiq")
+        group.add_argument(
+            "--schedule",
+            action="store_true",
+            help="Lancer la réconciliation périodique (toutes les APP_ML_S3_RECONCILE_INTERVAL secondes)",
+        )
+
+    def handle(self, *args, enqueue=False, schedule=False, **options):
+        if enqueue or schedule:
+            from django.core.cache import cache
+
+            from django_app_ml.tasks import RECONCILE_SCHEDULE_KEY, reconcile_datasets_task
+
+            if schedule and not app_settings.s3_reconcile_interval:
+                self.stderr.write("APP_ML_S3_RECONCILE_INTERVAL est désactivé")
+                return
+            message = reconcile_datasets_task.send_with_options(kwargs={"reschedule": schedule})
+            if schedule:
+                # Une chaîne déjà programmée s'arrêtera à sa prochaine exécution
+                cache.set(RECONCILE_SCHEDULE_KEY, message.message_id, timeout=None)
+            self.stdout.write(f"Réconciliation lancée (tâche {message.message_id})")
+            return
+        checked = DataSet.reconcile_s3_state()
+        self.stdout.write(self.style.SUCCESS(f"État S3 rafraîchi pour {checked} datasets"))
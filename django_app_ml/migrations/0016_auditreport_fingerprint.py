@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-17 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app_ml', '0015_mlflowtemplate_model_type_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditreport',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_index=True, max_length=255, null=True),
+        ),
+    ]
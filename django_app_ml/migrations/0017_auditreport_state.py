@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-17 11:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app_ml', '0016_auditreport_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditreport',
+            name='state',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-17 11:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app_ml', '0017_auditreport_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='auditor',
+            field=models.CharField(choices=[('pandas', 'Pandas'), ('arrow', 'Arrow (pyarrow.compute)')], default='pandas', max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-17 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app_ml', '0018_dataset_auditor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='parquet_key',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
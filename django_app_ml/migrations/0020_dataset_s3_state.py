@@ -0,0 +1,33 @@
+# Generated by Django 4.2.23 on 2026-10-17 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app_ml', '0019_dataset_parquet_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='s3_checked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='s3_etag',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='s3_exists',
+            field=models.BooleanField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='s3_size',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-17 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_app_ml', '0020_dataset_s3_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='manifest',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.23 on 2026-10-17 16:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from dramatiq import Message
+
+
+# Tasks launched for a dataset before TaskLink existed
+LINKED_ACTORS = ("ml_app.upload_dataset_task", "ml_app.audit_task")
+
+
+def backfill_task_links(apps, schema_editor):
+    Task = apps.get_model("django_dramatiq", "Task")
+    DataSet = apps.get_model("django_app_ml", "DataSet")
+    TaskLink = apps.get_model("django_app_ml", "TaskLink")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+
+    dataset_ids = set(DataSet.objects.values_list("id", flat=True))
+    if not dataset_ids:
+        return
+    content_type, _ = ContentType.objects.get_or_create(app_label="django_app_ml", model="dataset")
+    tasks = Task._default_manager.using(getattr(settings, "DRAMATIQ_TASKS_DATABASE", "default")).filter(
+        actor_name__in=LINKED_ACTORS
+    )
+    for task in tasks.iterator():
+        try:
+            dataset_id = Message.decode(bytes(task.message_data)).kwargs.get("dataset_id")
+        except Exception:
+            continue
+        if dataset_id not in dataset_ids:
+            continue
+        link = TaskLink.objects.create(
+            content_type=content_type, object_id=dataset_id, kind=task.actor_name, message_id=task.id
+        )
+        # created_at is auto_now_add: keep the launch date of the task
+        TaskLink.objects.filter(pk=link.pk).update(created_at=task.created_at)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('django_dramatiq', '0003_auto_20200204_0842'),
+        ('django_app_ml', '0021_dataset_manifest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('kind', models.CharField(max_length=100)),
+                ('message_id', models.UUIDField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['content_type', 'object_id', 'kind', '-created_at'], name='app_ml_tasklink_latest_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_task_links, migrations.RunPython.noop),
+    ]
@@ -8,9 +8,9 @@ from django.core.files.base import ContentFile
 import pandas as pd
 from rest_framework import status
 from django_dramatiq.models import Task
-from .models import ParquetBase
+from .models import ParquetBase, TaskLink
 from .decorator import timer
-from .task_utils import TaskResultManager
+from .task_utils import TaskResultManager, get_task_progress, get_tasks_progress, remember_task_route
 
 logger = logging.getLogger(__name__)
 
@@ -98,7 +98,7 @@ class TaskViewMixin:
 
         return Response(response_data, status=http_status)
 
-    def launch_task(self, task_func, task_kwargs, success_message, error_message):
+    def launch_task(self, task_func, task_kwargs, success_message, error_message, link_to=None):
         """
         Launch a task with the given parameters.
 
@@ -107,12 +107,19 @@ class TaskViewMixin:
             task_kwargs (dict): Keyword arguments for the task
             success_message (str): Success message to return
             error_message (str): Error message to return
+            link_to: Optional model instance the task is recorded against (``TaskLink``)
 
         Returns:
             Response: Formatted task response
         """
         try:
             task = task_func.send_with_options(kwargs=task_kwargs)
+            remember_task_route(task.message_id, task.queue_name, task.actor_name)
+            if link_to is not None:
+                try:
+                    TaskLink.record(link_to, task)
+                except Exception as e:
+                    logger.warning(f"Impossible de lier la tâche {task.message_id} à {link_to}: {e}")
             return self._format_task_response(
                 status="pending",
                 message=success_message,
@@ -128,130 +135,153 @@ class TaskViewMixin:
                 http_status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    def get_task_status(self, task_id, task_name="Tâche"):
+    def _task_status(self, task, task_name, get_result, get_progress):
         """
-        Get the status of a task.
+        Build the ``_format_task_response`` arguments describing a task.
 
         Args:
-            task_id (str): Task identifier
+            task (Task): django_dramatiq task row
             task_name (str): Human-readable task name for messages
+            get_result (callable): Returns the task result (may raise)
+            get_progress (callable): Returns the last progress snapshot or None
 
         Returns:
-            Response: Formatted task status response
+            dict: Keyword arguments for ``_format_task_response``
         """
-        try:
-            task = Task.tasks.get(id=task_id)
-            task_manager = TaskResultManager()
+        task_id = str(task.id)
 
-            # Check task status from django_dramatiq Task model
-            if task.status == Task.STATUS_ENQUEUED:
-                return self._format_task_response(
-                    status="pending",
-                    message=f"{task_name} en attente de traitement",
-                    task_id=task_id,
-                )
+        # Check task status from django_dramatiq Task model
+        if task.status == Task.STATUS_ENQUEUED:
+            return dict(
+                status="pending",
+                message=f"{task_name} en attente de traitement",
+                task_id=task_id,
+            )
 
-            elif task.status == Task.STATUS_RUNNING:
-                return self._format_task_response(
-                    status="running",
-                    message=f"{task_name} en cours d'exécution",
-                    task_id=task_id,
-                )
+        elif task.status == Task.STATUS_RUNNING:
+            progress = get_progress()
+            return dict(
+                status="running",
+                message=f"{task_name} en cours d'exécution",
+                task_id=task_id,
+                result={"progress": progress} if progress else None,
+            )
 
-            elif task.status == Task.STATUS_DONE:
-                # Task completed, get the result
-                result = task_manager.get_task_result(task_id)
-                logger.info(f"Task result: {result}")
-
-                # Check if result exists and contains error information
-                if result is not None:
-                    # Check if the result contains error information
-                    if isinstance(result, dict):
-                        if "error" in result and result["error"]:
-                            # Task completed but with errors
-                            error_message = (
-                                result.get("error")
-                                or result.get("exception")
-                                or result.get("failed")
-                                or "Erreur inconnue"
-                            )
-                            # Force le status de la tâche à failed en base
-                            task.status = Task.STATUS_FAILED
-                            task.save(update_fields=["status"])
-                            return self._format_task_response(
-                                status="failed",
-                                message=f"{task_name} terminée avec des erreurs",
-                                task_id=task_id,
-                                error=error_message,
-                                result=result,
-                                http_status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                            )
-                        else:
-                            # Task completed successfully with results
-                            return self._format_task_response(
-                                status="completed",
-                                message=f"{task_name} terminée avec succès",
-                                task_id=task_id,
-                                result=result,
-                            )
-                    elif isinstance(result, Exception):
-                        # Result is an exception object
-                        return self._format_task_response(
+        elif task.status == Task.STATUS_DONE:
+            # Task completed, get the result
+            result = get_result()
+            logger.info(f"Task result: {result}")
+
+            # Check if result exists and contains error information
+            if result is not None:
+                # Check if the result contains error information
+                if isinstance(result, dict):
+                    if "error" in result and result["error"]:
+                        # Task completed but with errors
+                        error_message = (
+                            result.get("error")
+                            or result.get("exception")
+                            or result.get("failed")
+                            or "Erreur inconnue"
+                        )
+                        # Force le status de la tâche à failed en base
+                        task.status = Task.STATUS_FAILED
+                        task.save(update_fields=["status"])
+                        return dict(
                             status="failed",
-                            message=f"{task_name} terminée avec une exception",
+                            message=f"{task_name} terminée avec des erreurs",
                             task_id=task_id,
-                            error=str(result),
-                            result={"exception": str(result)},
+                            error=error_message,
+                            result=result,
                             http_status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                         )
                     else:
-                        # Result exists but is not a dict or exception - assume success
-                        return self._format_task_response(
+                        # Task completed successfully with results
+                        return dict(
                             status="completed",
                             message=f"{task_name} terminée avec succès",
                             task_id=task_id,
                             result=result,
                         )
+                elif isinstance(result, Exception):
+                    # Result is an exception object
+                    return dict(
+                        status="failed",
+                        message=f"{task_name} terminée avec une exception",
+                        task_id=task_id,
+                        error=str(result),
+                        result={"exception": str(result)},
+                        http_status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    )
                 else:
-                    # No result available - this could indicate a problem
-                    return self._format_task_response(
+                    # Result exists but is not a dict or exception - assume success
+                    return dict(
                         status="completed",
-                        message=f"{task_name} terminée mais aucun résultat disponible",
+                        message=f"{task_name} terminée avec succès",
                         task_id=task_id,
-                        result={"warning": "Aucun résultat retourné par la tâche"},
+                        result=result,
                     )
-
-            elif task.status == Task.STATUS_FAILED:
-                # Task failed, get error details
-                error_message = task.error or "Erreur inconnue"
-                result_data = None
-
-                # Try to get more detailed error information
-                try:
-                    result = task_manager.get_task_result(task_id)
-                    if result and isinstance(result, dict) and "error" in result:
-                        error_message = result["error"]
-                        result_data = result
-                except:
-                    pass
-
-                return self._format_task_response(
-                    status="failed",
-                    message=f"{task_name} échouée",
-                    task_id=task_id,
-                    error=error_message,
-                    result=result_data,
-                    http_status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                )
-
             else:
-                # Unknown status
-                return self._format_task_response(
-                    status="unknown",
-                    message=f"Statut inconnu: {task.status}",
+                # No result available - this could indicate a problem
+                return dict(
+                    status="completed",
+                    message=f"{task_name} terminée mais aucun résultat disponible",
                     task_id=task_id,
+                    result={"warning": "Aucun résultat retourné par la tâche"},
                 )
 
+        elif task.status == Task.STATUS_FAILED:
+            # Task failed, get error details
+            error_message = getattr(task, "error", None) or "Erreur inconnue"
+            result_data = None
+
+            # Try to get more detailed error information
+            try:
+                result = get_result()
+                if result and isinstance(result, dict) and "error" in result:
+                    error_message = result["error"]
+                    result_data = result
+            except:
+                pass
+
+            return dict(
+                status="failed",
+                message=f"{task_name} échouée",
+                task_id=task_id,
+                error=error_message,
+                result=result_data,
+                http_status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        else:
+            # Unknown status
+            return dict(
+                status="unknown",
+                message=f"Statut inconnu: {task.status}",
+                task_id=task_id,
+            )
+
+    def get_task_status(self, task_id, task_name="Tâche"):
+        """
+        Get the status of a task.
+
+        Args:
+            task_id (str): Task identifier
+            task_name (str): Human-readable task name for messages
+
+        Returns:
+            Response: Formatted task status response
+        """
+        try:
+            task = Task.tasks.get(id=task_id)
+            task_manager = TaskResultManager()
+            return self._format_task_response(**self._task_status(
+                task,
+                task_name,
+                get_result=lambda: task_manager.get_task_result(task_id),
+                get_progress=lambda: get_task_progress(task_id),
+            ))
+
         except Task.DoesNotExist:
             return self._format_task_response(
                 status="failed",
@@ -270,4 +300,41 @@ class TaskViewMixin:
                 http_status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    def get_task_statuses(self, task_ids, task_name="Tâche"):
+        """
+        Get the status of many tasks in one database query and one result
+        backend round trip.
+
+        Args:
+            task_ids (list): Task identifiers
+            task_name (str): Human-readable task name for messages
 
+        Returns:
+            dict: Task id -> payload of ``_format_task_response`` (without the HTTP status)
+        """
+        tasks = {str(task.id): task for task in Task.tasks.filter(id__in=task_ids)}
+        finished = [task for task in tasks.values() if task.status in (Task.STATUS_DONE, Task.STATUS_FAILED)]
+        running = [task_id for task_id, task in tasks.items() if task.status == Task.STATUS_RUNNING]
+        results = TaskResultManager().get_task_results(finished) if finished else {}
+        progress = get_tasks_progress(running) if running else {}
+
+        statuses = {}
+        for task_id in task_ids:
+            task = tasks.get(str(task_id))
+            if task is None:
+                kwargs = dict(status="failed", message="Tâche non trouvée", task_id=task_id, error="Tâche non trouvée")
+            else:
+                try:
+                    kwargs = self._task_status(
+                        task,
+                        task_name,
+                        get_result=lambda: results.get(str(task.id)),
+                        get_progress=lambda: progress.get(str(task.id)),
+                    )
+                except Exception as e:
+                    logger.error(f"Erreur lors de la récupération du statut de la tâche {task_id}: {e}")
+                    kwargs = dict(status="failed", message="Erreur lors de la récupération du statut",
+                                  task_id=task_id, error=str(e))
+            kwargs.pop("http_status", None)
+            statuses[str(task_id)] = self._format_task_response(**kwargs).data
+        return statuses
@@ -5,6 +5,10 @@ from sklearn.impute import SimpleImputer
 from sklearn.preprocessing import MinMaxScaler
 from imblearn.over_sampling import SMOTE
 
+FEATURE_COLUMNS = ['EXT_SOURCE_1', 'EXT_SOURCE_2', 'EXT_SOURCE_3']
+TARGET_COLUMN = 'TARGET'
+TRAIN_COLUMNS = FEATURE_COLUMNS + [TARGET_COLUMN]
+
 
 def train(df_train:pd.DataFrame, checkpoint: Path):
     """
@@ -14,10 +18,8 @@ def train(df_train:pd.DataFrame, checkpoint: Path):
     imputer = SimpleImputer(strategy='median')
     scaler = MinMaxScaler(feature_range=(0, 1))
     weighter = SMOTE(random_state=42)
-    y_train = df_train['TARGET']
-    X_train = df_train.drop('TARGET', axis=1)
-    columns = ['EXT_SOURCE_1', 'EXT_SOURCE_2', 'EXT_SOURCE_3']
-    X_train = X_train.loc[:, columns]
+    y_train = df_train[TARGET_COLUMN]
+    X_train = df_train.loc[:, FEATURE_COLUMNS]
     X_train_imputed = imputer.fit_transform(X_train)
     X_train_scaled = scaler.fit_transform(X_train_imputed)
     X_train_weighted, y_train_weighted = weighter.fit_resample(X_train_scaled, y_train)
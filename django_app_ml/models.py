@@ -1,15 +1,29 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from storages.backends.s3boto3 import S3Boto3Storage
 from django_app_ml.app_settings import app_settings
 from django_app_ml.validators import validate_url_or_s3
 from pathlib import Path
 from django.conf import settings
+from django.utils import timezone
 import requests
-import io
 import os
+import posixpath
+import tempfile
 from django_dramatiq.models import Task
-from concurrent.futures import ThreadPoolExecutor
 from .logging import get_logger
+from .s3 import (
+    download_file,
+    get_s3_client,
+    head_object_state,
+    list_object_states,
+    object_states,
+    upload_file,
+    upload_url_to_s3,
+    upload_zip_members,
+)
+from .s3_cache import get_s3_cache
 
 logger = get_logger(__name__)
 
@@ -46,34 +60,32 @@ class Bucket(models.Model):
             return link
     
     def check_if_file_exists(self, s3_key):
-        from boto3 import client
-        
-        s3_client = client(
-            "s3",
-            aws_access_key_id=self.access_key,
-            aws_secret_access_key=self.secret_key,
-            endpoint_url=self.endpoint
-        )
         try:
-            s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+            self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
             logger.info(f"File {s3_key} exists in bucket {self.bucket_name}")
             return True
         except Exception as e:
             logger.error(f"Error checking if file exists {s3_key}: {e}")
             return False
     
+    @property
+    def client_credentials(self):
+        """
+        Credentials and endpoint identifying the shared S3 client of this bucket
+        """
+        return {
+            "access_key": self.access_key,
+            "secret_key": self.secret_key,
+            "endpoint": self.endpoint,
+            "region": self.region,
+        }
+
     @property
     def s3_client(self):
         """
-        Return a S3 client
+        Return the process-wide S3 client for this bucket's credentials
         """
-        from boto3 import client
-        return client(
-            "s3",
-            aws_access_key_id=self.access_key,
-            aws_secret_access_key=self.secret_key,
-            endpoint_url=self.endpoint
-        )
+        return get_s3_client(**self.client_credentials)
 
     def upload_file(self, link):
         """
@@ -83,7 +95,7 @@ class Bucket(models.Model):
         key = self._extract_s3_key(link)
         
         try:
-            self.s3_client.upload_file(link, self.bucket_name, key)
+            upload_file(self.s3_client, link, self.bucket_name, key)
             return True
         except Exception as e:
             logger.error(f"Error uploading file {link}: {e}")
@@ -98,7 +110,12 @@ class Bucket(models.Model):
         
         try:
             file_path = Path(settings.MEDIA_ROOT) / f"datasets/{key}"
-            self.s3_client.download_file(Bucket=self.bucket_name, Key=key, Filename=file_path)
+            cache = get_s3_cache()
+            if cache is not None:
+                # Served from the local object cache when the ETag is unchanged
+                cache.copy_to(self.s3_client, self.bucket_name, key, str(file_path))
+            else:
+                download_file(self.s3_client, self.bucket_name, key, file_path)
             return True
         except Exception as e:
             logger.error(f"Error downloading file {link}: {e}")
@@ -106,7 +123,11 @@ class Bucket(models.Model):
 
     def upload_from_url(self, url, s3_key):
         """
-        Download a file from a URL and upload it directly to S3 without local storage.
+        Stream a file from a URL to S3 without local storage.
+
+        The download is fed into a multipart upload with bounded memory; an
+        incomplete upload of the same key left by a previous attempt is resumed
+        when the remote file is unchanged, restarted otherwise.
         
         Args:
             url: The URL to download the file from
@@ -116,17 +137,7 @@ class Bucket(models.Model):
             bool: True if successful, False otherwise
         """
         try:
-            # Download the file from URL
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            
-            # Upload directly to S3 using upload_fileobj
-            self.s3_client.upload_fileobj(
-                io.BytesIO(response.content),
-                self.bucket_name,
-                s3_key
-            )
-            
+            upload_url_to_s3(self.s3_client, url, self.bucket_name, s3_key)
             logger.info(f"Successfully uploaded {url} to S3 as {s3_key}")
             return True
             
@@ -142,6 +153,8 @@ class AuditReport(models.Model):
     dataset = models.ForeignKey("DataSet", on_delete=models.CASCADE, related_name="reports")
     report = models.JSONField(default=dict, null=True, blank=True)
     file = models.FileField(upload_to="reports", null=True, blank=True)
+    fingerprint = models.CharField(max_length=255, null=True, blank=True, db_index=True)
+    state = models.JSONField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -157,7 +170,86 @@ class IARecommandation(models.Model):
     def __str__(self):
         return self.dataset.name
 
+class TaskLink(models.Model):
+    """
+    Dramatiq task launched for an object (dataset, model...).
+
+    Recorded when the task is enqueued, so the latest task of a kind for an
+    object is one indexed query instead of a scan of the stored messages.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    content_object = GenericForeignKey("content_type", "object_id")
+    # Dramatiq actor name of the task (``message.actor_name``), e.g. "ml_app.upload_dataset_task"
+    kind = models.CharField(max_length=100)
+    message_id = models.UUIDField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["content_type", "object_id", "kind", "-created_at"], name="app_ml_tasklink_latest_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.message_id}"
+
+    @classmethod
+    def record(cls, obj, message):
+        """
+        Link an enqueued Dramatiq message to ``obj``.
+        """
+        return cls.objects.create(content_object=obj, kind=message.actor_name, message_id=message.message_id)
+
+    @classmethod
+    def latest_message_ids(cls, model, kind):
+        """
+        Subquery of the latest message id of ``kind`` for the outer ``model`` row.
+        """
+        return models.Subquery(
+            cls.objects.filter(
+                content_type=ContentType.objects.get_for_model(model),
+                object_id=models.OuterRef("pk"),
+                kind=kind,
+            ).order_by("-created_at").values("message_id")[:1]
+        )
+
+    @classmethod
+    def latest_task(cls, obj, kind):
+        """
+        Latest task of ``kind`` launched for ``obj``, or None.
+        """
+        message_id = (
+            cls.objects.filter(content_type=ContentType.objects.get_for_model(obj), object_id=obj.pk, kind=kind)
+            .order_by("-created_at")
+            .values_list("message_id", flat=True)
+            .first()
+        )
+        if message_id is None:
+            return None
+        return Task.tasks.filter(id=message_id).first()
+
+    @classmethod
+    def attach_latest_tasks(cls, queryset, kind, attr):
+        """
+        Evaluate ``queryset`` and set ``attr`` on each row to its latest task of ``kind``.
+
+        One query for the rows (with their latest message id) and one for the tasks,
+        whatever the number of rows.
+        """
+        objects = list(queryset.annotate(_latest_message_id=cls.latest_message_ids(queryset.model, kind)))
+        message_ids = {obj._latest_message_id for obj in objects if obj._latest_message_id}
+        tasks = {task.id: task for task in Task.tasks.filter(id__in=message_ids)} if message_ids else {}
+        for obj in objects:
+            setattr(obj, attr, tasks.get(obj._latest_message_id))
+        return objects
+
+
 class DataSet(models.Model):
+    AUDITOR_CHOICES = [
+        ("pandas", "Pandas"),
+        ("arrow", "Arrow (pyarrow.compute)"),
+    ]
+
     link = models.URLField(validators=[validate_url_or_s3], null=True, blank=True, default='source du dataset')
     s3_key = models.CharField(max_length=50)
     name = models.CharField(max_length=50)
@@ -166,27 +258,181 @@ class DataSet(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     bucket = models.ForeignKey(Bucket, on_delete=models.CASCADE, related_name="datasets", null=True, blank=True)
+    auditor = models.CharField(max_length=20, choices=AUDITOR_CHOICES, default="pandas")
+    parquet_key = models.CharField(max_length=255, null=True, blank=True)
+    s3_exists = models.BooleanField(null=True, blank=True)
+    s3_etag = models.CharField(max_length=255, null=True, blank=True)
+    s3_size = models.BigIntegerField(null=True, blank=True)
+    s3_checked_at = models.DateTimeField(null=True, blank=True)
+    # Parts of a multi-file dataset: [{"key", "size", "etag", "rows"}]
+    manifest = models.JSONField(null=True, blank=True)
+
+    S3_STATE_FIELDS = ["s3_exists", "s3_etag", "s3_size", "s3_checked_at"]
+    # Actor name of tasks.upload_dataset_task, as stored in TaskLink.kind
+    UPLOAD_TASK_KIND = "ml_app.upload_dataset_task"
+    MANIFEST_EXTENSIONS = (".csv", ".parquet")
 
     def __str__(self):
         return self.name
     
     @property
     def downloaded(self):
-        if self.bucket:
-            return self.bucket.check_if_file_exists(self.s3_key)
-        else:
+        """
+        Whether the dataset is in its bucket, as last recorded by an upload task
+        or the reconciler. No S3 request is made, except once for a dataset
+        whose state was never recorded (created before it was persisted): it
+        is then checked and saved.
+        """
+        if not self.bucket:
             return False
+        if self.s3_exists is None:
+            try:
+                self.refresh_s3_state()
+            except Exception as e:
+                logger.warning(f"Could not check the S3 state of dataset {self.name}: {e}")
+                return False
+        return bool(self.s3_exists)
+
+    def record_s3_state(self, state, save=True):
+        """
+        Persist the existence, ETag and size of the dataset object.
+
+        Args:
+            state: dict with "etag" and "size", or None if the object is missing
+            save: Save the fields immediately
+        """
+        self.s3_exists = state is not None
+        self.s3_etag = state["etag"] if state else None
+        self.s3_size = state["size"] if state else None
+        self.s3_checked_at = timezone.now()
+        if save:
+            self.save(update_fields=self.S3_STATE_FIELDS)
+
+    def refresh_s3_state(self):
+        """
+        Check the dataset object with a live HeadObject and persist the result.
+
+        Returns:
+            bool: True if the object exists
+        """
+        if not self.bucket:
+            return False
+        if self.manifest:
+            states = object_states(self.bucket.s3_client, self.bucket.bucket_name, self.s3_keys)
+            self.record_s3_state(self.combined_s3_state(states))
+        else:
+            self.record_s3_state(head_object_state(self.bucket.s3_client, self.bucket.bucket_name, self.s3_key))
+        return self.s3_exists
+
+    @property
+    def s3_keys(self):
+        """
+        Keys of the objects making up the dataset: its manifest parts, or ``s3_key``
+        """
+        if self.manifest:
+            return [part["key"] for part in self.manifest]
+        return [self.s3_key]
+
+    def combined_s3_state(self, states):
+        """
+        State of the whole dataset from the states of its objects.
+
+        A multi-file dataset exists only if all its parts do; its size is the
+        sum of the part sizes and it has no single ETag.
+        """
+        if not self.manifest:
+            return states[self.s3_key]
+        part_states = [states[key] for key in self.s3_keys]
+        if any(state is None for state in part_states):
+            return None
+        return {"etag": None, "size": sum(state["size"] for state in part_states)}
+
+    @property
+    def manifest_prefix(self):
+        """
+        Key prefix under which the files of a multi-file dataset are stored
+        """
+        return f"{self.name}/"
+
+    def build_manifest(self, save=True):
+        """
+        List the data files stored under ``manifest_prefix`` and record them as
+        the dataset manifest, with their size, ETag and, for Parquet files, the
+        row count read from the footer.
+
+        Returns:
+            list: The manifest parts, sorted by key
+        """
+        from .loaders import DatasetLoader
+
+        loader = DatasetLoader(self.bucket)
+        listed = list_object_states(self.bucket.s3_client, self.bucket.bucket_name, self.manifest_prefix)
+        self.manifest = [
+            {
+                "key": key,
+                "size": state["size"],
+                "etag": state["etag"],
+                "rows": loader.count_rows(f"s3://{self.bucket.bucket_name}/{key}"),
+            }
+            for key, state in sorted(listed.items())
+            if key.lower().endswith(self.MANIFEST_EXTENSIONS)
+        ]
+        if save:
+            self.save(update_fields=["manifest"])
+        logger.info(f"Manifest of dataset {self.name}: {len(self.manifest)} parts")
+        return self.manifest
+
+    @classmethod
+    def reconcile_s3_state(cls, datasets=None):
+        """
+        Refresh the persisted S3 state of datasets, one listing per shared prefix.
+
+        Returns:
+            int: Number of datasets checked
+        """
+        if datasets is None:
+            datasets = cls.objects.exclude(bucket=None).select_related("bucket")
+        by_bucket = {}
+        for dataset in datasets:
+            if dataset.bucket:
+                by_bucket.setdefault(dataset.bucket.pk, []).append(dataset)
+        checked = 0
+        for members in by_bucket.values():
+            bucket = members[0].bucket
+            try:
+                states = object_states(
+                    bucket.s3_client, bucket.bucket_name, {key for dataset in members for key in dataset.s3_keys}
+                )
+            except Exception as e:
+                logger.error(f"Error reconciling datasets of bucket {bucket.bucket_name}: {e}")
+                continue
+            for dataset in members:
+                dataset.record_s3_state(dataset.combined_s3_state(states), save=False)
+            cls.objects.bulk_update(members, cls.S3_STATE_FIELDS)
+            checked += len(members)
+        return checked
         
     @property
     def last_download_task(self):
-        task = Task.tasks.filter(queue_name="upload").first()
-        if task and task.message.kwargs["dataset_id"] == self.id:
-            return task
-        return None
+        if not hasattr(self, "_last_download_task"):
+            self._last_download_task = TaskLink.latest_task(self, self.UPLOAD_TASK_KIND)
+        return self._last_download_task
+
+    @classmethod
+    def with_last_download_task(cls, queryset=None):
+        """
+        Datasets with ``last_download_task`` preloaded in two queries, for listings.
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+        return TaskLink.attach_latest_tasks(queryset, cls.UPLOAD_TASK_KIND, "_last_download_task")
 
-    def upload_dataset(self):
+    def upload_dataset(self, progress=None):
         """
         Upload a dataset to the S3 bucket.
+
+        Args:
+            progress: Optional callable receiving progress snapshots (Kaggle datasets)
         """
         if not self.bucket:
             logger.warning(f"No bucket configured for dataset {self.name}")
@@ -194,7 +440,7 @@ class DataSet(models.Model):
         
         # Check if it's a Kaggle dataset
         if 'kaggle' in self.link.lower():
-            return self._upload_kaggle_dataset_sync()
+            return self._upload_kaggle_dataset_sync(progress=progress)
         
         return self.bucket.upload_from_url(self.link, self.s3_key)
     
@@ -205,58 +451,72 @@ class DataSet(models.Model):
         """
         return f"s3://{self.bucket.bucket_name}/{self.s3_key}"
 
-    def _upload_kaggle_dataset_sync(self):
+    @property
+    def read_location(self):
+        """
+        Return the location consumers should read: the Parquet copy converted
+        on ingest if any, the original link otherwise
+        """
+        if self.parquet_key and self.bucket:
+            return f"s3://{self.bucket.bucket_name}/{self.parquet_key}"
+        if self.manifest and self.bucket:
+            return f"s3://{self.bucket.bucket_name}/{self.manifest_prefix}"
+        return self.link
+
+    @property
+    def read_parts(self):
+        """
+        Locations of the parts of a multi-file dataset, None for a single file
+        """
+        if self.parquet_key or not (self.manifest and self.bucket):
+            return None
+        return [f"s3://{self.bucket.bucket_name}/{part['key']}" for part in self.manifest]
+
+    def convert_to_parquet(self, column_types=None):
         """
-        Synchronous wrapper for Kaggle dataset upload using ThreadPoolExecutor.
+        Convert the uploaded CSV to Parquet next to it and record its key.
+        """
+        from .parquet_conversion import convert_s3_csv_to_parquet
+
+        if not self.bucket or not self.s3_key.lower().endswith(".csv"):
+            logger.info(f"Dataset {self.name} is not a CSV stored in S3, no Parquet conversion")
+            return None
+        self.parquet_key = convert_s3_csv_to_parquet(self.bucket, self.s3_key, column_types=column_types)
+        self.save(update_fields=["parquet_key"])
+        return self.parquet_key
+
+    def _upload_kaggle_dataset_sync(self, progress=None):
+        """
+        Ingest a Kaggle dataset: download its archive, then stream each file
+        from the archive to S3 without extracting it.
+
+        The temporary directory holding the archive is always removed.
+
+        Args:
+            progress: Optional callable receiving a progress snapshot after each file
         """
         try:
-            # Download Kaggle dataset to temporary directory
-            downloaded_files = self.download_kaggle_dataset()
-            
-            if not downloaded_files:
-                logger.error(f"Failed to download Kaggle dataset: {self.link}")
-                return False
-            
-            # Use ThreadPoolExecutor for concurrent uploads
-            with ThreadPoolExecutor(max_workers=10) as executor:
-                # Create upload tasks
-                upload_futures = []
-                for file_path in downloaded_files:
-                    filename = os.path.basename(file_path)
-                    s3_key = f"{self.name}/{filename}"
-                    future = executor.submit(self._upload_file_to_s3_sync, file_path, s3_key)
-                    upload_futures.append((future, file_path))
-                
-                # Wait for all uploads to complete and collect results
-                success_count = 0
-                for future, file_path in upload_futures:
-                    try:
-                        result = future.result()
-                        if result:
-                            success_count += 1
-                            logger.info(f"Successfully uploaded {os.path.basename(file_path)} to S3")
-                        else:
-                            logger.error(f"Failed to upload {os.path.basename(file_path)} to S3")
-                    except Exception as e:
-                        logger.error(f"Error uploading {os.path.basename(file_path)} to S3: {e}")
-                    
-                    # Clean up local file
-                    try:
-                        os.remove(file_path)
-                    except OSError as e:
-                        logger.warning(f"Could not remove temporary file {file_path}: {e}")
-            
-            # Clean up the temporary directory
-            temp_dir = os.path.dirname(downloaded_files[0]) if downloaded_files else None
-            if temp_dir and os.path.exists(temp_dir):
-                try:
-                    os.rmdir(temp_dir)
-                except OSError:
-                    # Directory not empty, leave it for now
-                    pass
-            
-            return success_count > 0
-            
+            with tempfile.TemporaryDirectory(dir=app_settings.kaggle_download_dir) as temp_dir:
+                archive_path = self.download_kaggle_dataset(temp_dir)
+                if not archive_path:
+                    logger.error(f"Failed to download Kaggle dataset: {self.link}")
+                    return False
+
+                summary = upload_zip_members(
+                    self.bucket.s3_client,
+                    archive_path,
+                    self.bucket.bucket_name,
+                    key_for=lambda member: f"{self.manifest_prefix}{posixpath.basename(member)}",
+                    progress=progress,
+                )
+            if summary["files_done"]:
+                self.build_manifest()
+            logger.info(
+                f"Kaggle dataset {self.link}: {summary['files_done']}/{summary['files_total']} files uploaded, "
+                f"{summary['files_failed']} failed"
+            )
+            return summary["files_done"] > 0
+
         except Exception as e:
             logger.error(f"Error in _upload_kaggle_dataset_sync: {e}")
             return False
@@ -266,11 +526,7 @@ class DataSet(models.Model):
         Synchronous method to upload a file to S3.
         """
         try:
-            self.bucket.s3_client.upload_file(
-                file_path,
-                self.bucket.bucket_name,
-                s3_key
-            )
+            upload_file(self.bucket.s3_client, file_path, self.bucket.bucket_name, s3_key)
             return True
         except Exception as e:
             logger.error(f"Error uploading {file_path} to S3: {e}")
@@ -285,37 +541,32 @@ class DataSet(models.Model):
         else:
             return None
         
-    def download_kaggle_dataset(self):
+    def download_kaggle_dataset(self, path):
         """
-        Download a Kaggle dataset and return list of downloaded file paths.
+        Download the archive of a Kaggle dataset into ``path`` without unzipping it.
+
+        Returns:
+            str: Path of the downloaded ZIP archive, or None on failure
         """
         try:
             from kaggle import KaggleApi
-            import tempfile
-            
-            # Create temporary directory for download
-            temp_dir = tempfile.mkdtemp()
             
             api = KaggleApi()
             api.authenticate()
             
-            # Download dataset to temporary directory
             dataset_kaggle_name = self.link.replace("https://www.kaggle.com/datasets", "").lstrip("/")
-            api.dataset_download_files(dataset_kaggle_name, path=temp_dir, unzip=True)
-            
-            # Get list of downloaded files
-            downloaded_files = []
-            for root, dirs, files in os.walk(temp_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    downloaded_files.append(file_path)
+            api.dataset_download_files(dataset_kaggle_name, path=path, unzip=False)
             
-            logger.info(f"Downloaded {len(downloaded_files)} files from Kaggle dataset")
-            return downloaded_files
+            archives = [os.path.join(path, name) for name in os.listdir(path) if name.endswith(".zip")]
+            if not archives:
+                logger.error(f"No archive downloaded for Kaggle dataset {self.link}")
+                return None
+            logger.info(f"Downloaded Kaggle archive {archives[0]} ({os.path.getsize(archives[0])} bytes)")
+            return archives[0]
             
         except Exception as e:
             logger.error(f"Error downloading Kaggle dataset {self.link}: {e}")
-            return []
+            return None
 
 
 class IAModel(models.Model):
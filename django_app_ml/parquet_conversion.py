@@ -0,0 +1,145 @@
+"""
+Conversion en flux des CSV en Parquet typé et compressé
+
+Le CSV n'est jamais chargé en entier : le schéma est inféré sur un
+échantillon borné (les ``csv_inference_sample_rows`` premières lignes), puis
+le fichier est relu par blocs avec ``pyarrow.csv.open_csv`` et écrit en row
+groups de ``parquet_row_group_size`` lignes. Les types inférés peuvent être
+forcés colonne par colonne (ex: ``{"SK_ID_CURR": "int64", "CODE": "string"}``),
+notamment quand une colonne d'entiers dans l'échantillon contient des décimales
+plus loin dans le fichier.
+"""
+import io
+from typing import Dict, Optional
+
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+from .app_settings import app_settings
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def parquet_key_for(csv_key: str) -> str:
+    """
+    Clé du Parquet converti, stocké à côté du CSV d'origine
+    """
+    base = csv_key[:-len(".csv")] if csv_key.lower().endswith(".csv") else csv_key
+    return base + ".parquet"
+
+
+def _read_sample(source, sample_rows: int) -> bytes:
+    lines = []
+    for _ in range(sample_rows + 1):
+        line = source.readline()
+        if not line:
+            break
+        lines.append(line)
+    return b"".join(lines)
+
+
+def infer_csv_schema(
+    source,
+    sample_rows: Optional[int] = None,
+    column_types: Optional[Dict[str, str]] = None,
+) -> pa.Schema:
+    """
+    Infère le schéma d'un CSV à partir de ses premières lignes
+
+    Args:
+        source: Fichier CSV ouvert en binaire
+        sample_rows: Nombre de lignes de l'échantillon
+        column_types: Types forcés (nom de colonne -> type Arrow, ex: "float64")
+
+    Returns:
+        pyarrow.Schema: Schéma à appliquer à tout le fichier
+    """
+    sample_rows = sample_rows or app_settings.csv_inference_sample_rows
+    column_types = {**app_settings.csv_column_types, **(column_types or {})}
+    sample = pv.read_csv(
+        io.BytesIO(_read_sample(source, sample_rows)),
+        convert_options=pv.ConvertOptions(strings_can_be_null=True),
+    )
+    fields = []
+    for field in sample.schema:
+        if field.name in column_types:
+            field = field.with_type(pa.type_for_alias(column_types[field.name]))
+        elif pa.types.is_null(field.type):
+            # Colonne vide dans l'échantillon : le type réel est inconnu
+            field = field.with_type(pa.string())
+        fields.append(field)
+    return pa.schema(fields)
+
+
+def convert_csv_to_parquet(
+    source,
+    sink,
+    schema: pa.Schema,
+    row_group_size: Optional[int] = None,
+    compression: Optional[str] = None,
+) -> int:
+    """
+    Convertit un CSV en Parquet bloc par bloc
+
+    Args:
+        source: Fichier CSV ouvert en binaire
+        sink: Fichier de destination ouvert en écriture binaire
+        schema: Schéma issu de ``infer_csv_schema``
+        row_group_size: Nombre de lignes par row group
+        compression: Codec Parquet (``zstd``, ``snappy``…)
+
+    Returns:
+        int: Nombre de lignes écrites
+    """
+    row_group_size = row_group_size or app_settings.parquet_row_group_size
+    compression = compression or app_settings.parquet_compression
+    reader = pv.open_csv(
+        source,
+        convert_options=pv.ConvertOptions(
+            column_types={field.name: field.type for field in schema},
+            strings_can_be_null=True,
+        ),
+    )
+    rows = 0
+    pending, pending_rows = [], 0
+    with pq.ParquetWriter(sink, schema, compression=compression) as writer:
+        for batch in reader:
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            if pending_rows >= row_group_size:
+                table = pa.Table.from_batches(pending, schema=schema)
+                writer.write_table(table.slice(0, row_group_size), row_group_size=row_group_size)
+                remainder = table.slice(row_group_size)
+                pending, pending_rows = remainder.to_batches(), remainder.num_rows
+                rows += row_group_size
+        if pending_rows:
+            writer.write_table(pa.Table.from_batches(pending, schema=schema), row_group_size=row_group_size)
+            rows += pending_rows
+    return rows
+
+
+def convert_s3_csv_to_parquet(bucket, csv_key: str, column_types: Optional[Dict[str, str]] = None) -> str:
+    """
+    Convertit un CSV du bucket en Parquet stocké à côté de l'original
+
+    Le CSV est lu deux fois en flux (échantillon puis conversion) et le
+    Parquet est envoyé par upload multipart au fil de l'écriture.
+
+    Returns:
+        str: Clé S3 du Parquet
+    """
+    from smart_open import open as s_open
+
+    transport_params = {"client": bucket.s3_client}
+    source_uri = f"s3://{bucket.bucket_name}/{csv_key}"
+    parquet_key = parquet_key_for(csv_key)
+
+    with s_open(source_uri, "rb", transport_params=transport_params) as source:
+        schema = infer_csv_schema(source, column_types=column_types)
+    with s_open(source_uri, "rb", transport_params=transport_params) as source, \
+            s_open(f"s3://{bucket.bucket_name}/{parquet_key}", "wb", transport_params=transport_params) as sink:
+        rows = convert_csv_to_parquet(source, sink, schema)
+    logger.info(f"{source_uri} converti en Parquet ({rows} lignes): {parquet_key}")
+    return parquet_key
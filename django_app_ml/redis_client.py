@@ -0,0 +1,51 @@
+"""
+Clients Redis à pool de connexions borné
+
+Le pool (``redis.BlockingConnectionPool``) plafonne le nombre de connexions
+ouvertes par processus : sous charge, une requête attend qu'une connexion se
+libère au lieu d'en ouvrir une nouvelle. Les connexions inactives sont
+vérifiées par un PING avant réutilisation et les erreurs de connexion
+transitoires sont rejouées avec reconnexion et backoff exponentiel.
+"""
+from typing import Any, Dict, Optional
+
+from .app_settings import app_settings
+
+
+def pool_options() -> Dict[str, Any]:
+    """
+    Options du pool de connexions tirées de ``app_settings``
+    """
+    return {
+        "max_connections": app_settings.redis_max_connections,
+        "timeout": app_settings.redis_pool_timeout,
+        "health_check_interval": app_settings.redis_health_check_interval,
+        "socket_timeout": app_settings.redis_socket_timeout,
+        "socket_connect_timeout": app_settings.redis_socket_timeout,
+        "socket_keepalive": True,
+    }
+
+
+def make_redis_client(url: Optional[str] = None, **connection_kwargs):
+    """
+    Crée un client Redis sur un pool borné, avec health checks et reconnexion
+
+    Args:
+        url: URL Redis ; à défaut ``connection_kwargs`` (host, port, db...) sont utilisés
+        **connection_kwargs: Paramètres de connexion supplémentaires
+    """
+    import redis
+    from redis.backoff import ExponentialBackoff
+    from redis.exceptions import ConnectionError, TimeoutError
+    from redis.retry import Retry
+
+    options = {**connection_kwargs, **pool_options()}
+    if url:
+        pool = redis.BlockingConnectionPool.from_url(url, **options)
+    else:
+        pool = redis.BlockingConnectionPool(**options)
+    return redis.Redis(
+        connection_pool=pool,
+        retry=Retry(ExponentialBackoff(), app_settings.redis_retries),
+        retry_on_error=[ConnectionError, TimeoutError],
+    )
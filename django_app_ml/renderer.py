@@ -1,4 +1,6 @@
-from rest_framework.renderers import BrowsableAPIRenderer, TemplateHTMLRenderer
+import json
+
+from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer, TemplateHTMLRenderer
 
 
 
@@ -13,4 +15,18 @@ class CustomScoringAppTemplateRenderer(BrowsableAPIRenderer):
     def get_context(self, data, accepted_media_type, renderer_context):
         context = super().get_context(data, accepted_media_type, renderer_context)
         context['js_base'] = f"http://localhost:3000/{self.js_base}"
-        return context
\ No newline at end of file
+        return context
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Lets views negotiate ``text/event-stream`` (Server-Sent Events).
+    Streams are returned as StreamingHttpResponse; this renderer only
+    formats plain responses (errors) as a single event.
+    """
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return f"data: {json.dumps(data, default=str)}\n\n".encode(self.charset)
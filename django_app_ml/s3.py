@@ -0,0 +1,732 @@
+"""
+S3 clients and streaming uploads.
+
+Clients are shared process-wide: one client per set of credentials and
+endpoint, created once with a connection pool sized for the concurrent
+transfers. boto3 clients are thread-safe, so the upload thread pools reuse
+them; sessions are not, so they are only used under the registry lock.
+
+Data is cut into fixed-size parts as it arrives and sent through an S3
+multipart upload, a few parts at a time, so memory stays bounded by
+``(max_workers + 1) * part_size`` whatever the size of the source. When a
+worker dies mid-transfer the multipart upload is left open: the next call for
+the same key finds it, keeps the parts already stored and restarts the source
+at the first missing byte. The identity of the source (URL with its length,
+ETag and Last-Modified, or ZIP member with its CRC) is kept in the Django
+cache next to the upload id: an upload is only resumed from the same source,
+otherwise the stale uploads of the key are aborted and it starts over.
+
+Random-access reads (Parquet) go through ``RangedS3File``: the byte ranges a
+reader will need are fetched up front with parallel ranged GETs, adjacent
+ranges being coalesced, so reading costs a few round trips instead of one
+per ``seek``. Whole objects (local cache misses) are downloaded the same way
+by ``download_ranges``.
+"""
+import bisect
+import hashlib
+import io
+import os
+import posixpath
+import threading
+import time
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .app_settings import app_settings
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+# S3 rejects parts smaller than 5 MiB, except the last one
+MIN_PART_SIZE = 5 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_SOURCE_KEY = "app_ml:multipart_source:{}"
+# Incomplete uploads are usually aborted by a bucket lifecycle rule after a few days
+UPLOAD_SOURCE_TIMEOUT = 7 * 24 * 3600
+# Tail fetched when opening a ``RangedS3File``: covers the footer of most Parquet files
+TAIL_FETCH_SIZE = 64 * 1024
+
+ClientKey = Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]
+
+_clients: Dict[ClientKey, object] = {}
+_clients_lock = threading.Lock()
+
+
+def _client_key(access_key=None, secret_key=None, endpoint=None, region=None) -> ClientKey:
+    return (access_key or None, secret_key or None, endpoint or None, region or None)
+
+
+def get_s3_client(access_key=None, secret_key=None, endpoint=None, region=None):
+    """
+    Return the shared S3 client for these credentials, creating it on first use
+
+    Without credentials, the default boto3 credential chain is used.
+    """
+    key = _client_key(access_key, secret_key, endpoint, region)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            import boto3
+            from botocore.config import Config
+
+            session = boto3.session.Session(aws_access_key_id=key[0], aws_secret_access_key=key[1])
+            client = session.client(
+                "s3",
+                endpoint_url=key[2],
+                region_name=key[3],
+                config=Config(
+                    max_pool_connections=app_settings.s3_max_pool_connections,
+                    retries={"max_attempts": app_settings.s3_max_attempts, "mode": "standard"},
+                    tcp_keepalive=True,
+                ),
+            )
+            _clients[key] = client
+            logger.info(f"Created S3 client for endpoint {key[2] or 'default'}")
+    return client
+
+
+def invalidate_s3_client(access_key=None, secret_key=None, endpoint=None, region=None):
+    """
+    Drop the shared client for these credentials (called when a ``Bucket`` changes)
+    """
+    with _clients_lock:
+        _clients.pop(_client_key(access_key, secret_key, endpoint, region), None)
+
+
+def clear_s3_clients():
+    """
+    Drop every shared client
+    """
+    with _clients_lock:
+        _clients.clear()
+
+
+def _is_missing(error) -> bool:
+    code = str((getattr(error, "response", None) or {}).get("Error", {}).get("Code", ""))
+    return code in ("404", "NoSuchKey", "NotFound")
+
+
+def head_object_state(client, bucket_name: str, key: str) -> Optional[dict]:
+    """
+    ETag and size of an object from a HeadObject, or None if it does not exist
+    """
+    try:
+        head = client.head_object(Bucket=bucket_name, Key=key)
+    except Exception as e:
+        if _is_missing(e):
+            return None
+        raise
+    return {"etag": head["ETag"].strip('"'), "size": head["ContentLength"]}
+
+
+def list_object_states(client, bucket_name: str, prefix: str, delimiter: Optional[str] = None) -> Dict[str, dict]:
+    """
+    ETag and size of every object under ``prefix`` (paginated ListObjectsV2)
+
+    With a ``delimiter``, objects in "subdirectories" of the prefix are left out.
+    """
+    params = {"Bucket": bucket_name, "Prefix": prefix}
+    if delimiter:
+        params["Delimiter"] = delimiter
+    listed = {}
+    for page in client.get_paginator("list_objects_v2").paginate(**params):
+        for item in page.get("Contents", []):
+            listed[item["Key"]] = {"etag": item["ETag"].strip('"'), "size": item["Size"]}
+    return listed
+
+
+def object_states(client, bucket_name: str, keys: Iterable[str]) -> Dict[str, Optional[dict]]:
+    """
+    ETag and size of many objects of a bucket (None for missing objects)
+
+    Keys sharing a "directory" are checked with a single paginated
+    ListObjectsV2 on that prefix instead of one HeadObject per key.
+    """
+    groups = defaultdict(list)
+    for key in keys:
+        groups[posixpath.dirname(key)].append(key)
+    states = {}
+    for prefix, group in groups.items():
+        if len(group) == 1:
+            states[group[0]] = head_object_state(client, bucket_name, group[0])
+            continue
+        listed = list_object_states(client, bucket_name, f"{prefix}/" if prefix else "", delimiter="/")
+        for key in group:
+            states[key] = listed.get(key)
+    return states
+
+
+def transfer_config():
+    """
+    boto3 ``TransferConfig`` built from the ``APP_ML_S3_*`` / ``APP_ML_UPLOAD_*`` settings
+    """
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(
+        multipart_threshold=app_settings.s3_multipart_threshold,
+        multipart_chunksize=app_settings.upload_part_size,
+        max_concurrency=app_settings.upload_max_workers,
+        max_bandwidth=app_settings.s3_max_bandwidth,
+        use_threads=True,
+    )
+
+
+def log_throughput(operation: str, uri: str, size: int, elapsed: float):
+    """
+    Log the size, duration and throughput of a transfer
+    """
+    rate = size / elapsed / 1024 ** 2 if elapsed > 0 else float("inf")
+    logger.info(f"{operation} {uri}: {size} bytes in {elapsed:.2f}s ({rate:.1f} MiB/s)")
+
+
+def upload_file(client, file_path: str, bucket_name: str, key: str):
+    """
+    Upload a local file with the configured transfer settings
+    """
+    start = time.monotonic()
+    client.upload_file(file_path, bucket_name, key, Config=transfer_config())
+    log_throughput("Uploaded", f"s3://{bucket_name}/{key}", os.path.getsize(file_path), time.monotonic() - start)
+
+
+def download_file(client, bucket_name: str, key: str, file_path: str):
+    """
+    Download an object to a local file with the configured transfer settings
+    """
+    start = time.monotonic()
+    client.download_file(Bucket=bucket_name, Key=key, Filename=str(file_path), Config=transfer_config())
+    log_throughput("Downloaded", f"s3://{bucket_name}/{key}", os.path.getsize(file_path), time.monotonic() - start)
+
+
+def coalesce_ranges(ranges: Iterable[Tuple[int, int]], gap: int, max_size: int) -> List[Tuple[int, int]]:
+    """
+    Merge ``(start, end)`` byte ranges (end exclusive) separated by at most ``gap`` bytes
+
+    Merged ranges stay under ``max_size`` bytes (unless a single range is
+    larger), so a large read is still split across several parallel requests.
+    """
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start - merged[-1][1] <= gap and max(end, merged[-1][1]) - merged[-1][0] <= max_size:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def get_range(client, bucket_name: str, key: str, start: int, end: int, **params) -> bytes:
+    """
+    Bytes ``[start, end)`` of an S3 object
+    """
+    response = client.get_object(Bucket=bucket_name, Key=key, Range=f"bytes={start}-{end - 1}", **params)
+    return response["Body"].read()
+
+
+def download_ranges(response, client, bucket_name: str, key: str, fileobj, max_workers: Optional[int] = None):
+    """
+    Write a whole S3 object to ``fileobj`` with parallel ranged GETs
+
+    ``response`` is the ``get_object`` response already received: its body
+    provides the first range and is then closed; the other ranges are fetched
+    concurrently with ``If-Match`` on its ETag, so a concurrent overwrite
+    fails instead of mixing two versions. Memory is bounded by
+    ``max_workers * APP_ML_S3_RANGE_MAX_SIZE``.
+
+    Returns:
+        int: Object size
+    """
+    size = response["ContentLength"]
+    range_size = app_settings.s3_range_max_size
+    body = response["Body"]
+    try:
+        first = body.read(min(range_size, size))
+    finally:
+        body.close()
+    fileobj.write(first)
+    fileobj.flush()
+    fd = fileobj.fileno()
+
+    def fetch(start: int) -> int:
+        data = get_range(client, bucket_name, key, start, min(start + range_size, size), IfMatch=response["ETag"])
+        os.pwrite(fd, data, start)
+        return len(data)
+
+    with ThreadPoolExecutor(max_workers=max_workers or app_settings.s3_range_max_workers) as executor:
+        written = len(first) + sum(executor.map(fetch, range(len(first), size, range_size)))
+    if written != size:
+        raise IOError(f"Incomplete download of s3://{bucket_name}/{key}: {written}/{size} bytes")
+    fileobj.seek(size)
+    return size
+
+
+class RangedS3File(io.RawIOBase):
+    """
+    Read-only, seekable file over an S3 object, served from prefetched byte ranges
+
+    Opening it fetches the object tail (size and footer in a single request).
+    ``prefetch`` downloads the ranges a reader will need in parallel; reads
+    outside them fall back to a ranged GET of the missing bytes.
+    """
+
+    def __init__(self, client, bucket_name: str, key: str, tail_size: int = TAIL_FETCH_SIZE):
+        super().__init__()
+        self.client = client
+        self.bucket_name = bucket_name
+        self.key = key
+        self._pos = 0
+        self._starts: List[int] = []
+        self._buffers: List[bytes] = []
+        self.requests = 0
+        self.bytes_fetched = 0
+
+        response = client.get_object(Bucket=bucket_name, Key=key, Range=f"bytes=-{tail_size}")
+        tail = response["Body"].read()
+        self.requests += 1
+        self.bytes_fetched += len(tail)
+        content_range = response.get("ContentRange")
+        self.size = int(content_range.rsplit("/", 1)[1]) if content_range else len(tail)
+        self._tail_start = self.size - len(tail)
+        self._add(self._tail_start, tail)
+
+    def _add(self, start: int, data: bytes):
+        index = bisect.bisect_left(self._starts, start)
+        self._starts.insert(index, start)
+        self._buffers.insert(index, data)
+
+    def _cached(self, pos: int) -> Optional[memoryview]:
+        index = bisect.bisect_right(self._starts, pos) - 1
+        if index >= 0 and pos < self._starts[index] + len(self._buffers[index]):
+            return memoryview(self._buffers[index])[pos - self._starts[index]:]
+        return None
+
+    def _covers(self, start: int, end: int) -> bool:
+        chunk = self._cached(start)
+        return chunk is not None and len(chunk) >= end - start
+
+    def _get(self, start: int, end: int) -> bytes:
+        return get_range(self.client, self.bucket_name, self.key, start, end)
+
+    def prefetch(
+        self,
+        ranges: Iterable[Tuple[int, int]],
+        max_workers: Optional[int] = None,
+        coalesce_gap: Optional[int] = None,
+        max_range_size: Optional[int] = None,
+    ):
+        """
+        Download ``(start, end)`` byte ranges in parallel, coalescing close ones
+
+        Args:
+            ranges: Byte ranges, end exclusive
+            max_workers: Concurrent requests (default ``APP_ML_S3_RANGE_MAX_WORKERS``)
+            coalesce_gap: Largest gap merged into one request (default ``APP_ML_S3_RANGE_COALESCE_GAP``)
+            max_range_size: Largest merged request (default ``APP_ML_S3_RANGE_MAX_SIZE``)
+        """
+        coalesce_gap = app_settings.s3_range_coalesce_gap if coalesce_gap is None else coalesce_gap
+        max_range_size = max_range_size or app_settings.s3_range_max_size
+        pending = [
+            (start, end) for start, end in coalesce_ranges(ranges, coalesce_gap, max_range_size)
+            if not self._covers(start, end)
+        ]
+        if not pending:
+            return
+        start_time = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max_workers or app_settings.s3_range_max_workers) as executor:
+            buffers = list(executor.map(lambda item: self._get(*item), pending))
+        for (start, _), data in zip(pending, buffers):
+            self._add(start, data)
+        size = sum(len(data) for data in buffers)
+        self.requests += len(pending)
+        self.bytes_fetched += size
+        log_throughput(f"Fetched {len(pending)} ranges of", f"s3://{self.bucket_name}/{self.key}",
+                       size, time.monotonic() - start_time)
+
+    def clear(self):
+        """
+        Drop the fetched ranges except the object tail, to bound memory between reads
+        """
+        kept = [(start, data) for start, data in zip(self._starts, self._buffers) if start >= self._tail_start]
+        self._starts = [start for start, _ in kept]
+        self._buffers = [data for _, data in kept]
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self._pos = max(0, offset)
+        return self._pos
+
+    def readinto(self, b) -> int:
+        count = max(0, min(len(b), self.size - self._pos))
+        view = memoryview(b).cast("B")
+        done = 0
+        while done < count:
+            pos = self._pos + done
+            chunk = self._cached(pos)
+            if chunk is None:
+                # Bytes not prefetched: fetch up to the next prefetched range
+                index = bisect.bisect_right(self._starts, pos)
+                end = min(self._pos + count, self._starts[index] if index < len(self._starts) else self.size)
+                data = self._get(pos, end)
+                self.requests += 1
+                self.bytes_fetched += len(data)
+                self._add(pos, data)
+                chunk = memoryview(data)
+            take = min(len(chunk), count - done)
+            view[done:done + take] = chunk[:take]
+            done += take
+        self._pos += count
+        return count
+
+
+def iter_parts(chunks: Iterable[bytes], part_size: int) -> Iterator[bytes]:
+    """
+    Regroup arbitrary chunks into parts of exactly ``part_size`` bytes (the last one may be shorter)
+    """
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= part_size:
+            yield bytes(buffer[:part_size])
+            del buffer[:part_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+def skip_bytes(chunks: Iterable[bytes], count: int) -> Iterator[bytes]:
+    """
+    Drop the first ``count`` bytes of a chunk stream
+    """
+    for chunk in chunks:
+        if count >= len(chunk):
+            count -= len(chunk)
+            continue
+        yield chunk[count:]
+        count = 0
+
+
+def _upload_source_key(bucket_name: str, key: str) -> str:
+    return UPLOAD_SOURCE_KEY.format(hashlib.sha256(f"{bucket_name}/{key}".encode("utf-8")).hexdigest())
+
+
+def remember_upload_source(bucket_name: str, key: str, upload_id: Optional[str], source_id: Optional[str] = None):
+    """
+    Record which source the incomplete upload ``upload_id`` of ``key`` is fed
+    from; ``upload_id=None`` forgets it once the upload is completed
+    """
+    try:
+        from django.core.cache import cache
+
+        if upload_id is None:
+            cache.delete(_upload_source_key(bucket_name, key))
+        else:
+            cache.set(_upload_source_key(bucket_name, key), {"upload_id": upload_id, "source": source_id},
+                      timeout=UPLOAD_SOURCE_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Could not record the upload source of {key}: {e}")
+
+
+def find_multipart_upload(client, bucket_name: str, key: str, source_id: Optional[str]) -> Optional[str]:
+    """
+    Return the id of the incomplete multipart upload of ``key`` fed from
+    ``source_id``, aborting every other incomplete upload of the key
+
+    Without a source identity, or when the recorded one differs (the link
+    changed, the remote file was updated), no upload is resumed: its parts
+    belong to another file.
+    """
+    uploads = []
+    for page in client.get_paginator("list_multipart_uploads").paginate(Bucket=bucket_name, Prefix=key):
+        uploads.extend(upload for upload in page.get("Uploads", []) if upload["Key"] == key)
+    if not uploads:
+        return None
+
+    record = None
+    if source_id is not None:
+        try:
+            from django.core.cache import cache
+
+            record = cache.get(_upload_source_key(bucket_name, key))
+        except Exception as e:
+            logger.warning(f"Could not read the upload source of {key}: {e}")
+    upload_ids = {upload["UploadId"] for upload in uploads}
+    resumable = None
+    if record and record.get("source") == source_id and record.get("upload_id") in upload_ids:
+        resumable = record["upload_id"]
+
+    for upload_id in upload_ids - {resumable}:
+        logger.info(f"Aborting stale upload {upload_id} of {key}")
+        client.abort_multipart_upload(Bucket=bucket_name, Key=key, UploadId=upload_id)
+    return resumable
+
+
+def completed_parts(client, bucket_name: str, key: str, upload_id: str, part_size: int) -> List[dict]:
+    """
+    Parts of an incomplete upload that can be kept: the contiguous run of
+    full-size parts starting at part 1
+    """
+    stored = {}
+    paginator = client.get_paginator("list_parts")
+    for page in paginator.paginate(Bucket=bucket_name, Key=key, UploadId=upload_id):
+        for part in page.get("Parts", []):
+            stored[part["PartNumber"]] = part
+    parts = []
+    while len(parts) + 1 in stored and stored[len(parts) + 1]["Size"] == part_size:
+        part = stored[len(parts) + 1]
+        parts.append({"PartNumber": part["PartNumber"], "ETag": part["ETag"]})
+    return parts
+
+
+def upload_stream(
+    client,
+    open_stream: Callable[[int], Iterable[bytes]],
+    bucket_name: str,
+    key: str,
+    part_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    resume: bool = True,
+    source_id: Optional[str] = None,
+) -> int:
+    """
+    Upload a byte stream to S3 through a multipart upload
+
+    Args:
+        client: boto3 S3 client
+        open_stream: Called with a byte offset, returns the source chunks from that offset
+        bucket_name: Destination bucket
+        key: Destination key
+        part_size: Size of each part (default ``APP_ML_UPLOAD_PART_SIZE``)
+        max_workers: Parts uploaded concurrently (default ``APP_ML_UPLOAD_MAX_WORKERS``)
+        resume: Reuse the parts of an incomplete upload of the same key and source
+        source_id: Identity of the source content; an upload is only resumed
+            when it was started from the same identity
+
+    Returns:
+        int: Number of bytes stored in the object
+    """
+    part_size = part_size or app_settings.upload_part_size
+    max_workers = max_workers or app_settings.upload_max_workers
+    if part_size < MIN_PART_SIZE:
+        raise ValueError(f"Part size must be at least {MIN_PART_SIZE} bytes, got {part_size}")
+
+    upload_id = find_multipart_upload(client, bucket_name, key, source_id) if resume else None
+    parts = []
+    if upload_id is not None:
+        parts = completed_parts(client, bucket_name, key, upload_id, part_size)
+        logger.info(f"Resuming upload of {key} after {len(parts)} stored parts")
+    else:
+        upload_id = client.create_multipart_upload(Bucket=bucket_name, Key=key)["UploadId"]
+        if resume and source_id is not None:
+            remember_upload_source(bucket_name, key, upload_id, source_id)
+    offset = len(parts) * part_size
+    start = time.monotonic()
+
+    def upload_part(part_number, body):
+        response = client.upload_part(
+            Bucket=bucket_name, Key=key, UploadId=upload_id, PartNumber=part_number, Body=body
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    # One part being filled plus at most ``max_workers`` parts in flight
+    in_flight = threading.BoundedSemaphore(max_workers)
+    futures = []
+    size = offset
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for part_number, body in enumerate(iter_parts(open_stream(offset), part_size), start=len(parts) + 1):
+            in_flight.acquire()
+            failed = [future for future in futures if future.done() and future.exception()]
+            if failed:
+                in_flight.release()
+                raise failed[0].exception()
+            future = executor.submit(upload_part, part_number, body)
+            future.add_done_callback(lambda _: in_flight.release())
+            futures.append(future)
+            size += len(body)
+        parts.extend(future.result() for future in futures)
+
+    if not parts:
+        # Empty source: a multipart upload needs at least one part
+        client.abort_multipart_upload(Bucket=bucket_name, Key=key, UploadId=upload_id)
+        client.put_object(Bucket=bucket_name, Key=key, Body=b"")
+        if resume and source_id is not None:
+            remember_upload_source(bucket_name, key, None)
+        return 0
+    client.complete_multipart_upload(
+        Bucket=bucket_name, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+    )
+    if resume and source_id is not None:
+        remember_upload_source(bucket_name, key, None)
+    log_throughput(f"Uploaded {len(parts)} parts to", f"s3://{bucket_name}/{key}", size - offset,
+                   time.monotonic() - start)
+    return size
+
+
+def response_source_id(url: str, response) -> Optional[str]:
+    """
+    Identity of the content served for ``url``: total length, ETag and
+    Last-Modified of the response, or None when the server sends no validator
+    """
+    headers = response.headers
+    length = headers.get("Content-Length")
+    if response.status_code == 206 and "/" in headers.get("Content-Range", ""):
+        length = headers["Content-Range"].rsplit("/", 1)[1]
+    validators = [length, headers.get("ETag"), headers.get("Last-Modified")]
+    if not any(validators):
+        return None
+    return "|".join([url] + [value or "" for value in validators])
+
+
+def url_source_id(url: str, timeout: int = 60) -> Optional[str]:
+    """
+    Identity of the content currently served for ``url`` (``HEAD`` request),
+    or None when it cannot be determined
+    """
+    import requests
+
+    try:
+        response = requests.head(url, allow_redirects=True, timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        logger.warning(f"Could not identify {url}, its upload will not be resumable: {e}")
+        return None
+    return response_source_id(url, response)
+
+
+def open_url_stream(url: str, timeout: int = 60, source_id: Optional[str] = None) -> Callable[[int], Iterator[bytes]]:
+    """
+    Source for ``upload_stream`` reading an HTTP URL with ``requests``
+
+    Resumes with a ``Range`` request; if the server ignores it, the bytes
+    already stored are read and discarded. When ``source_id`` is given, a
+    resumed read fails if the server now serves different content.
+    """
+    import requests
+
+    def open_stream(offset: int) -> Iterator[bytes]:
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        with requests.get(url, stream=True, headers=headers, timeout=timeout) as response:
+            response.raise_for_status()
+            if offset and source_id is not None and response_source_id(url, response) != source_id:
+                raise ValueError(f"{url} changed since the upload started, it will restart from the beginning")
+            chunks = response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+            if offset and response.status_code != 206:
+                logger.warning(f"{url} does not support range requests, skipping {offset} bytes")
+                chunks = skip_bytes(chunks, offset)
+            yield from chunks
+
+    return open_stream
+
+
+def upload_url_to_s3(client, url: str, bucket_name: str, key: str, **options) -> int:
+    """
+    Stream the content of ``url`` to ``s3://bucket_name/key``
+    """
+    source_id = url_source_id(url)
+    return upload_stream(client, open_url_stream(url, source_id=source_id), bucket_name, key,
+                         source_id=source_id, **options)
+
+
+def open_zip_member_stream(archive_path: str, member: str) -> Callable[[int], Iterator[bytes]]:
+    """
+    Source for ``upload_stream`` reading one member of a ZIP archive without extracting it
+
+    Each call opens its own handle on the archive, so members can be read
+    from several threads at once.
+    """
+
+    def open_stream(offset: int) -> Iterator[bytes]:
+        with zipfile.ZipFile(archive_path) as archive, archive.open(member) as source:
+            chunks = iter(lambda: source.read(DOWNLOAD_CHUNK_SIZE), b"")
+            yield from skip_bytes(chunks, offset) if offset else chunks
+
+    return open_stream
+
+
+def upload_zip_members(
+    client,
+    archive_path: str,
+    bucket_name: str,
+    key_for: Callable[[str], str],
+    concurrency: Optional[int] = None,
+    retries: Optional[int] = None,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Upload every file of a ZIP archive to S3, streaming each member from the archive
+
+    Nothing is extracted to disk. ``concurrency`` files are uploaded at once;
+    a failed file is retried up to ``retries`` times, resuming its multipart
+    upload, before being reported as failed.
+
+    Args:
+        client: boto3 S3 client
+        archive_path: Local path of the archive
+        bucket_name: Destination bucket
+        key_for: Member name -> destination key
+        concurrency: Files uploaded concurrently (default ``APP_ML_KAGGLE_UPLOAD_CONCURRENCY``)
+        retries: Extra attempts per file (default ``APP_ML_KAGGLE_UPLOAD_RETRIES``)
+        progress: Called with a progress snapshot after each file
+
+    Returns:
+        dict: Final progress snapshot (files_total, files_done, files_failed,
+        bytes_total, bytes_uploaded, failed)
+    """
+    concurrency = concurrency or app_settings.kaggle_upload_concurrency
+    retries = app_settings.kaggle_upload_retries if retries is None else retries
+    with zipfile.ZipFile(archive_path) as archive:
+        members = [info for info in archive.infolist() if not info.is_dir()]
+    # Parts of a file are sent in parallel only with the workers left over by the file-level concurrency
+    part_workers = max(1, app_settings.upload_max_workers // concurrency)
+
+    state = {
+        "files_total": len(members),
+        "files_done": 0,
+        "files_failed": 0,
+        "bytes_total": sum(info.file_size for info in members),
+        "bytes_uploaded": 0,
+        "failed": [],
+    }
+
+    def upload_member(info):
+        key = key_for(info.filename)
+        for attempt in range(retries + 1):
+            try:
+                return upload_stream(
+                    client, open_zip_member_stream(archive_path, info.filename), bucket_name, key,
+                    max_workers=part_workers, source_id=f"zip:{info.filename}:{info.file_size}:{info.CRC:08x}",
+                )
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                logger.warning(f"Upload of {info.filename} failed (attempt {attempt + 1}/{retries + 1}): {e}")
+                time.sleep(2 ** attempt)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(upload_member, info): info for info in members}
+        # Results are collected by this thread only: no lock needed on ``state``
+        for future in as_completed(futures):
+            info = futures[future]
+            try:
+                state["bytes_uploaded"] += future.result()
+                state["files_done"] += 1
+            except Exception as e:
+                logger.error(f"Error uploading {info.filename} to S3: {e}")
+                state["files_failed"] += 1
+                state["failed"].append({"file": info.filename, "error": str(e)})
+            if progress is not None:
+                progress({**state, "failed": list(state["failed"])})
+    return state
@@ -0,0 +1,246 @@
+"""
+Cache local sur disque des objets S3
+
+Chaque objet est stocké sous ``<répertoire>/<sha256(bucket/clé)>/<etag>.data``.
+À chaque accès, un GET conditionnel (``If-None-Match``) revalide la copie
+locale : S3 répond 304 sans corps si l'objet n'a pas changé, sinon le nouvel
+objet est téléchargé et remplace l'ancien (par requêtes ranged parallèles
+au-delà de ``APP_ML_S3_RANGE_MAX_SIZE``). La taille totale du cache est
+bornée ; les objets les moins récemment utilisés sont supprimés en premier.
+
+Plusieurs processus workers peuvent partager le même répertoire : chaque
+entrée est protégée par un verrou ``fcntl`` pendant sa revalidation et sa
+lecture, et l'éviction ignore les entrées verrouillées.
+"""
+import fcntl
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from .app_settings import app_settings
+from .logging import get_logger
+from .s3 import download_ranges, log_throughput
+
+logger = get_logger(__name__)
+
+STATS_KEYS = {
+    "hits": "app_ml:s3_cache:hits",
+    "misses": "app_ml:s3_cache:misses",
+    "bytes_downloaded": "app_ml:s3_cache:bytes_downloaded",
+    "bytes_served": "app_ml:s3_cache:bytes_served",
+}
+
+DATA_SUFFIX = ".data"
+COPY_BUFFER_SIZE = 8 * 1024 * 1024
+
+
+def _record(name: str, amount: int = 1):
+    """
+    Incrémente un compteur du cache S3 (partagé entre workers via le cache Django)
+    """
+    try:
+        from django.core.cache import cache
+
+        cache.add(STATS_KEYS[name], 0, timeout=None)
+        cache.incr(STATS_KEYS[name], amount)
+    except Exception as e:
+        logger.warning(f"Impossible de mettre à jour les métriques du cache S3: {e}")
+
+
+def s3_cache_stats() -> dict:
+    """
+    Métriques du cache S3 : hits, misses, octets téléchargés et servis, taux de hit
+    """
+    from django.core.cache import cache
+
+    stats = {name: cache.get(key, 0) for name, key in STATS_KEYS.items()}
+    total = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = stats["hits"] / total if total else 0.0
+    return stats
+
+
+def _is_not_modified(error) -> bool:
+    response = getattr(error, "response", None) or {}
+    code = str(response.get("Error", {}).get("Code", ""))
+    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return code in ("304", "NotModified") or status == 304
+
+
+@contextmanager
+def _file_lock(path: str, blocking: bool = True) -> Iterator[bool]:
+    """
+    Verrou exclusif ``fcntl`` sur ``path`` ; produit False si le verrou est
+    déjà tenu et que ``blocking`` est faux
+    """
+    with open(path, "a") as lock_file:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(lock_file, flags)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class S3ObjectCache:
+    """
+    Cache LRU borné en taille des objets S3, indexé par bucket, clé et ETag
+    """
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    def _entry_dir(self, bucket_name: str, key: str) -> str:
+        digest = hashlib.sha256(f"{bucket_name}/{key}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    @staticmethod
+    def _cached_etag(entry_dir: str) -> Optional[str]:
+        for name in os.listdir(entry_dir):
+            if name.endswith(DATA_SUFFIX):
+                return name[:-len(DATA_SUFFIX)]
+        return None
+
+    @contextmanager
+    def _fetch(self, client, bucket_name: str, key: str) -> Iterator[str]:
+        """
+        Revalide ou télécharge l'objet et produit le chemin de sa copie locale,
+        verrouillée tant que le contexte est ouvert
+        """
+        entry_dir = self._entry_dir(bucket_name, key)
+        os.makedirs(entry_dir, exist_ok=True)
+        with _file_lock(os.path.join(entry_dir, ".lock")):
+            etag = self._cached_etag(entry_dir)
+            params = {"Bucket": bucket_name, "Key": key}
+            if etag is not None:
+                params["IfNoneMatch"] = f'"{etag}"'
+            try:
+                response = client.get_object(**params)
+            except Exception as e:
+                if etag is None or not _is_not_modified(e):
+                    raise
+                path = os.path.join(entry_dir, etag + DATA_SUFFIX)
+                # La date de modification sert d'horodatage LRU
+                os.utime(path)
+                _record("hits")
+                _record("bytes_served", os.path.getsize(path))
+                logger.info(f"Objet s3://{bucket_name}/{key} servi depuis le cache local")
+                yield path
+                return
+
+            start = time.monotonic()
+            new_etag = response["ETag"].strip('"')
+            path = os.path.join(entry_dir, new_etag + DATA_SUFFIX)
+            with tempfile.NamedTemporaryFile(dir=entry_dir, suffix=".part", delete=False) as tmp:
+                try:
+                    if response.get("ContentLength", 0) > app_settings.s3_range_max_size:
+                        # Gros objet : le reste est téléchargé par requêtes ranged parallèles
+                        download_ranges(response, client, bucket_name, key, tmp)
+                    else:
+                        shutil.copyfileobj(response["Body"], tmp, COPY_BUFFER_SIZE)
+                except BaseException:
+                    os.unlink(tmp.name)
+                    raise
+            os.replace(tmp.name, path)
+            if etag is not None and etag != new_etag:
+                os.unlink(os.path.join(entry_dir, etag + DATA_SUFFIX))
+            size = os.path.getsize(path)
+            _record("misses")
+            _record("bytes_downloaded", size)
+            _record("bytes_served", size)
+            log_throughput("Downloaded", f"s3://{bucket_name}/{key}", size, time.monotonic() - start)
+            yield path
+
+    def open(self, client, bucket_name: str, key: str):
+        """
+        Ouvre en lecture binaire la copie locale à jour d'un objet S3
+
+        Le descripteur reste valide même si l'entrée est évincée ensuite.
+        """
+        with self._fetch(client, bucket_name, key) as path:
+            f = open(path, "rb")
+        self.evict()
+        return f
+
+    def copy_to(self, client, bucket_name: str, key: str, destination: str):
+        """
+        Copie l'objet S3 vers ``destination`` en passant par le cache
+
+        La destination est une copie indépendante (jamais un lien physique) :
+        la modifier n'altère pas l'entrée du cache, et évincer l'entrée libère
+        bien l'espace disque.
+        """
+        directory = os.path.dirname(os.path.abspath(destination))
+        os.makedirs(directory, exist_ok=True)
+        with self._fetch(client, bucket_name, key) as path:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".app_ml_copy_")
+            os.close(fd)
+            try:
+                shutil.copyfile(path, tmp_path)
+                os.replace(tmp_path, destination)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        self.evict()
+
+    def size(self) -> int:
+        """
+        Taille totale en octets des objets en cache
+        """
+        return sum(os.path.getsize(path) for path, _ in self._entries())
+
+    def _entries(self):
+        for entry in os.scandir(self.directory):
+            if not entry.is_dir():
+                continue
+            for item in os.scandir(entry.path):
+                if item.name.endswith(DATA_SUFFIX):
+                    yield item.path, entry.path
+
+    def evict(self):
+        """
+        Supprime les objets les moins récemment utilisés jusqu'à revenir sous
+        ``max_size`` ; les entrées en cours d'utilisation sont ignorées
+        """
+        with _file_lock(os.path.join(self.directory, ".evict.lock"), blocking=False) as acquired:
+            if not acquired:
+                # Un autre processus est déjà en train d'évincer
+                return
+            entries = []
+            for path, entry_dir in self._entries():
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path, entry_dir))
+            total = sum(size for _, size, _, _ in entries)
+            for _, size, path, entry_dir in sorted(entries):
+                if total <= self.max_size:
+                    break
+                with _file_lock(os.path.join(entry_dir, ".lock"), blocking=False) as unlocked:
+                    if not unlocked:
+                        continue
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+                total -= size
+                logger.info(f"Objet évincé du cache S3 local: {path}")
+
+
+def get_s3_cache() -> Optional[S3ObjectCache]:
+    """
+    Cache S3 configuré par ``app_settings``, ou None s'il est désactivé
+    """
+    if not app_settings.s3_cache_enabled:
+        return None
+    return S3ObjectCache(app_settings.s3_cache_dir, app_settings.s3_cache_max_size)
@@ -11,27 +11,45 @@ class BasicInfo(BaseModel):
 class MissingValues(RootModel[Dict[str, int]]):
     pass
 
+class ConfidenceInterval(BaseModel):
+    lower: float
+    upper: float
+
 class DescriptiveStatsColumn(BaseModel):
     mean: float
     std: float
     min: float
     max: float
     median: float
+    mean_ci: Optional[ConfidenceInterval] = None
+    median_ci: Optional[ConfidenceInterval] = None
 
 class DescriptiveStats(RootModel[Dict[str, DescriptiveStatsColumn]]):
     pass
 
+class CategoricalErrorBound(BaseModel):
+    unique_count_relative_error: float
+    top_values_max_error: int
+
 class CategoricalStatsColumn(BaseModel):
     unique_count: int
     top_values: Dict[str, int]
+    error_bound: Optional[CategoricalErrorBound] = None
 
 class CategoricalStats(RootModel[Dict[str, CategoricalStatsColumn]]):
     pass
 
+class SamplingInfo(BaseModel):
+    method: str
+    sample_size: int
+    population_size: int
+    confidence_level: float
+
 class AuditReport(BaseModel):
     dataset_path: str
     auditor_type: str = Field(default="pandas")
     basic_info: BasicInfo
     missing_values: MissingValues
     descriptive_stats: DescriptiveStats
-    categorical_stats: CategoricalStats 
\ No newline at end of file
+    categorical_stats: CategoricalStats
+    sampling: Optional[SamplingInfo] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 class TaskResult(BaseModel):
     error: bool
@@ -8,4 +8,5 @@ class TaskResult(BaseModel):
     already_exists: Optional[bool] = None
     dataset_id: Optional[int] = None
     dataset_name: Optional[str] = None
-    bucket_name: Optional[str] = None 
\ No newline at end of file
+    bucket_name: Optional[str] = None
+    progress: Optional[Dict[str, Any]] = None
@@ -0,0 +1,40 @@
+"""
+Signal handlers of the ml app.
+"""
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Bucket
+from .s3 import invalidate_s3_client
+
+
+@receiver(pre_save, sender=Bucket)
+def invalidate_changed_bucket_client(sender, instance, **kwargs):
+    """
+    Drop the shared S3 client built from the previous credentials of a bucket
+    """
+    if instance.pk is None:
+        return
+    previous = Bucket.objects.filter(pk=instance.pk).first()
+    if previous is not None and previous.client_credentials != instance.client_credentials:
+        invalidate_s3_client(**previous.client_credentials)
+
+
+@receiver(post_delete, sender=Bucket)
+def invalidate_deleted_bucket_client(sender, instance, **kwargs):
+    """
+    Drop the shared S3 client of a deleted bucket
+    """
+    invalidate_s3_client(**instance.client_credentials)
+
+
+@receiver(setting_changed)
+def reset_changed_result_backend(sender, setting, **kwargs):
+    """
+    Rebuild the shared result backend when its settings change (tests)
+    """
+    if setting == "DRAMATIQ_RESULT_BACKEND" or setting.startswith("APP_ML_REDIS_"):
+        from .task_utils import reset_result_backend
+
+        reset_result_backend()
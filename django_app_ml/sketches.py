@@ -0,0 +1,239 @@
+"""
+Sketches probabilistes fusionnables pour l'audit des grandes colonnes.
+
+- ``HyperLogLog`` estime le nombre de valeurs distinctes avec une mémoire fixe.
+- ``SpaceSaving`` suit les valeurs les plus fréquentes (heavy hitters).
+- ``TDigest`` estime les quantiles (médiane) d'une colonne numérique.
+
+Ces structures se fusionnent entre chunks ou entre workers sans perte
+de garantie d'erreur, et s'exportent en un état JSON (``to_state`` /
+``from_state``) pour être persistées entre deux audits.
+"""
+import base64
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def hash_values(values) -> np.ndarray:
+    """
+    Hash 64 bits stable entre processus (contrairement à ``hash()``)
+    """
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+
+def _leading_zeros(x: np.ndarray) -> np.ndarray:
+    """
+    Nombre de zéros de tête de chaque entier 64 bits (64 pour 0)
+    """
+    n = np.zeros(x.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        mask = (x >> np.uint64(64 - shift)) == 0
+        n += mask * shift
+        x = np.where(mask, x << np.uint64(shift), x)
+    n += (x >> np.uint64(63)) == 0
+    return n
+
+
+class HyperLogLog:
+    """
+    Estimateur de cardinalité HyperLogLog (Flajolet et al., 2007)
+
+    L'erreur relative type est ``1.04 / sqrt(2 ** precision)``.
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError(f"Précision HyperLogLog invalide: {precision}")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def update_hashes(self, hashes: np.ndarray):
+        if len(hashes) == 0:
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        rest = hashes << np.uint64(self.precision)
+        rank = np.minimum(_leading_zeros(rest), 64 - self.precision) + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def update(self, values):
+        self.update_hashes(hash_values(values))
+
+    def merge(self, other: "HyperLogLog"):
+        if other.precision != self.precision:
+            raise ValueError("Impossible de fusionner des HyperLogLog de précisions différentes")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            # Correction petites cardinalités (linear counting)
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "precision": self.precision,
+            "registers": base64.b64encode(self.registers.tobytes()).decode("ascii"),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "HyperLogLog":
+        hll = cls(state["precision"])
+        hll.registers = np.frombuffer(base64.b64decode(state["registers"]), dtype=np.uint8).copy()
+        return hll
+
+
+class SpaceSaving:
+    """
+    Résumé Space-Saving des valeurs les plus fréquentes (Metwally et al., 2005)
+
+    Chaque compteur surestime la fréquence réelle d'au plus ``errors[value]`` ;
+    une valeur absente du résumé apparaît au plus ``floor`` fois. Le résumé
+    de ``capacity`` entrées garantit ``floor <= total / capacity``.
+    """
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self.counts: Dict[Any, int] = {}
+        self.errors: Dict[Any, int] = {}
+        self.floor = 0
+        self.total = 0
+
+    @classmethod
+    def from_counts(cls, counts: pd.Series, capacity: int = 100) -> "SpaceSaving":
+        """
+        Résumé construit à partir de comptages exacts (ex: ``value_counts`` d'un chunk)
+        """
+        summary = cls(capacity)
+        counts = counts.sort_values(ascending=False, kind="stable")
+        kept = counts.iloc[:capacity]
+        summary.counts = {value: int(count) for value, count in kept.items()}
+        summary.errors = {value: 0 for value in summary.counts}
+        summary.floor = int(counts.iloc[capacity]) if len(counts) > capacity else 0
+        summary.total = int(counts.sum())
+        return summary
+
+    def update(self, series: pd.Series):
+        counts = series.value_counts()
+        self.merge(SpaceSaving.from_counts(counts[counts > 0], self.capacity))
+
+    def merge(self, other: "SpaceSaving"):
+        counts = {}
+        errors = {}
+        for value in self.counts.keys() | other.counts.keys():
+            counts[value] = self.counts.get(value, self.floor) + other.counts.get(value, other.floor)
+            errors[value] = self.errors.get(value, self.floor) + other.errors.get(value, other.floor)
+        ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        dropped = ranked[self.capacity:]
+        self.floor = max([self.floor + other.floor] + [count for _, count in dropped[:1]])
+        self.counts = dict(ranked[:self.capacity])
+        self.errors = {value: errors[value] for value in self.counts}
+        self.total += other.total
+
+    def top(self, n: int = 10) -> List[Tuple[Any, int]]:
+        return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:n]
+
+    def max_error(self, n: int = 10) -> int:
+        """
+        Surestimation maximale parmi les ``n`` valeurs les plus fréquentes
+        """
+        return max([self.errors[value] for value, _ in self.top(n)], default=0)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "entries": [[value, count, self.errors[value]] for value, count in self.counts.items()],
+            "floor": self.floor,
+            "total": self.total,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "SpaceSaving":
+        summary = cls(state["capacity"])
+        summary.counts = {value: count for value, count, _ in state["entries"]}
+        summary.errors = {value: error for value, _, error in state["entries"]}
+        summary.floor = state["floor"]
+        summary.total = state["total"]
+        return summary
+
+
+class TDigest:
+    """
+    Sketch de quantiles t-digest (Dunning, 2019), variante « merging »
+
+    Les centroïdes sont regroupés selon la fonction d'échelle k1 : ils sont
+    fins aux extrémités et autour de la médiane l'erreur relative en rang
+    reste de l'ordre de ``pi / compression``. Le nombre de centroïdes est
+    borné par ``compression / 2``.
+    """
+
+    def __init__(self, compression: int = 200):
+        self.compression = compression
+        self.means = np.empty(0, dtype="float64")
+        self.weights = np.empty(0, dtype="float64")
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def _scale(self, q: np.ndarray) -> np.ndarray:
+        return self.compression / (2 * np.pi) * np.arcsin(np.clip(2 * q - 1, -1, 1))
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q_left = (cumulative - weights) / cumulative[-1]
+        clusters = np.floor(self._scale(q_left) - self._scale(np.zeros(1))).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, np.diff(clusters) != 0])
+        merged_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / merged_weights
+        self.weights = merged_weights
+
+    def update(self, values: np.ndarray):
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self._compress(
+            np.concatenate([self.means, values]),
+            np.concatenate([self.weights, np.ones(len(values))]),
+        )
+
+    def merge(self, other: "TDigest"):
+        if len(other.means) == 0:
+            return
+        self._compress(
+            np.concatenate([self.means, other.means]),
+            np.concatenate([self.weights, other.weights]),
+        )
+
+    def quantile(self, q: float) -> float:
+        if len(self.means) == 0:
+            return np.nan
+        midpoints = np.cumsum(self.weights) - self.weights / 2
+        return float(np.interp(q * self.count, midpoints, self.means))
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "compression": self.compression,
+            "means": self.means.tolist(),
+            "weights": self.weights.tolist(),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "TDigest":
+        digest = cls(state["compression"])
+        digest.means = np.asarray(state["means"], dtype="float64")
+        digest.weights = np.asarray(state["weights"], dtype="float64")
+        return digest
@@ -0,0 +1,147 @@
+"""
+Diffusion des changements d'état des tâches Dramatiq via Redis pub/sub
+
+``TaskEventsMiddleware`` publie un événement quand un worker démarre une
+tâche et quand elle se termine (résultat ou erreur) ; ``set_task_progress``
+publie l'avancement des tâches longues. Chaque événement a la forme des
+réponses de ``TaskViewMixin._format_task_response`` (``status``, ``message``,
+``task_id``, ``result``, ``error``).
+
+Le dernier événement de chaque tâche est aussi conservé
+``APP_ML_TASK_EVENTS_TTL`` secondes : un client qui s'abonne après coup reçoit
+immédiatement l'état courant, sans dépendre du moment où il s'est connecté.
+"""
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import dramatiq
+
+from .app_settings import app_settings
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+CHANNEL = "app_ml:task_events:{}"
+LAST_EVENT_KEY = "app_ml:task_events:last:{}"
+TERMINAL_STATUSES = ("completed", "failed")
+
+_redis = None
+_redis_lock = threading.Lock()
+
+
+def get_redis():
+    """
+    Client Redis partagé (pool de connexions borné, utilisable entre threads)
+    """
+    global _redis
+    if _redis is None:
+        with _redis_lock:
+            if _redis is None:
+                from .redis_client import make_redis_client
+
+                _redis = make_redis_client(app_settings.task_events_redis_url)
+    return _redis
+
+
+def publish_task_event(task_id: Optional[str], status: str, message: Optional[str] = None, **fields):
+    """
+    Publie un changement d'état de la tâche et le conserve comme dernier état connu
+
+    Une erreur Redis est journalisée sans interrompre la tâche.
+    """
+    if not task_id:
+        return
+    event = {"status": status, "message": message, "task_id": task_id}
+    event.update({key: value for key, value in fields.items() if value is not None})
+    payload = json.dumps(event, default=str)
+    try:
+        pipe = get_redis().pipeline()
+        pipe.set(LAST_EVENT_KEY.format(task_id), payload, ex=app_settings.task_events_ttl)
+        pipe.publish(CHANNEL.format(task_id), payload)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Impossible de publier l'événement {status} de la tâche {task_id}: {e}")
+
+
+def iter_task_events(
+    task_id: str,
+    initial: Optional[Callable[[], Dict[str, Any]]] = None,
+    timeout: Optional[float] = None,
+    heartbeat: Optional[float] = None,
+) -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    Événements d'une tâche, jusqu'à son état final ou l'expiration de ``timeout``
+
+    Le premier élément est l'état courant : dernier événement conservé, ou à
+    défaut ``initial()`` (état lu en base). ``None`` est produit toutes les
+    ``heartbeat`` secondes sans événement, pour maintenir la connexion.
+
+    Args:
+        task_id: L'ID du message Dramatiq
+        initial: Calcule l'état courant quand aucun événement n'est conservé
+        timeout: Durée maximale d'écoute en secondes (``APP_ML_TASK_EVENTS_TIMEOUT``)
+        heartbeat: Intervalle des battements en secondes (``APP_ML_TASK_EVENTS_HEARTBEAT``)
+    """
+    timeout = timeout or app_settings.task_events_timeout
+    heartbeat = heartbeat or app_settings.task_events_heartbeat
+    client = get_redis()
+    pubsub = client.pubsub(ignore_subscribe_messages=True)
+    # Abonnement avant la lecture du dernier état : aucun événement ne peut être manqué entre les deux
+    pubsub.subscribe(CHANNEL.format(task_id))
+    try:
+        last = client.get(LAST_EVENT_KEY.format(task_id))
+        event = json.loads(last) if last else (initial() if initial else None)
+        if event is not None:
+            yield event
+            if event.get("status") in TERMINAL_STATUSES:
+                return
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            message = pubsub.get_message(timeout=min(heartbeat, remaining))
+            if message is None:
+                yield None
+                continue
+            event = json.loads(message["data"])
+            yield event
+            if event.get("status") in TERMINAL_STATUSES:
+                return
+    finally:
+        pubsub.close()
+
+
+class TaskEventsMiddleware(dramatiq.Middleware):
+    """
+    Publie le démarrage et la fin de chaque tâche
+
+    À déclarer avant ``dramatiq.middleware.Retries`` : le broker exécute les
+    hooks ``after_*`` dans l'ordre inverse de déclaration, ``Retries`` a donc
+    déjà marqué ``message.failed`` quand la fin de la tâche est publiée. Une
+    tâche en échec qui sera retentée est annoncée "pending", une tâche sans
+    nouvel essai "failed".
+    """
+
+    def before_process_message(self, broker, message):
+        publish_task_event(message.message_id, "running", message="Tâche en cours d'exécution")
+
+    def after_process_message(self, broker, message, *, result=None, exception=None):
+        if exception is not None:
+            if message.failed:
+                publish_task_event(message.message_id, "failed", message="Tâche échouée", error=str(exception))
+            else:
+                publish_task_event(message.message_id, "pending", message="Tâche en attente d'un nouvel essai",
+                                   error=str(exception))
+        elif isinstance(result, dict) and result.get("error"):
+            # TaskResult en erreur : la tâche s'est terminée mais a échoué
+            publish_task_event(message.message_id, "failed", message="Tâche terminée avec des erreurs",
+                               error=result.get("message") or "Erreur inconnue", result=result)
+        else:
+            publish_task_event(message.message_id, "completed", message="Tâche terminée avec succès", result=result)
+
+    def after_skip_message(self, broker, message):
+        publish_task_event(message.message_id, "failed", message="Tâche ignorée", error="Tâche ignorée par le worker")
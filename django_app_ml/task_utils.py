@@ -7,10 +7,165 @@ import json
 from typing import Optional, Dict, Any
 from django_dramatiq.models import Task
 import logging
+import threading
+from collections import OrderedDict
 from dramatiq import Message
+from .redis_client import make_redis_client
+from .task_events import publish_task_event
 
 logger = logging.getLogger(__name__)
 
+TASK_PROGRESS_KEY = "app_ml:task_progress:{}"
+TASK_PROGRESS_TIMEOUT = 24 * 3600
+TASK_ROUTE_KEY = "app_ml:task_route:{}"
+TASK_ROUTE_TIMEOUT = 24 * 3600
+TASK_ROUTES_MAX = 10000
+
+_task_routes = OrderedDict()
+_task_routes_lock = threading.Lock()
+
+
+def set_task_progress(message_id: Optional[str], progress: Dict[str, Any]):
+    """
+    Enregistre l'avancement d'une tâche en cours (partagé via le cache Django)
+    et le publie aux abonnés des événements de la tâche
+
+    Args:
+        message_id: L'ID du message Dramatiq (ignoré si None)
+        progress: Instantané de l'avancement
+    """
+    if not message_id:
+        return
+    try:
+        from django.core.cache import cache
+
+        cache.set(TASK_PROGRESS_KEY.format(message_id), progress, timeout=TASK_PROGRESS_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Impossible d'enregistrer l'avancement de la tâche {message_id}: {e}")
+    publish_task_event(message_id, "running", message="Tâche en cours d'exécution", result={"progress": progress})
+
+
+def get_task_progress(message_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Récupère le dernier avancement enregistré d'une tâche, ou None
+    """
+    try:
+        from django.core.cache import cache
+
+        return cache.get(TASK_PROGRESS_KEY.format(message_id))
+    except Exception as e:
+        logger.warning(f"Impossible de lire l'avancement de la tâche {message_id}: {e}")
+        return None
+
+
+def get_tasks_progress(message_ids) -> Dict[str, Dict[str, Any]]:
+    """
+    Récupère en une seule requête au cache l'avancement de plusieurs tâches
+
+    Returns:
+        Dictionnaire message_id -> avancement (les tâches sans avancement sont absentes)
+    """
+    try:
+        from django.core.cache import cache
+
+        keys = {TASK_PROGRESS_KEY.format(message_id): str(message_id) for message_id in message_ids}
+        return {keys[key]: progress for key, progress in cache.get_many(list(keys)).items()}
+    except Exception as e:
+        logger.warning(f"Impossible de lire l'avancement des tâches: {e}")
+        return {}
+
+
+def _cache_task_route(message_id: str, route):
+    with _task_routes_lock:
+        _task_routes[message_id] = route
+        _task_routes.move_to_end(message_id)
+        while len(_task_routes) > TASK_ROUTES_MAX:
+            _task_routes.popitem(last=False)
+
+
+def remember_task_route(message_id: str, queue_name: str, actor_name: str):
+    """
+    Mémorise la file et l'acteur d'une tâche, seuls éléments (avec son ID)
+    nécessaires pour calculer la clé de son résultat
+
+    La route est gardée en mémoire dans le processus et partagée via le cache
+    Django : les autres processus (workers web) n'ont pas à relire la ligne
+    ``Task`` en base pour retrouver un résultat.
+    """
+    message_id = str(message_id)
+    route = (queue_name, actor_name)
+    _cache_task_route(message_id, route)
+    try:
+        from django.core.cache import cache
+
+        cache.set(TASK_ROUTE_KEY.format(message_id), route, timeout=TASK_ROUTE_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Impossible d'enregistrer la route de la tâche {message_id}: {e}")
+
+
+def get_task_route(message_id: str):
+    """
+    Récupère la route (file, acteur) mémorisée d'une tâche, ou None
+    """
+    message_id = str(message_id)
+    with _task_routes_lock:
+        route = _task_routes.get(message_id)
+        if route is not None:
+            _task_routes.move_to_end(message_id)
+    if route is not None:
+        return route
+    try:
+        from django.core.cache import cache
+
+        route = cache.get(TASK_ROUTE_KEY.format(message_id))
+    except Exception as e:
+        logger.warning(f"Impossible de lire la route de la tâche {message_id}: {e}")
+        return None
+    if route is not None:
+        route = tuple(route)
+        _cache_task_route(message_id, route)
+    return route
+
+
+_result_backend = None
+_result_backend_lock = threading.Lock()
+
+
+def _build_result_backend():
+    cfg = settings.DRAMATIQ_RESULT_BACKEND
+    backend_cls = import_string(cfg["BACKEND"])  # ex: RedisBackend
+    options = dict(cfg.get("BACKEND_OPTIONS", {}))
+    if issubclass(backend_cls, RedisBackend) and "client" not in options:
+        # Les paramètres de connexion vont au pool borné, le reste au backend
+        backend_options = {key: options.pop(key) for key in ("namespace", "encoder", "fallback") if key in options}
+        options = {**backend_options, "client": make_redis_client(options.pop("url", None), **options)}
+    return backend_cls(**options)
+
+
+def get_result_backend():
+    """
+    Backend de résultats partagé par tout le processus
+
+    Construit une seule fois depuis ``settings.DRAMATIQ_RESULT_BACKEND`` ; pour
+    un ``RedisBackend``, le client utilise un pool de connexions borné avec
+    health checks et reconnexion (voir ``redis_client``).
+    """
+    global _result_backend
+    if _result_backend is None:
+        with _result_backend_lock:
+            if _result_backend is None:
+                _result_backend = _build_result_backend()
+    return _result_backend
+
+
+def reset_result_backend():
+    """
+    Oublie le backend partagé ; le prochain appel le reconstruit depuis les settings
+    """
+    global _result_backend
+    with _result_backend_lock:
+        _result_backend = None
+
 
 class TaskResultManager:
     """
@@ -18,31 +173,52 @@ class TaskResultManager:
     """
     
     def __init__(self):
-        cfg = settings.DRAMATIQ_RESULT_BACKEND
-        backend_cls = import_string(cfg["BACKEND"])  # ex: RedisBackend
-        self.backend = backend_cls(**cfg["BACKEND_OPTIONS"])
+        self.backend = get_result_backend()
 
     def create_message(self, message_id: str):
         """
         Crée un message Dramatiq avec l'ID donné
-        
+
+        Seuls la file, l'acteur et l'ID entrent dans la clé du résultat : la
+        route mémorisée au lancement (``remember_task_route``) suffit. À défaut,
+        elle est lue une fois en base, sans désérialiser le message stocké.
+
         Args:
             message_id: L'ID du message Dramatiq
-            
+
         Returns:
             Un message Dramatiq
         """
-        task = Task.tasks.get(id=message_id)
+        route = get_task_route(message_id)
+        if route is None:
+            route = Task.tasks.values_list("queue_name", "actor_name").get(id=message_id)
+            remember_task_route(message_id, *route)
+        queue_name, actor_name = route
+        return Message(
+                queue_name=queue_name,
+                actor_name=actor_name,
+                args=(),
+                kwargs={},
+                options={},
+                message_id=str(message_id),
+                message_timestamp=0
+            )
+
+    @staticmethod
+    def message_for_task(task: Task):
+        """
+        Crée le message Dramatiq correspondant à une tâche déjà chargée
+        """
         return Message(
                 queue_name=task.queue_name,
                 actor_name=task.actor_name,
-                args=task.message.args,
-                kwargs=task.message.kwargs,
-                options=task.message.options,
-                message_id=task.id,
+                args=(),
+                kwargs={},
+                options={},
+                message_id=str(task.id),
                 message_timestamp=0
             )
-    
+
     def get_task_result(self, message_id: str, timeout: int = 30) -> Optional[Dict[str, Any]]:
         """
         Récupère le résultat d'une tâche par son message_id
@@ -65,6 +241,46 @@ class TaskResultManager:
             logger.error(f"Erreur lors de la récupération du résultat pour {message_id}: {e}")
             return None
     
+    def get_task_results(self, tasks) -> Dict[str, Any]:
+        """
+        Récupère sans attendre les résultats de plusieurs tâches déjà chargées
+
+        Avec un ``RedisBackend``, toutes les clés sont lues en un seul aller-retour
+        (pipeline) ; les autres backends sont interrogés tâche par tâche.
+
+        Args:
+            tasks: Lignes ``Task`` de django_dramatiq
+
+        Returns:
+            Dictionnaire message_id -> résultat (None si absent ou illisible)
+        """
+        messages = {str(task.id): self.message_for_task(task) for task in tasks}
+        results = dict.fromkeys(messages)
+        if isinstance(self.backend, RedisBackend):
+            try:
+                pipe = self.backend.client.pipeline(transaction=False)
+                for message in messages.values():
+                    pipe.lindex(self.backend.build_message_key(message), 0)
+                raw_results = pipe.execute()
+            except Exception as e:
+                logger.error(f"Erreur lors de la récupération groupée des résultats: {e}")
+                return results
+            for message_id, data in zip(messages, raw_results):
+                if data is None:
+                    continue
+                try:
+                    results[message_id] = self.backend.unwrap_result(self.backend.encoder.decode(data))
+                except Exception as e:
+                    logger.error(f"Erreur lors de la récupération du résultat pour {message_id}: {e}")
+            return results
+
+        for message_id, message in messages.items():
+            try:
+                results[message_id] = self.backend.get_result(message, block=False)
+            except Exception as e:
+                logger.error(f"Erreur lors de la récupération du résultat pour {message_id}: {e}")
+        return results
+
     def wait_for_task_completion(self, message_id: str, timeout: int = 300) -> Optional[Dict[str, Any]]:
         """
         Attend la completion d'une tâche et retourne son résultat
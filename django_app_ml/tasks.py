@@ -1,15 +1,19 @@
 import logging
 import dramatiq
-import pandas as pd
+from dramatiq.middleware import CurrentMessage
 from dramatiq.results import Results
 from dramatiq.results.backends import RedisBackend
 from .logging import get_logger
-from .ml import train, predict
-from .dataset_audit import PandasDatasetAuditor
+from .ml import train, predict, TRAIN_COLUMNS
+from .loaders import DatasetLoader
+from .dataset_audit import get_auditor
+from .audit_cache import dataset_fingerprint, get_cached_report, record_cache_result
+from .app_settings import app_settings
 from .models import Bucket, AuditReport, DataSet, IARecommandation, MLFlowTemplate
 from .exceptions import AuditDatasetException, DatasetNotFoundError, DatasetAccessError, DatasetValidationError
 from .recommandation import get_ai_recommendations
 from .schema.task import TaskResult
+from .task_utils import set_task_progress
 import tempfile
 
 logger = get_logger(__name__)
@@ -21,12 +25,21 @@ logger = get_logger(__name__)
                 time_limit=60000*3,
                 actor_name="ml_app.train_task",
                 store_results=True)
-def train_task(dataset_path: str, checkpoint: str = ""):
+def train_task(dataset_path=None, checkpoint: str = "", dataset_id: int = None):
     """
     Call the model to train ini grpc 
+
+    ``dataset_path`` is a file path or the list of parts of a multi-file
+    dataset; with ``dataset_id``, the location (or parts) of that dataset is used.
     """
+    loader = DatasetLoader()
+    if dataset_id is not None:
+        dataset = DataSet.objects.select_related("bucket").get(id=dataset_id)
+        loader = DatasetLoader(dataset.bucket)
+        dataset_path = dataset.read_parts or dataset.read_location
     logger.info(f"Train dataset: {dataset_path}, save on {checkpoint}")
-    df_train = pd.read_parquet(dataset_path)
+    # Only the feature and target columns are read; the parts of a multi-file dataset are read in parallel
+    df_train = loader.read(dataset_path, columns=TRAIN_COLUMNS)
     result = train(df_train, checkpoint)
     return {
         'status': 'success',
@@ -58,9 +71,17 @@ def predict_task(checkpoint, client):
                 min_backoff=1000, 
                 time_limit=60000*5,
                 store_results=True)
-def audit_dataset_task(dataset_id: int, save_report: bool = True, report_path: str = None):
+def audit_dataset_task(dataset_id: int, save_report: bool = True, report_path: str = None, mode: str = None,
+                       force: bool = False):
     """
-    Effectue un audit complet d'un dataset avec Pandas
+    Effectue un audit complet d'un dataset avec le backend choisi pour le dataset
+
+    ``mode`` vaut "memory", "streaming" (lecture par chunks pour les gros fichiers)
+    "incremental" (reprise de l'état du dernier audit, seules les nouvelles
+    parts Parquet sont lues) ou "quick" (estimation sur un échantillon, suivie
+    si ``APP_ML_AUDIT_QUICK_FOLLOW_UP`` d'un audit complet en arrière-plan).
+    Si le contenu du dataset n'a pas changé depuis le dernier audit, le rapport
+    enregistré est renvoyé sans relancer l'audit, sauf si ``force`` est vrai.
     """
     logger.info(f"Début de l'audit du dataset: {dataset_id}")
     try:
@@ -76,10 +97,40 @@ def audit_dataset_task(dataset_id: int, save_report: bool = True, report_path: s
         else:
             bucket_obj = None
             
-        auditor = PandasDatasetAuditor(bucket_obj)
-        results = auditor.full_audit(dataset.link, save_report=save_report, report_path=report_path)
-        AuditReport.objects.create(dataset=dataset, report=results)
+        fingerprint = dataset_fingerprint(dataset)
+        if not force:
+            cached = get_cached_report(dataset, fingerprint)
+            record_cache_result(hit=cached is not None)
+            if cached is not None:
+                return TaskResult(error=False, results=cached.report, message='Audit servi depuis le cache').dict()
+
+        previous_state = None
+        if mode == "incremental":
+            previous = dataset.reports.exclude(state=None).order_by("-created_at").first()
+            previous_state = previous.state if previous else None
+
+        auditor = get_auditor(dataset.auditor, bucket_obj)
+        if mode and mode not in auditor.supported_modes:
+            logger.warning(f"Mode {mode} non supporté par le backend {dataset.auditor}, audit avec pandas")
+            auditor = get_auditor("pandas", bucket_obj)
+        options = {"previous_state": previous_state}
+        parts = dataset.read_parts
+        if parts:
+            if not auditor.supports_parts:
+                logger.warning(f"Datasets multi-fichiers non supportés par le backend {dataset.auditor}, audit avec pandas")
+                auditor = get_auditor("pandas", bucket_obj)
+            options["parts"] = parts
+        results = auditor.full_audit(dataset.read_location, save_report=save_report, report_path=report_path, mode=mode,
+                                     **options)
+        # Un rapport échantillonné ne doit pas être servi comme résultat d'un audit complet
+        AuditReport.objects.create(dataset=dataset, report=results.model_dump(),
+                                   fingerprint=None if mode == "quick" else fingerprint,
+                                   state=auditor.audit_state)
         logger.info(f"Audit terminé avec succès pour: {dataset.link}")
+        if mode == "quick" and app_settings.audit_quick_follow_up:
+            audit_dataset_task.send(dataset_id=dataset_id, save_report=False)
+            return TaskResult(error=False, results=results,
+                              message='Audit rapide terminé, audit complet lancé en arrière-plan').dict()
         return TaskResult(error=False, results=results, message='Audit terminé avec succès').dict()
         
     except FileNotFoundError as e:
@@ -160,15 +211,29 @@ def analyse_ia_task(dataset_id: int):
         return TaskResult(error=True, message=f"Erreur lors de l'analyse IA du dataset {dataset_id}: {e}").dict()
 
 
+def _convert_dataset_to_parquet(dataset, column_types=None):
+    """
+    Conversion Parquet après l'upload ; un échec n'invalide pas l'upload du CSV
+    """
+    try:
+        dataset.convert_to_parquet(column_types=column_types)
+    except Exception as e:
+        logger.error(f"Erreur lors de la conversion Parquet du dataset {dataset.name}: {e}")
+
+
 @dramatiq.actor(queue_name="upload",
                 max_retries=0,
                 actor_name="ml_app.upload_dataset_task",
                 min_backoff=1000, 
                 time_limit=60000*10,  # 10 minutes timeout
                 store_results=True)
-def upload_dataset_task(dataset_id: int):
+def upload_dataset_task(dataset_id: int, convert_to_parquet: bool = None, column_types: dict = None):
     """
     Upload a dataset to the S3 bucket.
+
+    When ``convert_to_parquet`` (default ``APP_ML_INGEST_CONVERT_CSV_TO_PARQUET``)
+    is true, a CSV dataset is also converted to Parquet next to the original;
+    ``column_types`` overrides the inferred Arrow types.
     """
     logger.info(f"Début de l'upload du dataset: {dataset_id}")
     try:
@@ -179,27 +244,47 @@ def upload_dataset_task(dataset_id: int):
             logger.error(f"Aucun bucket configuré pour le dataset {dataset.name}")
             return TaskResult(error=True, message=f"Aucun bucket configuré pour le dataset {dataset.name}").dict()
         
-        # Vérifier si le dataset est déjà téléchargé
-        if dataset.downloaded:
+        if convert_to_parquet is None:
+            convert_to_parquet = app_settings.ingest_convert_csv_to_parquet
+
+        # Vérifier si le dataset est déjà téléchargé (HEAD en direct, état persisté)
+        if dataset.refresh_s3_state():
             logger.info(f"Dataset {dataset.name} déjà présent dans le bucket S3")
+            if convert_to_parquet and not dataset.parquet_key:
+                _convert_dataset_to_parquet(dataset, column_types)
             return TaskResult(error=False, message=f"Dataset {dataset.name} déjà présent dans le bucket S3", already_exists=True).dict()
         
-        # Effectuer l'upload
+        # Effectuer l'upload, en publiant l'avancement pour le suivi de la tâche
         logger.info(f"Upload du dataset {dataset.name} vers S3...")
-        success = dataset.upload_dataset()
+        message = CurrentMessage.get_current_message()
+        last_progress = {}
+
+        def report_progress(progress):
+            last_progress.update(progress)
+            set_task_progress(message.message_id if message else None, progress)
+
+        success = dataset.upload_dataset(progress=report_progress)
         
         if success:
             logger.info(f"Upload terminé avec succès pour le dataset {dataset.name}")
+            dataset.refresh_s3_state()
+            if convert_to_parquet:
+                _convert_dataset_to_parquet(dataset, column_types)
             return TaskResult(
                 error=False,
                 message=f"Dataset {dataset.name} téléchargé et uploadé avec succès vers S3",
                 dataset_id=dataset_id,
                 dataset_name=dataset.name,
-                bucket_name=dataset.bucket.bucket_name
+                bucket_name=dataset.bucket.bucket_name,
+                progress=last_progress or None
             ).dict()
         else:
             logger.error(f"Échec de l'upload du dataset {dataset.name}")
-            return TaskResult(error=True, message=f"Erreur lors du téléchargement/upload du dataset {dataset.name}").dict()
+            return TaskResult(
+                error=True,
+                message=f"Erreur lors du téléchargement/upload du dataset {dataset.name}",
+                progress=last_progress or None
+            ).dict()
             
     except DataSet.DoesNotExist:
         logger.error(f"Dataset non trouvé avec l'ID: {dataset_id}")
@@ -282,3 +367,42 @@ def generate_mlflow_template_task(recommendation_id: int, model_type: str, datas
     except Exception as e:
         logger.error(f"Erreur lors de la génération du template MLflow : {e}")
         return {"error": str(e)}
+
+
+# Message id of the next scheduled reconciliation: only the latest started chain reschedules itself
+RECONCILE_SCHEDULE_KEY = "app_ml:s3_reconcile:next"
+
+
+@dramatiq.actor(queue_name="upload",
+                max_retries=0,
+                actor_name="ml_app.reconcile_datasets_task",
+                min_backoff=1000,
+                time_limit=60000*10,
+                store_results=True)
+def reconcile_datasets_task(reschedule: bool = False):
+    """
+    Rafraîchit l'état S3 persisté (existence, ETag, taille) de tous les datasets
+
+    Avec ``reschedule``, la tâche se reprogramme toutes les
+    ``APP_ML_S3_RECONCILE_INTERVAL`` secondes (voir la commande
+    ``reconcile_datasets --schedule``). Une chaîne remplacée par une chaîne
+    plus récente s'arrête à sa prochaine exécution.
+    """
+    try:
+        checked = DataSet.reconcile_s3_state()
+        logger.info(f"État S3 rafraîchi pour {checked} datasets")
+        return TaskResult(error=False, message=f"État S3 rafraîchi pour {checked} datasets").dict()
+    except Exception as e:
+        logger.error(f"Erreur lors de la réconciliation des datasets: {e}")
+        return TaskResult(error=True, message=f"Erreur lors de la réconciliation des datasets: {e}").dict()
+    finally:
+        if reschedule and app_settings.s3_reconcile_interval:
+            from django.core.cache import cache
+
+            current = CurrentMessage.get_current_message()
+            owner = cache.get(RECONCILE_SCHEDULE_KEY)
+            if owner is None or current is None or owner == current.message_id:
+                message = reconcile_datasets_task.send_with_options(
+                    kwargs={"reschedule": True}, delay=app_settings.s3_reconcile_interval * 1000
+                )
+                cache.set(RECONCILE_SCHEDULE_KEY, message.message_id, timeout=None)
@@ -0,0 +1,108 @@
+"""
+Tests pour l'empreinte de contenu du cache d'audit
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+from django_app_ml import audit_cache
+from django_app_ml.app_settings import app_settings
+from django_app_ml.audit_cache import dataset_content_fingerprint, dataset_fingerprint
+
+
+class TestDatasetFingerprint(unittest.TestCase):
+    """Tests du calcul d'empreinte des datasets"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "dataset.csv")
+        with open(self.path, "w") as f:
+            f.write("a,b\n1,2\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_local_file_changes_with_content(self):
+        dataset = SimpleNamespace(id=1, read_location=self.path, read_parts=None, bucket=None, manifest=None)
+        with mock.patch.object(audit_cache, "_file_sha256", wraps=audit_cache._file_sha256) as file_sha256:
+            before = dataset_fingerprint(dataset)
+            self.assertEqual(before, dataset_fingerprint(dataset))
+            # Fichier inchangé : le hash mémorisé est réutilisé
+            self.assertEqual(file_sha256.call_count, 1)
+            with open(self.path, "a") as f:
+                f.write("3,4\n")
+            self.assertNotEqual(before, dataset_fingerprint(dataset))
+            self.assertEqual(file_sha256.call_count, 2)
+
+    def test_s3_object_uses_head(self):
+        s3_client = mock.Mock()
+        s3_client.head_object.return_value = {
+            "ETag": '"abc"',
+            "ContentLength": 42,
+            "LastModified": datetime(2025, 1, 1, tzinfo=timezone.utc),
+        }
+        dataset = SimpleNamespace(id=1, read_location="s3://data/train.csv", read_parts=None,
+                                  bucket=SimpleNamespace(s3_client=s3_client), manifest=None)
+        self.assertEqual(dataset_content_fingerprint(dataset), "s3:abc:42:2025-01-01T00:00:00+00:00")
+        s3_client.head_object.assert_called_once_with(Bucket="data", Key="train.csv")
+
+    def test_converted_parquet_is_fingerprinted(self):
+        s3_client = mock.Mock()
+        s3_client.head_object.return_value = {
+            "ETag": '"pq"',
+            "ContentLength": 7,
+            "LastModified": datetime(2025, 1, 1, tzinfo=timezone.utc),
+        }
+        # Lien HTTP d'origine, audit de la copie Parquet convertie à l'ingestion
+        dataset = SimpleNamespace(id=1, link="https://example.com/train.csv", read_location="s3://data/train.parquet",
+                                  read_parts=None, bucket=SimpleNamespace(s3_client=s3_client), manifest=None)
+        self.assertEqual(dataset_content_fingerprint(dataset), "s3:pq:7:2025-01-01T00:00:00+00:00")
+        s3_client.head_object.assert_called_once_with(Bucket="data", Key="train.parquet")
+
+    def test_manifest_parts(self):
+        # Le manifeste enregistré ne change pas : seul l'état actuel des objets compte
+        manifest = [{"key": "ds/a.csv", "etag": "e1", "size": 10, "rows": None},
+                    {"key": "ds/b.csv", "etag": "e2", "size": 20, "rows": None}]
+        bucket = SimpleNamespace(s3_client=mock.Mock(), bucket_name="data")
+        dataset = SimpleNamespace(id=1, read_location="s3://data/ds/",
+                                  read_parts=["s3://data/ds/a.csv", "s3://data/ds/b.csv"],
+                                  bucket=bucket, manifest=manifest, s3_keys=["ds/a.csv", "ds/b.csv"])
+        states = {"ds/a.csv": {"etag": "e1", "size": 10}, "ds/b.csv": {"etag": "e2", "size": 20}}
+        with mock.patch.object(audit_cache, "object_states", return_value=states) as object_states:
+            before = dataset_fingerprint(dataset)
+            self.assertTrue(before.startswith("manifest:"))
+            object_states.assert_called_once_with(bucket.s3_client, "data", ["ds/a.csv", "ds/b.csv"])
+            # Part réécrite sur place
+            states["ds/b.csv"] = {"etag": "e3", "size": 20}
+            self.assertNotEqual(before, dataset_fingerprint(dataset))
+            states["ds/b.csv"] = None
+            self.assertIsNone(dataset_fingerprint(dataset))
+
+    def test_audit_config_changes_fingerprint(self):
+        dataset = SimpleNamespace(id=1, read_location=self.path, read_parts=None, bucket=None, manifest=None,
+                                  auditor="pandas")
+        before = dataset_fingerprint(dataset)
+        with mock.patch.object(type(app_settings), "audit_categorical_mode", new_callable=mock.PropertyMock,
+                               return_value="exact"):
+            exact = dataset_fingerprint(dataset)
+        self.assertNotEqual(before, exact)
+        with mock.patch.object(type(app_settings), "audit_hll_precision", new_callable=mock.PropertyMock,
+                               return_value=12):
+            self.assertNotEqual(before, dataset_fingerprint(dataset))
+        dataset.auditor = "arrow"
+        self.assertNotEqual(before, dataset_fingerprint(dataset))
+        dataset.auditor = "pandas"
+        self.assertEqual(before, dataset_fingerprint(dataset))
+
+    def test_unknown_source_is_not_cached(self):
+        dataset = SimpleNamespace(id=1, read_location="https://example.com/train.csv", read_parts=None,
+                                  bucket=None, manifest=None)
+        self.assertIsNone(dataset_fingerprint(dataset))
+
+
+if __name__ == "__main__":
+    unittest.main()
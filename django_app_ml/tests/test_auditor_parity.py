@@ -0,0 +1,101 @@
+"""
+Tests de parité entre les backends d'audit pandas et Arrow
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from django_app_ml.app_settings import app_settings
+from django_app_ml.arrow_audit import ArrowDatasetAuditor
+from django_app_ml.dataset_audit import PandasDatasetAuditor, get_auditor
+from django_app_ml.tests.test_dataset_audit import make_dataframe
+
+
+class TestAuditorParity(unittest.TestCase):
+    """Les deux backends doivent produire le même AuditReport"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.df = make_dataframe()
+        self.df["label"] = pd.Categorical(self.df["category"])
+        self.df["flag"] = self.df["amount"] > 100
+        self.df["name"] = [f"user-{i % 37}" for i in range(len(self.df))]
+        self.df["day"] = "2024-01-01"
+        self.df["empty"] = np.nan
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, extension, df=None):
+        df = self.df if df is None else df
+        path = os.path.join(self.tmp_dir.name, f"dataset.{extension}")
+        if extension == "csv":
+            df.to_csv(path, index=False)
+        else:
+            df.to_parquet(path, row_group_size=1000)
+        return path
+
+    def assert_parity(self, path):
+        expected = PandasDatasetAuditor(bucket=None).full_audit(path, save_report=False, mode="memory")
+        actual = ArrowDatasetAuditor(bucket=None).full_audit(path, save_report=False, mode="memory")
+
+        self.assertEqual(actual.auditor_type, "arrow")
+        # memory_usage mesure la représentation propre à chaque backend
+        expected_info = expected.basic_info.model_dump(exclude={"memory_usage"})
+        self.assertEqual(expected_info, actual.basic_info.model_dump(exclude={"memory_usage"}))
+        self.assertEqual(expected.missing_values.root, actual.missing_values.root)
+        self.assertEqual(expected.categorical_stats.model_dump(), actual.categorical_stats.model_dump())
+        self.assertEqual(set(expected.descriptive_stats.root), set(actual.descriptive_stats.root))
+        for col, stats in expected.descriptive_stats.root.items():
+            for field in ["mean", "std", "min", "max", "median"]:
+                np.testing.assert_allclose(
+                    getattr(actual.descriptive_stats.root[col], field), getattr(stats, field), rtol=1e-12,
+                    err_msg=f"{col}.{field}",
+                )
+
+    def test_csv(self):
+        self.assert_parity(self.write("csv"))
+
+    def test_parquet(self):
+        self.assert_parity(self.write("parquet"))
+
+    def test_nullable_integers(self):
+        df = pd.DataFrame({
+            "nullable": pd.array([1, None, 3, 4] * 50, dtype="Int64"),
+            "single": [np.nan] * 199 + [2.0],
+        })
+        self.assert_parity(self.write("parquet", df))
+
+    def test_approximate_categorical_stats(self):
+        path = self.write("parquet")
+        with mock.patch.object(type(app_settings), "audit_categorical_mode", new_callable=mock.PropertyMock,
+                               return_value="approximate"):
+            self.assert_parity(path)
+            report = ArrowDatasetAuditor(bucket=None).full_audit(path, save_report=False, mode="memory")
+        # "label" est lue comme colonne dictionnaire Arrow
+        self.assertIsNotNone(report.categorical_stats.root["label"].error_bound)
+
+    def test_unsupported_mode(self):
+        with self.assertRaises(ValueError):
+            ArrowDatasetAuditor(bucket=None).full_audit(self.write("csv"), save_report=False, mode="streaming")
+
+
+class TestAuditorRegistry(unittest.TestCase):
+    """Tests de la sélection du backend d'audit"""
+
+    def test_known_backends(self):
+        self.assertIsInstance(get_auditor("pandas", None), PandasDatasetAuditor)
+        self.assertIsInstance(get_auditor("arrow", None), ArrowDatasetAuditor)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_auditor("spark", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,335 @@
+"""
+Tests pour l'audit de dataset (modes mémoire et streaming)
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from django_app_ml.dataset_audit import PandasDatasetAuditor
+from django_app_ml.audit_accumulators import AuditAccumulator, merge_dtypes
+
+
+def make_dataframe(rows=5000, seed=42):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "amount": rng.normal(100, 15, rows),
+        "count": rng.integers(0, 50, rows),
+        "ratio": np.where(rng.random(rows) < 0.2, np.nan, rng.random(rows)),
+        "category": rng.choice(["A", "B", "C", None], rows),
+    })
+    # Les valeurs manquantes n'apparaissent que dans les derniers chunks
+    df.loc[rows - 100:, "count"] = np.nan
+    return df
+
+
+class TestStreamingAudit(unittest.TestCase):
+    """Tests de l'audit en streaming"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.df = make_dataframe()
+        self.auditor = PandasDatasetAuditor(bucket=None)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, extension):
+        path = os.path.join(self.tmp_dir.name, f"dataset.{extension}")
+        if extension == "csv":
+            self.df.to_csv(path, index=False)
+        else:
+            self.df.to_parquet(path, row_group_size=1200)
+        return path
+
+    def assert_reports_match(self, memory, streaming):
+        self.assertEqual(memory.basic_info.row_count, streaming.basic_info.row_count)
+        self.assertEqual(memory.basic_info.column_names, streaming.basic_info.column_names)
+        self.assertEqual(memory.basic_info.column_types, streaming.basic_info.column_types)
+        self.assertEqual(memory.missing_values.root, streaming.missing_values.root)
+        self.assertEqual(memory.categorical_stats.model_dump(), streaming.categorical_stats.model_dump())
+        self.assertEqual(set(memory.descriptive_stats.root), set(streaming.descriptive_stats.root))
+        for col, expected in memory.descriptive_stats.root.items():
+            actual = streaming.descriptive_stats.root[col]
+            self.assertAlmostEqual(expected.mean, actual.mean, places=6)
+            self.assertAlmostEqual(expected.std, actual.std, places=6)
+            self.assertEqual(expected.min, actual.min)
+            self.assertEqual(expected.max, actual.max)
+            self.assertAlmostEqual(expected.median, actual.median, delta=0.05 * abs(expected.std))
+
+    def test_streaming_csv_matches_memory(self):
+        path = self.write("csv")
+        memory = self.auditor.full_audit(path, save_report=False, mode="memory")
+        streaming = self.auditor.streaming_audit(path, chunk_size=700)
+        self.assert_reports_match(memory, streaming)
+
+    def test_streaming_parquet_matches_memory(self):
+        path = self.write("parquet")
+        memory = self.auditor.full_audit(path, save_report=False, mode="memory")
+        streaming = self.auditor.full_audit(path, save_report=False, mode="streaming")
+        self.assert_reports_match(memory, streaming)
+
+    def test_report_schema_is_identical(self):
+        path = self.write("csv")
+        memory = self.auditor.full_audit(path, save_report=False, mode="memory")
+        streaming = self.auditor.full_audit(path, save_report=False, mode="streaming")
+        self.assertEqual(memory.model_dump().keys(), streaming.model_dump().keys())
+
+    def test_invalid_mode(self):
+        path = self.write("csv")
+        with self.assertRaises(ValueError):
+            self.auditor.full_audit(path, save_report=False, mode="unknown")
+
+    def test_chunks_are_bounded(self):
+        path = self.write("parquet")
+        sizes = [len(chunk) for chunk in self.auditor.iter_dataset_chunks(path, chunk_size=500)]
+        self.assertEqual(sum(sizes), len(self.df))
+        self.assertLessEqual(max(sizes), 500)
+
+
+class TestDescriptiveStats(unittest.TestCase):
+    """Tests des statistiques descriptives vectorisées"""
+
+    def test_matches_describe(self):
+        df = make_dataframe()
+        df["empty"] = np.nan
+        df["nullable"] = pd.array([1, None] * (len(df) // 2), dtype="Int64")
+        stats = PandasDatasetAuditor(bucket=None).get_descriptive_stats(df)
+
+        for col in ["amount", "count", "ratio", "nullable", "empty"]:
+            expected = df[col].describe()
+            actual = stats.root[col]
+            for field, key in [("mean", "mean"), ("std", "std"), ("min", "min"), ("max", "max"), ("median", "50%")]:
+                np.testing.assert_allclose(getattr(actual, field), float(expected[key]), rtol=1e-9)
+
+    def test_no_numeric_column(self):
+        df = pd.DataFrame({"category": ["a", "b"]})
+        self.assertEqual(PandasDatasetAuditor(bucket=None).get_descriptive_stats(df).root, {})
+
+
+class TestParquetFooterAudit(unittest.TestCase):
+    """Tests du chemin rapide basé sur le footer Parquet"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.df = make_dataframe()
+        self.df["flag"] = self.df["amount"] > 100
+        self.path = os.path.join(self.tmp_dir.name, "dataset.parquet")
+        self.auditor = PandasDatasetAuditor(bucket=None)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def assert_footer_matches_full_read(self):
+        import pyarrow.parquet as pq
+
+        expected = pd.read_parquet(self.path)
+        parquet_file = pq.ParquetFile(self.path)
+        basic_info, _, _ = self.auditor.get_parquet_footer_info(parquet_file)
+        report = self.auditor.parquet_audit(self.path)
+
+        self.assertEqual(basic_info.row_count, len(expected))
+        self.assertEqual(basic_info.column_names, list(expected.columns))
+        self.assertEqual(basic_info.column_types, expected.dtypes.astype(str).to_dict())
+        self.assertEqual(report.missing_values.root, expected.isnull().sum().to_dict())
+        self.assertEqual(
+            report.descriptive_stats.model_dump(),
+            self.auditor.get_descriptive_stats(expected).model_dump(),
+        )
+
+    def test_footer_statistics(self):
+        self.df.to_parquet(self.path, row_group_size=1000)
+        self.assert_footer_matches_full_read()
+
+    def test_without_statistics_falls_back_to_scan(self):
+        self.df.to_parquet(self.path, row_group_size=1000, write_statistics=False)
+        self.assert_footer_matches_full_read()
+
+    def test_missing_values_without_reading_data(self):
+        import pyarrow.parquet as pq
+
+        self.df.to_parquet(self.path, row_group_size=1000)
+        _, missing, without_stats = self.auditor.get_parquet_footer_info(pq.ParquetFile(self.path))
+        self.assertEqual(without_stats, [])
+        self.assertEqual(missing["count"], 100)
+
+
+class TestParallelAudit(unittest.TestCase):
+    """Tests de l'audit réparti sur un pool de processus"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.df = make_dataframe()
+        self.df["label"] = pd.Categorical(self.df["category"])
+        self.auditor = PandasDatasetAuditor(bucket=None)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def assert_same_report(self, path):
+        sequential = self.auditor.full_audit(path, save_report=False, mode="memory", workers=1)
+        parallel = self.auditor.full_audit(path, save_report=False, mode="memory", workers=2)
+        self.assertEqual(sequential.model_dump(), parallel.model_dump())
+
+    def test_csv_matches_sequential(self):
+        path = os.path.join(self.tmp_dir.name, "dataset.csv")
+        self.df.to_csv(path, index=False)
+        self.assert_same_report(path)
+
+    def test_parquet_matches_sequential(self):
+        path = os.path.join(self.tmp_dir.name, "dataset.parquet")
+        self.df.to_parquet(path, row_group_size=1000, write_statistics=False)
+        self.assert_same_report(path)
+
+    def test_mixed_object_column_falls_back(self):
+        df = pd.DataFrame({"mixed": [1, "a", 2.5, None], "value": [1.0, 2.0, 3.0, 4.0]})
+        self.assertIsNone(self.auditor.parallel_audit(df, "dataset.csv", workers=2))
+
+
+class TestIncrementalAudit(unittest.TestCase):
+    """Tests de l'audit incrémental des datasets Parquet partitionnés"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.df = make_dataframe(rows=6000)
+        self.auditor = PandasDatasetAuditor(bucket=None)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_part(self, index):
+        part = self.df.iloc[index * 2000:(index + 1) * 2000]
+        part.to_parquet(os.path.join(self.tmp_dir.name, f"part-{index}.parquet"), row_group_size=500)
+
+    def audit(self, previous_state=None):
+        report, state = self.auditor.incremental_audit(self.tmp_dir.name, previous_state)
+        # L'état doit survivre à un aller-retour dans un JSONField
+        return report, json.loads(json.dumps(state))
+
+    def test_delta_merged_into_previous_state(self):
+        self.write_part(0)
+        self.write_part(1)
+        _, state = self.audit()
+        self.write_part(2)
+
+        manifest = self.auditor.parquet_manifest(self.auditor.list_parquet_parts(self.tmp_dir.name))
+        new_part = os.path.join(self.tmp_dir.name, "part-2.parquet")
+        self.assertEqual(self.auditor.manifest_delta(state["manifest"], manifest), {new_part: [0, 1, 2, 3]})
+
+        incremental, _ = self.audit(state)
+        full, _ = self.audit()
+        self.assertEqual(incremental.basic_info.row_count, 6000)
+        self.assertEqual(incremental.missing_values.root, full.missing_values.root)
+        self.assertEqual(incremental.categorical_stats.model_dump(), full.categorical_stats.model_dump())
+        for col, stats in full.descriptive_stats.root.items():
+            self.assertAlmostEqual(stats.mean, incremental.descriptive_stats.root[col].mean, places=9)
+            self.assertAlmostEqual(stats.std, incremental.descriptive_stats.root[col].std, places=9)
+
+    def test_rewritten_part_triggers_full_audit(self):
+        self.write_part(0)
+        _, state = self.audit()
+        self.df.iloc[:1000].to_parquet(os.path.join(self.tmp_dir.name, "part-0.parquet"))
+        report, _ = self.audit(state)
+        self.assertEqual(report.basic_info.row_count, 1000)
+
+    def test_manifest_delta(self):
+        previous = [{"path": "a", "row_groups": [[10, 100]]}]
+        current = [{"path": "a", "row_groups": [[10, 100], [5, 50]]}, {"path": "b", "row_groups": [[3, 30]]}]
+        self.assertEqual(PandasDatasetAuditor.manifest_delta(previous, current), {"a": [1], "b": [0]})
+        self.assertIsNone(PandasDatasetAuditor.manifest_delta(previous, current[1:]))
+
+
+class TestQuickAudit(unittest.TestCase):
+    """Tests de l'audit rapide par échantillonnage"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.df = make_dataframe(rows=20000)
+        self.auditor = PandasDatasetAuditor(bucket=None)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, extension):
+        path = os.path.join(self.tmp_dir.name, f"dataset.{extension}")
+        if extension == "csv":
+            self.df.to_csv(path, index=False)
+        else:
+            self.df.to_parquet(path, row_group_size=1000)
+        return path
+
+    def assert_estimates_cover_truth(self, path):
+        report = self.auditor.quick_audit(path, sample_size=3000, seed=0)
+        self.assertEqual(report.sampling.sample_size, 3000)
+        self.assertEqual(report.sampling.population_size, len(self.df))
+        self.assertEqual(report.basic_info.row_count, len(self.df))
+        for col in ["amount", "ratio"]:
+            stats = report.descriptive_stats.root[col]
+            self.assertLessEqual(stats.mean_ci.lower, self.df[col].mean())
+            self.assertGreaterEqual(stats.mean_ci.upper, self.df[col].mean())
+            self.assertLessEqual(stats.median_ci.lower, self.df[col].median())
+            self.assertGreaterEqual(stats.median_ci.upper, self.df[col].median())
+        expected_missing = self.df["ratio"].isnull().sum()
+        self.assertAlmostEqual(report.missing_values.root["ratio"], expected_missing, delta=0.15 * expected_missing)
+        return report
+
+    def test_csv_reservoir_sample(self):
+        report = self.assert_estimates_cover_truth(self.write("csv"))
+        self.assertEqual(report.sampling.method, "reservoir")
+
+    def test_parquet_row_group_sample(self):
+        report = self.assert_estimates_cover_truth(self.write("parquet"))
+        self.assertEqual(report.sampling.method, "row_groups")
+        # Les valeurs manquantes viennent du footer : elles sont exactes
+        self.assertEqual(report.missing_values.root["count"], 100)
+
+    def test_small_dataset_is_read_entirely(self):
+        self.df = self.df.iloc[:500]
+        report = self.auditor.quick_audit(self.write("csv"), sample_size=3000)
+        self.assertEqual(report.sampling.method, "full")
+        stats = report.descriptive_stats.root["amount"]
+        self.assertAlmostEqual(stats.mean_ci.lower, stats.mean)
+        self.assertAlmostEqual(stats.mean_ci.upper, stats.mean)
+
+
+class TestAuditAccumulator(unittest.TestCase):
+    """Tests des accumulateurs fusionnables"""
+
+    def test_merge_equals_single_pass(self):
+        df = make_dataframe(rows=3000)
+        single = AuditAccumulator()
+        single.update(df)
+
+        left, right = AuditAccumulator(), AuditAccumulator()
+        left.update(df.iloc[:1000])
+        right.update(df.iloc[1000:])
+        left.merge(right)
+
+        expected = single.to_report("dataset.csv")
+        merged = left.to_report("dataset.csv")
+        self.assertEqual(expected.basic_info.row_count, merged.basic_info.row_count)
+        self.assertEqual(expected.missing_values.root, merged.missing_values.root)
+        self.assertEqual(expected.categorical_stats.model_dump(), merged.categorical_stats.model_dump())
+        for col, stats in expected.descriptive_stats.root.items():
+            self.assertAlmostEqual(stats.mean, merged.descriptive_stats.root[col].mean, places=9)
+            self.assertAlmostEqual(stats.std, merged.descriptive_stats.root[col].std, places=9)
+
+    def test_state_round_trip(self):
+        df = make_dataframe(rows=2000)
+        accumulator = AuditAccumulator(categorical_mode="approximate")
+        accumulator.update(df)
+        restored = AuditAccumulator.from_state(json.loads(json.dumps(accumulator.to_state())))
+        self.assertEqual(accumulator.to_report("dataset.csv").model_dump(), restored.to_report("dataset.csv").model_dump())
+
+    def test_merge_dtypes(self):
+        self.assertEqual(merge_dtypes(None, "int64"), "int64")
+        self.assertEqual(merge_dtypes("int64", "float64"), "float64")
+        self.assertEqual(merge_dtypes("int64", "object"), "object")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Tests du téléchargement d'un dataset en ZIP construit à la volée
+"""
+
+import io
+import os
+import zipfile
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from django_app_ml.models import DataSet
+
+
+class TestDatasetZipDownload(TestCase):
+    """Tests de ``DatasetDownloadView`` sans bucket (archive ZIP en streaming)"""
+
+    def setUp(self):
+        self.dataset = DataSet.objects.create(
+            name="train", s3_key="train.csv", description="", link="https://example.com/train.csv"
+        )
+        self.content = os.urandom(300000) + b"a,b\n1,2\n" * 50000
+        self.upstream = mock.Mock()
+        self.upstream.iter_content.side_effect = lambda chunk_size: (
+            self.content[i:i + 65536] for i in range(0, len(self.content), 65536)
+        )
+        patcher = mock.patch("django_app_ml.views.requests.get", return_value=self.upstream)
+        self.requests_get = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_streamed_archive(self):
+        url = reverse("django_app_ml:dataset-download", kwargs={"dataset_id": self.dataset.id})
+        response = APIClient().get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Accept-Ranges"], "none")
+        self.assertEqual(response["Content-Type"], "application/zip")
+        self.assertIn(f'filename="train_v{self.dataset.version}.zip"', response["Content-Disposition"])
+        self.assertFalse(response.has_header("Content-Length"))
+
+        body = b"".join(response.streaming_content)
+        self.upstream.close.assert_called_once()
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(archive.namelist(), ["train.zip"])
+            self.assertEqual(archive.read("train.zip"), self.content)
+        self.requests_get.assert_called_once_with("https://example.com/train.csv", stream=True)
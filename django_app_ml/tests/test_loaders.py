@@ -0,0 +1,219 @@
+"""
+Tests du chargement de datasets avec projection de colonnes et filtres
+"""
+
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from django_app_ml.dataset_audit import PandasDatasetAuditor
+from django_app_ml.loaders import DatasetLoader, filter_mask, row_group_may_match, validate_filters
+from django_app_ml.s3 import coalesce_ranges
+
+
+def make_dataframe(rows=4000):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "amount": np.where(rng.random(rows) < 0.1, np.nan, rng.normal(100, 15, rows)),
+        "category": rng.choice(["A", "B", "C"], rows),
+        "unused": rng.random(rows),
+    })
+
+
+class TestDatasetLoader(unittest.TestCase):
+    """Tests de ``DatasetLoader``"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.df = make_dataframe()
+        self.parquet_path = os.path.join(self.tmp_dir.name, "data.parquet")
+        self.csv_path = os.path.join(self.tmp_dir.name, "data.csv")
+        # Lignes triées par id : chaque row group couvre une plage disjointe
+        self.df.to_parquet(self.parquet_path, index=False, row_group_size=500)
+        self.df.to_csv(self.csv_path, index=False)
+        self.loader = DatasetLoader()
+        self.filters = [("id", ">=", 3000), ("category", "in", ["A", "B"]), ("amount", ">", 90)]
+        self.expected = self.df[filter_mask(self.df, validate_filters(self.filters))][["id", "amount"]]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_column_projection(self):
+        for path in (self.parquet_path, self.csv_path):
+            df = self.loader.read(path, columns=["amount", "id"])
+            self.assertEqual(list(df.columns), ["amount", "id"])
+            self.assertEqual(len(df), len(self.df))
+
+    def test_filters_match_between_formats(self):
+        for path in (self.parquet_path, self.csv_path):
+            df = self.loader.read(path, columns=["id", "amount"], filters=self.filters)
+            self.assertEqual(list(df.columns), ["id", "amount"])
+            np.testing.assert_array_equal(df["id"].to_numpy(), self.expected["id"].to_numpy())
+
+    def test_missing_values_excluded_by_filters(self):
+        df = self.loader.read(self.csv_path, filters=[("amount", "!=", 0)])
+        self.assertEqual(len(df), self.df["amount"].notna().sum())
+
+    def test_iter_chunks_prunes_row_groups(self):
+        metadata = pq.ParquetFile(self.parquet_path).metadata
+        column_indices = {metadata.schema.column(i).path: i for i in range(metadata.num_columns)}
+        kept = [
+            rg for rg in range(metadata.num_row_groups)
+            if row_group_may_match(metadata.row_group(rg), column_indices, validate_filters(self.filters))
+        ]
+        self.assertEqual(kept, [6, 7])
+
+        chunks = list(self.loader.iter_chunks(
+            self.parquet_path, chunk_size=300, columns=["id", "amount"], filters=self.filters
+        ))
+        df = pd.concat(chunks, ignore_index=True)
+        np.testing.assert_array_equal(df["id"].to_numpy(), self.expected["id"].to_numpy())
+
+    def test_invalid_filter(self):
+        with self.assertRaises(ValueError):
+            self.loader.read(self.csv_path, filters=[("id", "~", 1)])
+
+    def test_audit_on_subset(self):
+        auditor = PandasDatasetAuditor(bucket=None)
+        for mode in ("memory", "streaming"):
+            report = auditor.full_audit(
+                self.parquet_path, save_report=False, mode=mode,
+                columns=["id", "amount"], filters=self.filters,
+            )
+            self.assertEqual(report.basic_info.column_names, ["id", "amount"])
+            self.assertEqual(report.basic_info.row_count, len(self.expected))
+
+
+    def test_multi_part_dataset(self):
+        # Parts de formats mélangés, lues en parallèle comme une seule table
+        parts = []
+        for index, start in enumerate(range(0, len(self.df), 1000)):
+            part = self.df.iloc[start:start + 1000]
+            if index % 2:
+                path = os.path.join(self.tmp_dir.name, f"part-{index}.csv")
+                part.to_csv(path, index=False)
+            else:
+                path = os.path.join(self.tmp_dir.name, f"part-{index}.parquet")
+                part.to_parquet(path, index=False)
+            parts.append(path)
+
+        df = self.loader.read(parts, columns=["id", "amount"], filters=self.filters)
+        pd.testing.assert_frame_equal(df, self.expected.reset_index(drop=True))
+        chunks = list(self.loader.iter_chunks(parts, chunk_size=300, columns=["id", "amount"], filters=self.filters))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), len(self.expected))
+        self.assertEqual(self.loader.count_rows(parts[0]), 1000)
+        self.assertIsNone(self.loader.count_rows(parts[1]))
+
+        report = PandasDatasetAuditor(bucket=None).full_audit(
+            self.tmp_dir.name, save_report=False, mode="memory", parts=parts
+        )
+        self.assertEqual(report.basic_info.row_count, len(self.df))
+
+
+class FakeRangeClient:
+    """Client S3 minimal servant des GET ranged sur un contenu en mémoire"""
+
+    def __init__(self, data):
+        self.data = data
+        self.ranges = []
+
+    def get_object(self, Bucket, Key, Range):
+        spec = Range[len("bytes="):]
+        if spec.startswith("-"):
+            start, end = max(0, len(self.data) - int(spec[1:])), len(self.data)
+        else:
+            first, last = spec.split("-")
+            start, end = int(first), int(last) + 1
+        self.ranges.append((start, end))
+        return {
+            "Body": SimpleNamespace(read=lambda: self.data[start:end]),
+            "ContentRange": f"bytes {start}-{end - 1}/{len(self.data)}",
+        }
+
+
+class TestRangedParquetRead(unittest.TestCase):
+    """Tests de la lecture d'un Parquet S3 par requêtes ranged parallèles"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.df = make_dataframe(20000)
+        self.path = os.path.join(self.tmp_dir.name, "data.parquet")
+        self.df.to_parquet(self.path, index=False, row_group_size=2000)
+        with open(self.path, "rb") as f:
+            self.client = FakeRangeClient(f.read())
+        self.loader = DatasetLoader(bucket=SimpleNamespace(s3_client=self.client))
+        patcher = mock.patch("django_app_ml.loaders.get_s3_cache", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_same_result_as_local_read(self):
+        filters = [("id", ">=", 15000), ("category", "in", ["A", "B"])]
+        for columns, row_filters in ((None, None), (["amount", "id"], filters)):
+            expected = DatasetLoader().read(self.path, columns=columns, filters=row_filters)
+            df = self.loader.read("s3://bucket/data.parquet", columns=columns, filters=row_filters)
+            pd.testing.assert_frame_equal(df, expected)
+
+    def test_only_needed_column_chunks_fetched(self):
+        with mock.patch("django_app_ml.s3.app_settings", SimpleNamespace(
+            s3_range_coalesce_gap=0, s3_range_max_size=1024 ** 2, s3_range_max_workers=4,
+        )):
+            self.loader.read("s3://bucket/data.parquet", columns=["id"], filters=[("id", "<", 4000)])
+        fetched = sum(end - start for start, end in self.client.ranges)
+        self.assertLess(fetched, len(self.client.data) / 4)
+        # Footer + les chunks "id" des deux premiers row groups
+        self.assertEqual(len(self.client.ranges), 3)
+
+    def test_partial_reads_skip_cache(self):
+        """Footer, manifeste et échantillon ne téléchargent pas l'objet entier, même avec le cache"""
+        df = make_dataframe(200000)
+        df.to_parquet(self.path, index=False, row_group_size=20000)
+        with open(self.path, "rb") as f:
+            client = FakeRangeClient(f.read())
+        bucket = SimpleNamespace(s3_client=client)
+        auditor = PandasDatasetAuditor(bucket=bucket)
+        cache = mock.Mock(open=mock.Mock(side_effect=AssertionError("cache utilisé")))
+        with mock.patch("django_app_ml.loaders.get_s3_cache", return_value=cache):
+            self.assertEqual(DatasetLoader(bucket).count_rows("s3://bucket/data.parquet"), 200000)
+            manifest = auditor.parquet_manifest(["s3://bucket/data.parquet"])
+            report = auditor.quick_audit("s3://bucket/data.parquet", sample_size=1000, seed=0)
+        self.assertEqual(len(manifest[0]["row_groups"]), 10)
+        self.assertEqual(report.basic_info.row_count, 200000)
+        fetched = sum(end - start for start, end in client.ranges)
+        self.assertLess(fetched, len(client.data) / 2)
+
+    def test_iter_chunks_by_row_group(self):
+        filters = [("id", ">=", 15000)]
+        cache = mock.Mock(open=mock.Mock(side_effect=AssertionError("cache utilisé")))
+        with mock.patch("django_app_ml.loaders.get_s3_cache", return_value=cache):
+            chunks = list(self.loader.iter_chunks("s3://bucket/data.parquet", chunk_size=1500,
+                                                  columns=["id", "amount"], filters=filters))
+        expected = DatasetLoader().read(self.path, columns=["id", "amount"], filters=filters)
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+        # Footer puis au plus une requête par row group conservé (colonnes voisines regroupées)
+        self.assertLessEqual(len(self.client.ranges), 1 + 3)
+
+    def test_parquet_audit_matches_local(self):
+        auditor = PandasDatasetAuditor(bucket=SimpleNamespace(s3_client=self.client))
+        local = PandasDatasetAuditor(bucket=None)
+        for streaming in (False, True):
+            report = auditor.parquet_audit("s3://bucket/data.parquet", streaming=streaming)
+            expected = local.parquet_audit(self.path, streaming=streaming)
+            self.assertEqual(report.model_dump(exclude={"dataset_path", "audit_timestamp"}),
+                             expected.model_dump(exclude={"dataset_path", "audit_timestamp"}))
+
+    def test_coalesce_ranges(self):
+        self.assertEqual(coalesce_ranges([(10, 20), (0, 5), (22, 30), (100, 110)], gap=5, max_size=50),
+                         [(0, 30), (100, 110)])
+        self.assertEqual(coalesce_ranges([(0, 40), (40, 80)], gap=5, max_size=50), [(0, 40), (40, 80)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Tests de la conversion CSV -> Parquet à l'ingestion
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from django_app_ml.parquet_conversion import convert_csv_to_parquet, infer_csv_schema, parquet_key_for
+
+
+class TestCsvToParquet(unittest.TestCase):
+    """Tests de la conversion en flux"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        rows = 2500
+        self.df = pd.DataFrame({
+            "id": np.arange(rows),
+            "amount": np.round(rng.normal(100, 15, rows), 3),
+            "category": rng.choice(["A", "B", None], rows),
+            "code": rng.integers(0, 9, rows).astype(str),
+        })
+        # Décimales absentes de l'échantillon
+        self.df["late"] = "1"
+        self.df.loc[rows - 1, "late"] = "1.5"
+        self.csv_path = os.path.join(self.tmp_dir.name, "data.csv")
+        self.parquet_path = os.path.join(self.tmp_dir.name, "data.parquet")
+        self.df.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def convert(self, column_types):
+        with open(self.csv_path, "rb") as source:
+            schema = infer_csv_schema(source, sample_rows=100, column_types=column_types)
+        with open(self.csv_path, "rb") as source, open(self.parquet_path, "wb") as sink:
+            return schema, convert_csv_to_parquet(source, sink, schema, row_group_size=1000, compression="zstd")
+
+    def test_typed_row_groups(self):
+        schema, rows = self.convert({"code": "string", "late": "float64"})
+        self.assertEqual(rows, len(self.df))
+        self.assertEqual(schema.field("id").type, pa.int64())
+        self.assertEqual(schema.field("code").type, pa.string())
+
+        parquet_file = pq.ParquetFile(self.parquet_path)
+        self.assertEqual(
+            [parquet_file.metadata.row_group(i).num_rows for i in range(parquet_file.num_row_groups)],
+            [1000, 1000, 500],
+        )
+        self.assertEqual(parquet_file.metadata.row_group(0).column(0).compression, "ZSTD")
+        converted = pd.read_parquet(self.parquet_path)
+        pd.testing.assert_frame_equal(
+            converted, pd.read_csv(self.csv_path, dtype={"code": str}), check_dtype=False
+        )
+
+    def test_sample_inference_needs_override(self):
+        with self.assertRaises(pa.ArrowInvalid):
+            self.convert({})
+
+    def test_parquet_key_next_to_csv(self):
+        self.assertEqual(parquet_key_for("raw/train.CSV"), "raw/train.parquet")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Tests de la réconciliation périodique de l'état S3 des datasets
+"""
+
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from django_app_ml import tasks
+from django_app_ml.models import Bucket, DataSet
+from django_app_ml.tasks import RECONCILE_SCHEDULE_KEY, reconcile_datasets_task
+
+
+class TestReconcileSchedule(TestCase):
+    """Tests de la commande reconcile_datasets et de la chaîne de reprogrammation"""
+
+    def setUp(self):
+        cache.delete(RECONCILE_SCHEDULE_KEY)
+        self.sent = []
+        patcher = mock.patch.object(reconcile_datasets_task, "send_with_options", side_effect=self.send)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(DataSet, "reconcile_s3_state", return_value=2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def send(self, **options):
+        self.sent.append(options)
+        return SimpleNamespace(message_id=f"m{len(self.sent)}")
+
+    def run_as(self, message_id):
+        """Exécute la tâche comme le worker le ferait pour le message donné"""
+        with mock.patch.object(tasks.CurrentMessage, "get_current_message",
+                               return_value=SimpleNamespace(message_id=message_id)):
+            return reconcile_datasets_task.fn(reschedule=True)
+
+    def test_command_runs_inline(self):
+        out = StringIO()
+        call_command("reconcile_datasets", stdout=out)
+        self.assertIn("2 datasets", out.getvalue())
+        self.assertEqual(self.sent, [])
+
+    def test_latest_chain_wins(self):
+        call_command("reconcile_datasets", "--schedule", stdout=StringIO())
+        self.assertEqual(cache.get(RECONCILE_SCHEDULE_KEY), "m1")
+
+        self.run_as("m1")
+        self.assertEqual(self.sent[-1]["kwargs"], {"reschedule": True})
+        self.assertEqual(cache.get(RECONCILE_SCHEDULE_KEY), "m2")
+
+        # Une nouvelle chaîne remplace la précédente, qui ne se reprogramme plus
+        call_command("reconcile_datasets", "--schedule", stdout=StringIO())
+        self.run_as("m2")
+        self.assertEqual(len(self.sent), 3)
+        self.assertEqual(cache.get(RECONCILE_SCHEDULE_KEY), "m3")
+
+
+class TestLazyS3State(TestCase):
+    """Tests de la vérification paresseuse des datasets sans état S3 enregistré"""
+
+    def setUp(self):
+        bucket = Bucket.objects.create(access_key="a", secret_key="s", region="eu-west-3", bucket_name="data")
+        self.dataset = DataSet.objects.create(name="a", s3_key="a.csv", description="", bucket=bucket,
+                                              link="https://example.com/a.csv")
+
+    def test_unknown_state_checked_once(self):
+        with mock.patch("django_app_ml.models.head_object_state", return_value=None) as head, \
+                mock.patch.object(Bucket, "s3_client", new_callable=mock.PropertyMock):
+            self.assertFalse(DataSet.objects.get(id=self.dataset.id).downloaded)
+            self.assertFalse(DataSet.objects.get(id=self.dataset.id).downloaded)
+        head.assert_called_once()
+        self.assertIs(DataSet.objects.get(id=self.dataset.id).s3_exists, False)
+
+    def test_uploaded_dataset(self):
+        with mock.patch("django_app_ml.models.head_object_state", return_value={"etag": "e", "size": 3}), \
+                mock.patch.object(Bucket, "s3_client", new_callable=mock.PropertyMock):
+            self.assertTrue(self.dataset.downloaded)
+        self.assertEqual(DataSet.objects.get(id=self.dataset.id).s3_size, 3)
+
+    def test_check_failure_not_recorded(self):
+        with mock.patch("django_app_ml.models.head_object_state", side_effect=ConnectionError("S3 injoignable")), \
+                mock.patch.object(Bucket, "s3_client", new_callable=mock.PropertyMock):
+            self.assertFalse(self.dataset.downloaded)
+        self.assertIsNone(DataSet.objects.get(id=self.dataset.id).s3_exists)
@@ -0,0 +1,67 @@
+"""
+Tests du backend de résultats partagé par le processus
+"""
+
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from dramatiq.encoder import PickleEncoder
+from dramatiq.results.backends import RedisBackend
+
+from django_app_ml.task_utils import TaskResultManager, get_result_backend, reset_result_backend
+
+ENCODER = PickleEncoder()
+
+REDIS_RESULT_BACKEND = {
+    "BACKEND": "dramatiq.results.backends.redis.RedisBackend",
+    "BACKEND_OPTIONS": {
+        "url": "redis://localhost:6379/1",
+        "namespace": "app-ml-results",
+        "encoder": ENCODER,
+        "max_connections": 5,
+        "socket_timeout": 3,
+    },
+}
+
+
+@override_settings(DRAMATIQ_RESULT_BACKEND=REDIS_RESULT_BACKEND)
+class TestResultBackend(SimpleTestCase):
+    """Tests de ``get_result_backend`` / ``reset_result_backend``"""
+
+    def setUp(self):
+        reset_result_backend()
+        self.addCleanup(reset_result_backend)
+        self.clients = []
+        patcher = mock.patch("django_app_ml.task_utils.make_redis_client", side_effect=self.make_client)
+        self.make_redis_client = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_client(self, url, **options):
+        self.clients.append(mock.Mock(name=f"client-{len(self.clients)}"))
+        return self.clients[-1]
+
+    def test_single_instance(self):
+        backend = TaskResultManager().backend
+        self.assertIsInstance(backend, RedisBackend)
+        self.assertIs(TaskResultManager().backend, backend)
+        self.assertIs(get_result_backend(), backend)
+        self.make_redis_client.assert_called_once()
+
+    def test_options_split(self):
+        backend = get_result_backend()
+        # Connexion et pool pour le client, namespace et encodeur pour le backend
+        self.make_redis_client.assert_called_once_with(
+            "redis://localhost:6379/1", max_connections=5, socket_timeout=3
+        )
+        self.assertIs(backend.client, self.clients[0])
+        self.assertEqual(backend.namespace, "app-ml-results")
+        self.assertIs(backend.encoder, ENCODER)
+
+    def test_reset_rebuilds(self):
+        backend = get_result_backend()
+        reset_result_backend()
+        rebuilt = get_result_backend()
+        self.assertIsNot(rebuilt, backend)
+        self.assertIs(rebuilt.client, self.clients[1])
+        self.assertIs(get_result_backend(), rebuilt)
+        self.assertEqual(self.make_redis_client.call_count, 2)
@@ -0,0 +1,287 @@
+"""
+Tests des clients S3 partagés et de l'upload en flux (multipart)
+"""
+
+import itertools
+import os
+import tempfile
+import threading
+import unittest
+import zipfile
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+
+from django_app_ml.s3 import (
+    MIN_PART_SIZE,
+    clear_s3_clients,
+    get_s3_client,
+    invalidate_s3_client,
+    iter_parts,
+    object_states,
+    open_url_stream,
+    skip_bytes,
+    upload_stream,
+    upload_zip_members,
+)
+
+
+class FakePaginator:
+    def __init__(self, method):
+        self.method = method
+
+    def paginate(self, **kwargs):
+        yield self.method(**kwargs)
+
+
+class FakeMultipartClient:
+    """Client S3 minimal gérant les uploads multipart"""
+
+    def __init__(self):
+        self.uploads = {}
+        self.objects = {}
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.fail_on_part = None
+
+    def get_paginator(self, name):
+        return FakePaginator(getattr(self, name))
+
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = f"upload-{next(self.ids)}"
+        self.uploads[upload_id] = {"Key": Key, "Initiated": upload_id, "parts": {}}
+        return {"UploadId": upload_id}
+
+    def list_multipart_uploads(self, Bucket, Prefix):
+        return {"Uploads": [
+            {"Key": upload["Key"], "UploadId": upload_id, "Initiated": upload["Initiated"]}
+            for upload_id, upload in self.uploads.items() if upload["Key"].startswith(Prefix)
+        ]}
+
+    def list_parts(self, Bucket, Key, UploadId):
+        return {"Parts": [
+            {"PartNumber": number, "ETag": f"etag-{number}", "Size": len(body)}
+            for number, body in self.uploads[UploadId]["parts"].items()
+        ]}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if PartNumber == self.fail_on_part:
+            raise ConnectionError("worker killed")
+        with self.lock:
+            self.uploads[UploadId]["parts"][PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        upload = self.uploads.pop(UploadId)
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        assert numbers == list(range(1, len(numbers) + 1))
+        self.objects[Key] = b"".join(upload["parts"][number] for number in numbers)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId)
+
+    def put_object(self, Bucket, Key, Body):
+        self.objects[Key] = Body
+
+
+class TestUploadStream(unittest.TestCase):
+    """Tests de ``upload_stream``"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = FakeMultipartClient()
+        self.data = bytes(range(256)) * (MIN_PART_SIZE * 3 // 256 + 100)
+        self.offsets = []
+
+    def open_stream(self, offset):
+        self.offsets.append(offset)
+        # Morceaux de taille irrégulière, comme ``iter_content``
+        for start in range(offset, len(self.data), 700_001):
+            yield self.data[start:start + 700_001]
+
+    def test_upload_in_parts(self):
+        size = upload_stream(self.client, self.open_stream, "bucket", "big.csv", part_size=MIN_PART_SIZE, max_workers=2)
+        self.assertEqual(size, len(self.data))
+        self.assertEqual(self.client.objects["big.csv"], self.data)
+        self.assertEqual(self.client.uploads, {})
+
+    def upload(self, source_id):
+        return upload_stream(self.client, self.open_stream, "bucket", "big.csv", part_size=MIN_PART_SIZE,
+                             max_workers=1, source_id=source_id)
+
+    def fail_after_two_parts(self, source_id):
+        self.client.fail_on_part = 3
+        with self.assertRaises(ConnectionError):
+            self.upload(source_id)
+        self.assertEqual(len(self.client.uploads), 1)
+        self.client.fail_on_part = None
+
+    def test_resume_after_failure(self):
+        self.fail_after_two_parts("source-v1")
+        self.upload("source-v1")
+        self.assertEqual(self.offsets, [0, 2 * MIN_PART_SIZE])
+        self.assertEqual(self.client.objects["big.csv"], self.data)
+
+    def test_source_changed_between_attempts(self):
+        self.fail_after_two_parts("source-v1")
+        # Le fichier distant a changé : les parts déjà envoyées ne sont pas réutilisées
+        self.data = bytes(reversed(self.data))
+        self.upload("source-v2")
+        self.assertEqual(self.offsets, [0, 0])
+        self.assertEqual(self.client.objects["big.csv"], self.data)
+        self.assertEqual(self.client.uploads, {})
+
+    def test_unknown_source_not_resumed(self):
+        self.fail_after_two_parts(None)
+        self.upload(None)
+        self.assertEqual(self.offsets, [0, 0])
+        self.assertEqual(self.client.objects["big.csv"], self.data)
+        self.assertEqual(self.client.uploads, {})
+
+    def test_url_changed_during_resume(self):
+        response = mock.MagicMock(status_code=206, headers={
+            "Content-Range": "bytes 10-99/100", "ETag": '"v2"', "Last-Modified": "Tue, 01 Jul 2025 00:00:00 GMT",
+        })
+        response.__enter__.return_value = response
+        with mock.patch("requests.get", return_value=response):
+            open_stream = open_url_stream("https://example.com/a.csv", source_id="https://example.com/a.csv|100|\"v1\"|")
+            with self.assertRaises(ValueError):
+                list(open_stream(10))
+            response.headers["ETag"] = '"v1"'
+            response.headers.pop("Last-Modified")
+            response.iter_content.return_value = iter([b"rest"])
+            self.assertEqual(list(open_stream(10)), [b"rest"])
+
+    def test_empty_source(self):
+        self.assertEqual(upload_stream(self.client, lambda offset: iter([]), "bucket", "empty.csv",
+                                       part_size=MIN_PART_SIZE), 0)
+        self.assertEqual(self.client.objects["empty.csv"], b"")
+
+    def test_part_size_too_small(self):
+        with self.assertRaises(ValueError):
+            upload_stream(self.client, self.open_stream, "bucket", "big.csv", part_size=1024)
+
+    def test_chunk_helpers(self):
+        self.assertEqual(list(iter_parts([b"abc", b"defg", b"h"], 3)), [b"abc", b"def", b"gh"])
+        self.assertEqual(b"".join(skip_bytes([b"abc", b"defg"], 4)), b"efg")
+
+
+class TestUploadZipMembers(unittest.TestCase):
+    """Tests de l'upload des fichiers d'une archive ZIP sans extraction"""
+
+    def setUp(self):
+        self.client = FakeMultipartClient()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.archive = os.path.join(directory.name, "dataset.zip")
+        self.files = {"data/train.csv": b"a,b\n1,2\n" * 1000, "data/test.csv": b"a,b\n3,4\n", "README": b"hello"}
+        with zipfile.ZipFile(self.archive, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("data/", b"")
+            for name, body in self.files.items():
+                archive.writestr(name, body)
+
+    def test_upload_all_members(self):
+        snapshots = []
+        state = upload_zip_members(self.client, self.archive, "bucket", key_for=lambda name: f"ds/{name}",
+                                   concurrency=2, retries=0, progress=snapshots.append)
+        self.assertEqual(self.client.objects, {f"ds/{name}": body for name, body in self.files.items()})
+        self.assertEqual(state["files_done"], 3)
+        self.assertEqual(state["bytes_uploaded"], sum(len(body) for body in self.files.values()))
+        self.assertEqual([snapshot["files_done"] for snapshot in snapshots], [1, 2, 3])
+
+    def test_retry_then_report_failure(self):
+        upload_part = self.client.upload_part
+        attempts = []
+
+        def flaky_upload_part(Bucket, Key, **kwargs):
+            attempts.append(Key)
+            if Key == "README" or attempts.count(Key) == 1:
+                raise ConnectionError("reset")
+            return upload_part(Bucket, Key, **kwargs)
+
+        self.client.upload_part = flaky_upload_part
+        with mock.patch("django_app_ml.s3.time.sleep"):
+            state = upload_zip_members(self.client, self.archive, "bucket", key_for=lambda name: name,
+                                       concurrency=1, retries=1)
+        self.assertEqual(state["files_done"], 2)
+        self.assertEqual(state["files_failed"], 1)
+        self.assertEqual(state["failed"][0]["file"], "README")
+        self.assertEqual(attempts.count("README"), 2)
+        self.assertEqual(self.client.objects["data/test.csv"], self.files["data/test.csv"])
+
+
+class TestS3ClientRegistry(unittest.TestCase):
+    """Tests du registre de clients S3 partagés"""
+
+    def setUp(self):
+        clear_s3_clients()
+        self.session = mock.Mock()
+        self.session.return_value.client.side_effect = lambda *args, **kwargs: object()
+        boto3 = SimpleNamespace(session=SimpleNamespace(Session=self.session))
+        botocore_config = SimpleNamespace(Config=mock.Mock())
+        patcher = mock.patch.dict("sys.modules", {"boto3": boto3, "botocore.config": botocore_config})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(clear_s3_clients)
+
+    def test_client_shared_per_credentials(self):
+        credentials = {"access_key": "key", "secret_key": "secret", "endpoint": "http://minio:9000", "region": ""}
+        clients = []
+        threads = [threading.Thread(target=lambda: clients.append(get_s3_client(**credentials))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(client) for client in clients}), 1)
+        self.assertEqual(self.session.call_count, 1)
+        self.assertIsNot(get_s3_client(**{**credentials, "secret_key": "other"}), clients[0])
+
+        invalidate_s3_client(**credentials)
+        self.assertIsNot(get_s3_client(**credentials), clients[0])
+
+
+class MissingKey(Exception):
+    response = {"Error": {"Code": "404"}}
+
+
+class FakeListingClient:
+    """Client S3 minimal pour HeadObject et ListObjectsV2"""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.calls = []
+
+    def get_paginator(self, name):
+        return FakePaginator(getattr(self, name))
+
+    def head_object(self, Bucket, Key):
+        self.calls.append(("head", Key))
+        if Key not in self.objects:
+            raise MissingKey()
+        return {"ETag": f'"{Key}-etag"', "ContentLength": self.objects[Key]}
+
+    def list_objects_v2(self, Bucket, Prefix, Delimiter):
+        self.calls.append(("list", Prefix))
+        return {"Contents": [
+            {"Key": key, "ETag": f'"{key}-etag"', "Size": size}
+            for key, size in self.objects.items()
+            if key.startswith(Prefix) and Delimiter not in key[len(Prefix):]
+        ]}
+
+
+class TestObjectStates(unittest.TestCase):
+    """Tests de la vérification groupée d'existence des objets"""
+
+    def test_list_per_shared_prefix(self):
+        client = FakeListingClient({"raw/a.csv": 10, "raw/b.csv": 20, "raw/sub/c.csv": 30, "solo.csv": 40})
+        states = object_states(client, "bucket", ["raw/a.csv", "raw/b.csv", "raw/missing.csv", "solo.csv", "gone.csv"])
+        self.assertEqual(states["raw/a.csv"], {"etag": "raw/a.csv-etag", "size": 10})
+        self.assertIsNone(states["raw/missing.csv"])
+        self.assertEqual(states["solo.csv"]["size"], 40)
+        self.assertIsNone(states["gone.csv"])
+        self.assertEqual(sorted(client.calls), [("list", ""), ("list", "raw/")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Tests du cache local des objets S3
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from django_app_ml.s3_cache import S3ObjectCache
+
+
+class NotModified(Exception):
+    response = {"Error": {"Code": "304"}, "ResponseMetadata": {"HTTPStatusCode": 304}}
+
+
+class FakeS3Client:
+    """Client S3 minimal gérant ``If-None-Match``"""
+
+    def __init__(self):
+        self.objects = {}
+        self.downloads = 0
+        self.ranges = []
+
+    def put(self, key, body, etag):
+        self.objects[key] = (body, etag)
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None, Range=None, IfMatch=None):
+        body, etag = self.objects[Key]
+        if IfNoneMatch == f'"{etag}"':
+            raise NotModified()
+        if Range is not None:
+            assert IfMatch == f'"{etag}"'
+            self.ranges.append(Range)
+            first, last = Range[len("bytes="):].split("-")
+            return {"ETag": f'"{etag}"', "Body": io.BytesIO(body[int(first):int(last) + 1])}
+        self.downloads += 1
+        return {"ETag": f'"{etag}"', "Body": io.BytesIO(body), "ContentLength": len(body)}
+
+
+class TestS3ObjectCache(unittest.TestCase):
+    """Tests de ``S3ObjectCache``"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = S3ObjectCache(os.path.join(self.tmp_dir.name, "cache"), max_size=250)
+        self.client = FakeS3Client()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def read(self, key):
+        with self.cache.open(self.client, "bucket", key) as f:
+            return f.read()
+
+    def test_revalidates_with_conditional_get(self):
+        self.client.put("a.csv", b"x" * 100, "etag-1")
+        self.assertEqual(self.read("a.csv"), b"x" * 100)
+        self.assertEqual(self.read("a.csv"), b"x" * 100)
+        self.assertEqual(self.client.downloads, 1)
+
+        self.client.put("a.csv", b"y" * 100, "etag-2")
+        self.assertEqual(self.read("a.csv"), b"y" * 100)
+        self.assertEqual(self.client.downloads, 2)
+        self.assertEqual(self.cache.size(), 100)
+
+    def test_evicts_least_recently_used(self):
+        for key in ("a", "b"):
+            self.client.put(key, b"0" * 100, key)
+            self.read(key)
+        # "a" redevient le plus récemment utilisé
+        os.utime(os.path.join(self.cache._entry_dir("bucket", "b"), "b.data"), (0, 0))
+        self.read("a")
+
+        self.client.put("c", b"0" * 100, "c")
+        self.read("c")
+        self.assertEqual(self.cache.size(), 200)
+        self.read("a")
+        self.assertEqual(self.client.downloads, 3)
+        self.read("b")
+        self.assertEqual(self.client.downloads, 4)
+
+    def test_copy_to(self):
+        self.client.put("data/a.parquet", b"parquet", "etag")
+        destination = os.path.join(self.tmp_dir.name, "media", "datasets", "a.parquet")
+        self.cache.copy_to(self.client, "bucket", "data/a.parquet", destination)
+        self.cache.copy_to(self.client, "bucket", "data/a.parquet", destination)
+        with open(destination, "rb") as f:
+            self.assertEqual(f.read(), b"parquet")
+        self.assertEqual(self.client.downloads, 1)
+
+        # Copie indépendante : la modifier ne touche pas l'entrée du cache
+        self.assertEqual(os.stat(destination).st_nlink, 1)
+        with open(destination, "r+b") as f:
+            f.write(b"PARQUET")
+        self.assertEqual(self.read("data/a.parquet"), b"parquet")
+        self.assertEqual(self.client.downloads, 1)
+        self.assertEqual([name for name in os.listdir(os.path.dirname(destination))], ["a.parquet"])
+
+    def test_large_miss_fetched_by_ranges(self):
+        body = bytes(range(256)) * 4
+        self.client.put("big.parquet", body, "etag")
+        settings = SimpleNamespace(s3_range_max_size=100, s3_range_max_workers=3)
+        with mock.patch("django_app_ml.s3.app_settings", settings), \
+                mock.patch("django_app_ml.s3_cache.app_settings", settings):
+            cache = S3ObjectCache(os.path.join(self.tmp_dir.name, "big"), max_size=10_000)
+            with cache.open(self.client, "bucket", "big.parquet") as f:
+                self.assertEqual(f.read(), body)
+        # Les 100 premiers octets viennent du GET initial, le reste de 10 GET ranged
+        self.assertEqual(len(self.client.ranges), 10)
+        self.assertIn("bytes=1000-1023", self.client.ranges)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Tests pour les sketches HyperLogLog et Space-Saving
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from django_app_ml.sketches import HyperLogLog, SpaceSaving, TDigest
+from django_app_ml.audit_accumulators import CategoricalColumnAccumulator
+
+
+class TestHyperLogLog(unittest.TestCase):
+    """Tests de l'estimateur de cardinalité"""
+
+    def test_estimate_within_error(self):
+        hll = HyperLogLog(precision=12)
+        hll.update([f"id-{i}" for i in range(50_000)])
+        self.assertLess(abs(hll.count() - 50_000) / 50_000, 3 * hll.relative_error)
+
+    def test_small_cardinality(self):
+        hll = HyperLogLog()
+        hll.update(["a", "b", "c", "a", "b"])
+        self.assertEqual(hll.count(), 3)
+
+    def test_merge_equals_union(self):
+        values = [f"id-{i}" for i in range(20_000)]
+        single = HyperLogLog()
+        single.update(values)
+        left, right = HyperLogLog(), HyperLogLog()
+        left.update(values[:12_000])
+        right.update(values[8_000:])
+        left.merge(right)
+        self.assertEqual(left.count(), single.count())
+
+    def test_merge_rejects_different_precision(self):
+        with self.assertRaises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(12))
+
+
+class TestSpaceSaving(unittest.TestCase):
+    """Tests du résumé des valeurs les plus fréquentes"""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # Distribution de Zipf : quelques valeurs très fréquentes, une longue traîne
+        self.values = pd.Series(rng.zipf(1.5, 100_000).astype(str))
+        self.expected = self.values.value_counts()
+
+    def test_heavy_hitters_merged_across_chunks(self):
+        summary = SpaceSaving(capacity=50)
+        for start in range(0, len(self.values), 10_000):
+            summary.update(self.values.iloc[start:start + 10_000])
+
+        self.assertEqual(summary.total, len(self.values))
+        self.assertEqual([value for value, _ in summary.top(5)], list(self.expected.index[:5]))
+        for value, count in summary.top(10):
+            # Le compteur surestime d'au plus l'erreur annoncée
+            self.assertGreaterEqual(count, self.expected[value])
+            self.assertLessEqual(count - summary.errors[value], self.expected[value])
+        self.assertLessEqual(summary.floor, summary.total / summary.capacity)
+
+
+class TestTDigest(unittest.TestCase):
+    """Tests du sketch de quantiles"""
+
+    def test_exact_on_small_samples(self):
+        digest = TDigest()
+        digest.update(np.array([5.0, 1.0, 3.0, np.nan, 2.0]))
+        self.assertEqual(digest.quantile(0.5), 2.5)
+
+    def test_median_merged_across_chunks(self):
+        values = np.random.default_rng(0).normal(size=200_000)
+        digest = TDigest(compression=200)
+        for chunk in np.split(values, 20):
+            other = TDigest(compression=200)
+            other.update(chunk)
+            digest.merge(other)
+        self.assertEqual(digest.count, len(values))
+        self.assertLessEqual(len(digest.means), digest.compression)
+        self.assertAlmostEqual(digest.quantile(0.5), np.median(values), delta=0.01)
+
+    def test_empty_digest(self):
+        self.assertTrue(np.isnan(TDigest().quantile(0.5)))
+
+
+class TestApproximateCategoricalAccumulator(unittest.TestCase):
+    """Tests du mode approximé des statistiques catégorielles"""
+
+    def test_error_bound_reported(self):
+        accumulator = CategoricalColumnAccumulator(approximate=True)
+        accumulator.update(pd.Series(["x", "y", "y", None]))
+        stats = accumulator.to_schema()
+        self.assertEqual(stats.unique_count, 2)
+        self.assertEqual(stats.top_values, {"y": 2, "x": 1})
+        self.assertIsNotNone(stats.error_bound)
+
+    def test_exact_mode_has_no_error_bound(self):
+        accumulator = CategoricalColumnAccumulator()
+        accumulator.update(pd.Series(["x", "y", "y"]))
+        self.assertIsNone(accumulator.to_schema().error_bound)
+
+    def test_switches_to_sketches_above_threshold(self):
+        accumulator = CategoricalColumnAccumulator(sketch_threshold=10)
+        accumulator.update(pd.Series(list("abcde")))
+        self.assertFalse(accumulator.approximate)
+        accumulator.update(pd.Series(list("abcdefgh")))
+        self.assertTrue(accumulator.approximate)
+        self.assertEqual(accumulator.to_schema().unique_count, 8)
+
+    def test_merge_exact_into_approximate(self):
+        exact = CategoricalColumnAccumulator()
+        exact.update(pd.Series(["a", "b", "b"]))
+        approximate = CategoricalColumnAccumulator(approximate=True)
+        approximate.update(pd.Series(["b", "c"]))
+        approximate.merge(exact)
+        stats = approximate.to_schema()
+        self.assertEqual(stats.unique_count, 3)
+        self.assertEqual(stats.top_values["b"], 3)
+
+    def test_unused_categories_ignored(self):
+        values = pd.Series(pd.Categorical(["a", "b", "b"], categories=["a", "b", "c", "d"]))
+        for approximate in (False, True):
+            accumulator = CategoricalColumnAccumulator(approximate=approximate)
+            accumulator.update(values)
+            accumulator.update(values.iloc[:1])
+            stats = accumulator.to_schema()
+            self.assertEqual(stats.unique_count, 2)
+            self.assertEqual(stats.top_values, {"a": 2, "b": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Tests de la diffusion des événements de tâches (Redis pub/sub)
+"""
+
+import json
+import unittest
+from collections import deque
+from types import SimpleNamespace
+from unittest import mock
+
+import dramatiq
+from dramatiq.brokers.stub import StubBroker
+from dramatiq.middleware import Retries
+
+from django_app_ml import task_events
+from django_app_ml.task_events import TaskEventsMiddleware, iter_task_events, publish_task_event
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.messages = deque()
+
+    def subscribe(self, channel):
+        self.redis.subscribers.setdefault(channel, []).append(self)
+
+    def get_message(self, timeout):
+        return self.messages.popleft() if self.messages else None
+
+    def close(self):
+        for subscribers in self.redis.subscribers.values():
+            if self in subscribers:
+                subscribers.remove(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def set(self, key, value, ex=None):
+        self.commands.append(lambda: self.redis.values.__setitem__(key, value))
+
+    def publish(self, channel, value):
+        self.commands.append(lambda: self.redis.publish(channel, value))
+
+    def execute(self):
+        for command in self.commands:
+            command()
+
+
+class FakeRedis:
+    """Redis minimal : clés, pipeline et pub/sub"""
+
+    def __init__(self):
+        self.values = {}
+        self.subscribers = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def publish(self, channel, value):
+        for pubsub in self.subscribers.get(channel, []):
+            pubsub.messages.append({"type": "message", "data": value})
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        return FakePubSub(self)
+
+
+class TestTaskEvents(unittest.TestCase):
+    """Tests de la publication et de l'écoute des événements d'une tâche"""
+
+    def setUp(self):
+        self.redis = FakeRedis()
+        patcher = mock.patch.object(task_events, "_redis", self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        settings = SimpleNamespace(task_events_ttl=60, task_events_timeout=5, task_events_heartbeat=1)
+        patcher = mock.patch.object(task_events, "app_settings", settings)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_late_subscriber_gets_final_state(self):
+        publish_task_event("t1", "completed", message="ok", result={"error": False})
+        events = list(iter_task_events("t1", initial=lambda: self.fail("état lu en base inutile")))
+        self.assertEqual(events, [{"status": "completed", "message": "ok", "task_id": "t1", "result": {"error": False}}])
+
+    def test_stream_until_final_state(self):
+        stream = iter_task_events("t2", initial=lambda: {"status": "pending", "task_id": "t2"})
+        self.assertEqual(next(stream)["status"], "pending")
+        # Aucun événement : battement de maintien de la connexion
+        self.assertIsNone(next(stream))
+
+        message = SimpleNamespace(message_id="t2", failed=False)
+        middleware = TaskEventsMiddleware()
+        middleware.before_process_message(None, message)
+        middleware.after_process_message(None, message, result={"error": True, "message": "boom"})
+        events = list(stream)
+        self.assertEqual([event["status"] for event in events], ["running", "failed"])
+        self.assertEqual(events[-1]["error"], "boom")
+        self.assertEqual(self.redis.subscribers["app_ml:task_events:t2"], [])
+        self.assertEqual(json.loads(self.redis.values["app_ml:task_events:last:t2"])["status"], "failed")
+
+    def test_retry_is_not_final(self):
+        message = SimpleNamespace(message_id="t3", failed=False)
+        TaskEventsMiddleware().after_process_message(None, message, exception=ValueError("retry"))
+        self.assertEqual(json.loads(self.redis.get("app_ml:task_events:last:t3"))["status"], "pending")
+
+    def test_worker_publishes_final_failure(self):
+        """Ordre des middlewares de la documentation, sur un vrai broker et un worker"""
+        broker = StubBroker(middleware=[TaskEventsMiddleware(), Retries(min_backoff=1, max_backoff=10)])
+        broker.emit_after("process_boot")
+        calls = {"flaky": 0}
+
+        @dramatiq.actor(broker=broker, max_retries=0)
+        def broken():
+            raise ValueError("boom")
+
+        @dramatiq.actor(broker=broker, max_retries=1)
+        def flaky():
+            calls["flaky"] += 1
+            raise ValueError("boom")
+
+        @dramatiq.actor(broker=broker)
+        def works():
+            return None
+
+        statuses = {}
+        for actor in (broken, flaky, works):
+            message = actor.message()
+            pubsub = self.redis.pubsub()
+            pubsub.subscribe(f"app_ml:task_events:{message.message_id}")
+            statuses[actor.actor_name] = (message.message_id, pubsub)
+            broker.enqueue(message)
+
+        worker = dramatiq.Worker(broker, worker_timeout=100)
+        worker.start()
+        try:
+            broker.join(broken.queue_name, fail_fast=False)
+            worker.join()
+        finally:
+            worker.stop()
+
+        def published(actor):
+            message_id, pubsub = statuses[actor.actor_name]
+            last = json.loads(self.redis.get(f"app_ml:task_events:last:{message_id}"))["status"]
+            return [json.loads(event["data"])["status"] for event in pubsub.messages], last
+
+        self.assertEqual(published(broken), (["running", "failed"], "failed"))
+        self.assertEqual(calls["flaky"], 2)
+        self.assertEqual(published(flaky), (["running", "pending", "running", "failed"], "failed"))
+        self.assertEqual(published(works), (["running", "completed"], "completed"))
+
+
+if __name__ == "__main__":
+    unittest.main()
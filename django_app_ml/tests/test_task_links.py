@@ -0,0 +1,54 @@
+"""
+Tests des liens entre objets et tâches Dramatiq (TaskLink)
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from django_dramatiq.models import Task
+
+from django_app_ml.models import DataSet, TaskLink
+from django_app_ml.tasks import audit_dataset_task, upload_dataset_task
+
+
+class TestTaskLink(TestCase):
+    """Tests de l'enregistrement et de la lecture des dernières tâches d'un objet"""
+
+    def setUp(self):
+        self.dataset = DataSet.objects.create(name="a", s3_key="a.csv", description="", link="https://example.com/a.csv")
+        self.other = DataSet.objects.create(name="b", s3_key="b.csv", description="", link="https://example.com/b.csv")
+        # Le ContentType est mis en cache par Django : hors du décompte des requêtes
+        ContentType.objects.get_for_model(DataSet)
+
+    def launch(self, actor, dataset, status=Task.STATUS_ENQUEUED):
+        """Enregistre une tâche comme le ferait le broker, puis son lien"""
+        message = actor.message_with_options(kwargs={"dataset_id": dataset.id})
+        task = Task.tasks.create_or_update_from_message(
+            message, status=status, actor_name=message.actor_name, queue_name=message.queue_name
+        )
+        TaskLink.record(dataset, message)
+        return task
+
+    def test_upload_kind_matches_actor(self):
+        self.assertEqual(DataSet.UPLOAD_TASK_KIND, upload_dataset_task.actor_name)
+        self.launch(upload_dataset_task, self.dataset)
+        self.assertEqual(TaskLink.objects.get().kind, DataSet.UPLOAD_TASK_KIND)
+
+    def test_latest_task(self):
+        self.assertIsNone(self.dataset.last_download_task)
+        self.launch(upload_dataset_task, self.dataset, status=Task.STATUS_FAILED)
+        latest = self.launch(upload_dataset_task, self.dataset)
+        self.launch(audit_dataset_task, self.dataset)
+        self.launch(upload_dataset_task, self.other)
+
+        dataset = DataSet.objects.get(id=self.dataset.id)
+        self.assertEqual(str(dataset.last_download_task.id), str(latest.id))
+        self.assertEqual(TaskLink.latest_task(self.dataset, audit_dataset_task.actor_name).actor_name,
+                         audit_dataset_task.actor_name)
+
+    def test_attach_latest_tasks(self):
+        uploaded = self.launch(upload_dataset_task, self.dataset, status=Task.STATUS_DONE)
+        self.launch(audit_dataset_task, self.other)
+        with self.assertNumQueries(2):
+            datasets = {dataset.id: dataset for dataset in DataSet.with_last_download_task()}
+            self.assertEqual(str(datasets[self.dataset.id].last_download_task.id), str(uploaded.id))
+            self.assertIsNone(datasets[self.other.id].last_download_task)
@@ -0,0 +1,62 @@
+"""
+Tests de la mémorisation des routes (file, acteur) des tâches
+"""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django_dramatiq.models import Task
+
+from django_app_ml import task_utils
+from django_app_ml.task_utils import TASK_ROUTE_KEY, TaskResultManager, get_task_route, remember_task_route
+from django_app_ml.tasks import audit_dataset_task
+
+
+class TestTaskRoutes(TestCase):
+    """Tests de ``remember_task_route`` / ``get_task_route`` et de ``create_message``"""
+
+    def setUp(self):
+        cache.clear()
+        task_utils._task_routes.clear()
+        self.addCleanup(task_utils._task_routes.clear)
+
+    def test_local_routes_bounded(self):
+        with mock.patch.object(task_utils, "TASK_ROUTES_MAX", 2):
+            remember_task_route("a", "default", "ml_app.audit_task")
+            remember_task_route("b", "default", "ml_app.audit_task")
+            # Une lecture rafraîchit la route : "b" devient la plus ancienne
+            get_task_route("a")
+            remember_task_route("c", "default", "ml_app.audit_task")
+        self.assertEqual(list(task_utils._task_routes), ["a", "c"])
+
+    def test_shared_cache_fallback(self):
+        remember_task_route("a", "default", "ml_app.audit_task")
+        # Autre processus : mémoire locale vide, route lue dans le cache Django
+        task_utils._task_routes.clear()
+        self.assertEqual(get_task_route("a"), ("default", "ml_app.audit_task"))
+        self.assertIn("a", task_utils._task_routes)
+
+        cache.delete(TASK_ROUTE_KEY.format("a"))
+        self.assertEqual(get_task_route("a"), ("default", "ml_app.audit_task"))
+        task_utils._task_routes.clear()
+        self.assertIsNone(get_task_route("a"))
+
+    def test_create_message_from_database(self):
+        message = audit_dataset_task.message_with_options(kwargs={"dataset_id": 1})
+        Task.tasks.create_or_update_from_message(
+            message, status=Task.STATUS_DONE, actor_name=message.actor_name, queue_name=message.queue_name
+        )
+        manager = TaskResultManager()
+
+        with self.assertNumQueries(1):
+            rebuilt = manager.create_message(message.message_id)
+        self.assertEqual((rebuilt.queue_name, rebuilt.actor_name, rebuilt.message_id),
+                         (message.queue_name, message.actor_name, message.message_id))
+        self.assertEqual(manager.backend.build_message_key(rebuilt), manager.backend.build_message_key(message))
+        self.assertEqual(cache.get(TASK_ROUTE_KEY.format(message.message_id)),
+                         (message.queue_name, message.actor_name))
+
+        # La route est repeuplée : plus aucune lecture en base
+        with self.assertNumQueries(0):
+            manager.create_message(message.message_id)
@@ -0,0 +1,154 @@
+"""
+Tests du statut groupé des tâches (vue batch et lecture des résultats en pipeline)
+"""
+
+import uuid
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django_dramatiq.models import Task
+from dramatiq.results.backends import RedisBackend
+from rest_framework.test import APIClient
+
+from django_app_ml.task_utils import TaskResultManager, set_task_progress
+from django_app_ml.tasks import audit_dataset_task
+
+
+class FakeRedisPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def delete(self, key):
+        self.commands.append(lambda: self.redis.lists.pop(key, None))
+
+    def lpush(self, key, value):
+        self.commands.append(lambda: self.redis.lists.setdefault(key, []).insert(0, value))
+
+    def pexpire(self, key, ttl):
+        self.commands.append(lambda: True)
+
+    def lindex(self, key, index):
+        def run():
+            values = self.redis.lists.get(key, [])
+            return values[index] if index < len(values) else None
+        self.commands.append(run)
+
+    def execute(self):
+        self.redis.round_trips += 1
+        return [command() for command in self.commands]
+
+
+class FakeRedis:
+    """Client Redis minimal : listes en mémoire, compte des allers-retours"""
+
+    def __init__(self):
+        self.lists = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return FakeRedisPipeline(self)
+
+
+class TaskStatusTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.backend = RedisBackend(client=FakeRedis())
+        patcher = mock.patch("django_app_ml.task_utils.get_result_backend", return_value=self.backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_task(self, status, result=None, exception=None):
+        """Enregistre une tâche comme le broker et son résultat comme le middleware Results"""
+        message = audit_dataset_task.message_with_options(kwargs={"dataset_id": 1})
+        task = Task.tasks.create_or_update_from_message(
+            message, status=status, actor_name=message.actor_name, queue_name=message.queue_name
+        )
+        if result is not None:
+            self.backend.store_result(message, result, ttl=60000)
+        if exception is not None:
+            self.backend.store_exception(message, exception, ttl=60000)
+        return task
+
+
+class TestGetTaskResults(TaskStatusTestCase):
+    """Tests de ``TaskResultManager.get_task_results``"""
+
+    def test_single_round_trip(self):
+        done = self.create_task(Task.STATUS_DONE, result={"rows": 3})
+        failed = self.create_task(Task.STATUS_FAILED, exception=ValueError("colonne absente"))
+        missing = self.create_task(Task.STATUS_DONE)
+        self.backend.client.round_trips = 0
+
+        with self.assertLogs("django_app_ml.task_utils", level="ERROR") as logs:
+            results = TaskResultManager().get_task_results([done, failed, missing])
+
+        self.assertEqual(self.backend.client.round_trips, 1)
+        self.assertEqual(results[str(done.id)], {"rows": 3})
+        # L'exception stockée est dépaquetée (ResultFailure) puis journalisée
+        self.assertIsNone(results[str(failed.id)])
+        self.assertIn("colonne absente", logs.output[0])
+        self.assertIsNone(results[str(missing.id)])
+
+
+class TestTaskStatusBatchView(TaskStatusTestCase):
+    """Tests de ``TaskStatusBatchView``"""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.url = reverse("django_app_ml:task-status-batch")
+
+    def test_mixed_statuses(self):
+        enqueued = self.create_task(Task.STATUS_ENQUEUED)
+        running = self.create_task(Task.STATUS_RUNNING)
+        set_task_progress(str(running.id), {"rows": 10})
+        done = self.create_task(Task.STATUS_DONE, result={"rows": 3})
+        failed = self.create_task(Task.STATUS_FAILED, result={"error": "colonne absente"})
+        missing = str(uuid.uuid4())
+        task_ids = [str(enqueued.id), str(running.id), str(done.id), str(failed.id), missing]
+
+        for response in (
+            self.client.get(self.url, {"task_ids": ",".join(task_ids)}),
+            self.client.post(self.url, {"task_ids": task_ids}, format="json"),
+        ):
+            self.assertEqual(response.status_code, 200)
+            tasks = response.json()["tasks"]
+            self.assertEqual(list(tasks), task_ids)
+            self.assertEqual({task_id: task["status"] for task_id, task in tasks.items()}, {
+                str(enqueued.id): "pending",
+                str(running.id): "running",
+                str(done.id): "completed",
+                str(failed.id): "failed",
+                missing: "failed",
+            })
+            self.assertEqual(tasks[str(running.id)]["result"], {"progress": {"rows": 10}})
+            self.assertEqual(tasks[str(done.id)]["result"], {"rows": 3})
+            self.assertEqual(tasks[str(failed.id)]["error"], "colonne absente")
+            self.assertEqual(tasks[missing]["error"], "Tâche non trouvée")
+
+    def test_invalid_task_id(self):
+        response = self.client.get(self.url, {"task_ids": f"{uuid.uuid4()},pas-un-uuid"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("pas-un-uuid", response.json()["error"])
+        response = self.client.post(self.url, {"task_ids": "pas-une-liste"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_too_many_task_ids(self):
+        task_ids = [str(uuid.uuid4()) for _ in range(3)]
+        with mock.patch("django_app_ml.views.app_settings", SimpleNamespace(task_status_batch_max=2)):
+            response = self.client.post(self.url, {"task_ids": task_ids}, format="json")
+            self.assertEqual(response.status_code, 400)
+            # Les doublons ne comptent qu'une fois
+            response = self.client.post(self.url, {"task_ids": task_ids[:2] * 2}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["tasks"]), 2)
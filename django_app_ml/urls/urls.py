@@ -17,6 +17,8 @@ from ..views import (
     TestBucketConnectionView,
     AuditDatasetView,
     AnalyseIAView,
+    TaskEventsView,
+    TaskStatusBatchView,
 )
 from rest_framework.routers import SimpleRouter, DefaultRouter
 
@@ -33,6 +35,8 @@ urlpatterns = [
     path("", MainAppView.as_view(), name="main"),
     path("notebooks/<str:notebook>", MarimoView.as_view(), name="marimo-view"),
     path("predict/", PredictView.as_view(), name="predict"),
+    path("api/tasks/<uuid:task_id>/events/", TaskEventsView.as_view(), name="task-events"),
+    path("api/tasks/status/", TaskStatusBatchView.as_view(), name="task-status-batch"),
     path("api/", include(router.urls)),
     path(
         "api/datasets/<int:dataset_id>/download/",
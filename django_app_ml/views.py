@@ -7,11 +7,12 @@ including data visualization, model training, prediction, and task management.
 
 import base64
 import io
+import json
+import uuid
 import zipfile
 from itertools import chain
 import pandas as pd
 from matplotlib import pyplot as plt
-import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 import requests
 import tempfile
@@ -44,16 +45,20 @@ from core.custom import ShiftTemplateView
 from core.settings import MODEL_PATH
 from home.models import Project
 
+from .app_settings import app_settings
 from .mixins import ParquetQuerySetMixin, TaskViewMixin
 from .models import DataSet, IAModel, ParquetBase, Bucket, MLFlowTemplate, IARecommandation
-from .renderer import CustomScoringAppTemplateRenderer
+from .renderer import CustomScoringAppTemplateRenderer, EventStreamRenderer
 from .serializer import (
     DatasetSerializer,
     IAModelSerializer,
     TaskSerializer,
     BucketSerializer,
 )
-from .task_utils import TaskResultManager
+from .task_utils import TaskResultManager, remember_task_route
+from .task_events import iter_task_events
+from .audit_cache import dataset_fingerprint, get_cached_report, record_cache_result
+from .dataset_audit import AUDIT_MODES
 from .tasks import predict_task, train_task, audit_dataset_task, analyse_ia_task, upload_dataset_task, generate_mlflow_template_task
 from .forms import DatasetForm, ModelIAForm
 from .logging import get_logger
@@ -171,6 +176,7 @@ class PredictView(ScoringAppBaseView):
                     "client": serializer.validated_data,
                 }
             )
+            remember_task_route(task.message_id, task.queue_name, task.actor_name)
             return Response(
                 data={
                     "message_id": task.message_id,
@@ -196,7 +202,7 @@ class MainAppView(ShiftTemplateView):
         """
         context = super().get_context_data(**kwargs)
         context["page_title"] = "ML Platform - plugin Django"
-        context["datasets"] = DataSet.objects.all()
+        context["datasets"] = DataSet.with_last_download_task()
         context["models"] = IAModel.objects.all()
         context["buckets"] = Bucket.objects.all()
         return context
@@ -461,6 +467,79 @@ class TaskViewSet(ReadOnlyModelViewSet):
     lookup_value_regex = "[0-9a-f-]{36}"  # UUID pattern
 
 
+class TaskEventsView(APIView, TaskViewMixin):
+    """
+    Server-Sent Events stream of the status of a task.
+
+    The current status is sent on connection, then every transition
+    (running, progress, completed/failed with the result) as soon as the
+    worker publishes it; the stream closes on the final status. Idle streams
+    get a keep-alive comment and close after ``APP_ML_TASK_EVENTS_TIMEOUT``
+    seconds, the browser's EventSource reconnecting on its own.
+    """
+
+    renderer_classes = [EventStreamRenderer, JSONRenderer]
+
+    def get(self, request, task_id):
+        task_id = str(task_id)
+        response = StreamingHttpResponse(self.event_stream(task_id), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        # Disable proxy buffering (nginx) so events are delivered immediately
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def event_stream(self, task_id):
+        """
+        Format the task events as SSE frames
+        """
+        yield "retry: 5000\n\n"
+        for event in iter_task_events(task_id, initial=lambda: self.get_task_status(task_id).data):
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"data: {json.dumps(event, default=str)}\n\n"
+
+
+class TaskStatusBatchView(APIView, TaskViewMixin):
+    """
+    Status of many tasks in one request.
+
+    Accepts ``{"task_ids": [...]}`` in a POST body or a comma-separated
+    ``?task_ids=`` query parameter and returns ``{"tasks": {task_id: status}}``,
+    each status having the same shape as the single task status responses.
+    Task rows are loaded in one query and results read in one result backend
+    round trip, so a page tracking many tasks polls a single endpoint.
+    """
+
+    def get(self, request):
+        task_ids = [task_id for task_id in request.query_params.get("task_ids", "").split(",") if task_id]
+        return self.batch_status(task_ids)
+
+    def post(self, request):
+        task_ids = request.data.get("task_ids") or []
+        if not isinstance(task_ids, list):
+            return Response({"error": "task_ids doit être une liste"}, status=status.HTTP_400_BAD_REQUEST)
+        return self.batch_status([str(task_id) for task_id in task_ids])
+
+    def batch_status(self, task_ids):
+        """
+        Build the batch status response for the given task ids
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        if len(task_ids) > app_settings.task_status_batch_max:
+            return Response(
+                {"error": f"Au plus {app_settings.task_status_batch_max} tâches par requête"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        for task_id in task_ids:
+            try:
+                uuid.UUID(task_id)
+            except ValueError:
+                return Response({"error": f"Identifiant de tâche invalide: {task_id}"},
+                                status=status.HTTP_400_BAD_REQUEST)
+        return Response({"tasks": self.get_task_statuses(task_ids)})
+
+
 @method_decorator(cache_page(60 * 10), name="dispatch")  # Cache for 10 minutes
 class IAModelModelViewSet(ModelViewSet):
     """
@@ -488,6 +567,56 @@ class DatasetModelViewSet(ModelViewSet):
         return DataSet.objects.all()
 
 
+ZIP_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class _ZipStreamBuffer(io.RawIOBase):
+    """
+    Non-seekable sink collecting what ``zipfile`` writes until it is drained.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def zip_stream(arcname, chunks):
+    """
+    Build a single-entry ZIP archive on the fly.
+
+    ``zipfile`` writes data descriptors when its output is not seekable, so
+    each compressed block can be sent as soon as it is produced.
+
+    Args:
+        arcname: Name of the file inside the archive
+        chunks: Iterable of the file content
+
+    Yields:
+        bytes: Successive pieces of the archive
+    """
+    buffer = _ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zipf:
+        with zipf.open(arcname, "w", force_zip64=True) as entry:
+            yield buffer.drain()
+            for chunk in chunks:
+                entry.write(chunk)
+                data = buffer.drain()
+                if data:
+                    yield data
+    yield buffer.drain()
+
+
 class DatasetDownloadView(APIView, TaskViewMixin):
     """
     API view for downloading dataset to S3 bucket or local ZIP file.
@@ -496,46 +625,31 @@ class DatasetDownloadView(APIView, TaskViewMixin):
 
     def download_dataset_as_zip(self, dataset):
         """
-        Download dataset from URL and create a ZIP file directly during streaming.
+        Download dataset from URL and zip it on the fly while streaming.
         
         Args:
             dataset: DataSet instance
             
         Returns:
-            tuple: (success: bool, zip_content: bytes or None, filename: str or None, error: str or None)
+            tuple: (success: bool, zip_stream: iterator of bytes or None, filename: str or None, error: str or None)
         """
         try:
-            # Download the file from URL
+            # Open the upstream download; errors before the first byte are still reported as JSON
             response = requests.get(dataset.link, stream=True)
             response.raise_for_status()
-            
-            # Create ZIP file in memory
-            zip_buffer = io.BytesIO()
-            
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Stream the content directly to the ZIP
-                file_content = b''
-                for chunk in response.iter_content(chunk_size=8192):
-                    file_content += chunk
-                
-                # Add the file to the ZIP
-                zipf.writestr(f"{dataset.name}.zip", file_content)
-            
-            # Get the ZIP content
-            zip_buffer.seek(0)
-            zip_content = zip_buffer.getvalue()
-            
-            # Generate ZIP filename
-            zip_filename = f"{dataset.name}_v{dataset.version}.zip"
-            
-            return True, zip_content, zip_filename, None
-                
         except requests.RequestException as e:
             logger.error(f"Error downloading dataset from {dataset.link}: {e}")
             return False, None, None, f"Erreur lors du téléchargement: {str(e)}"
-        except Exception as e:
-            logger.error(f"Error creating ZIP file for dataset {dataset.name}: {e}")
-            return False, None, None, f"Erreur lors de la création du ZIP: {str(e)}"
+
+        def chunks():
+            try:
+                yield from response.iter_content(chunk_size=ZIP_STREAM_CHUNK_SIZE)
+            finally:
+                response.close()
+
+        # Generate ZIP filename
+        zip_filename = f"{dataset.name}_v{dataset.version}.zip"
+        return True, zip_stream(f"{dataset.name}.zip", chunks()), zip_filename, None
 
     def get(self, request, dataset_id):
         """
@@ -568,16 +682,18 @@ class DatasetDownloadView(APIView, TaskViewMixin):
                     task_func=upload_dataset_task,
                     task_kwargs={"dataset_id": dataset_id},
                     success_message="Tâche d'upload lancée avec succès",
-                    error_message="Erreur lors du lancement de la tâche d'upload"
+                    error_message="Erreur lors du lancement de la tâche d'upload",
+                    link_to=dataset,
                 )
             else:
                 # No bucket configured, download as ZIP file
                 success, zip_content, filename, error = self.download_dataset_as_zip(dataset)
                 
                 if success:
-                    # Return ZIP file as download
-                    response = HttpResponse(zip_content, content_type='application/zip')
+                    # Stream the ZIP as it is built: constant memory, no Content-Length
+                    response = StreamingHttpResponse(zip_content, content_type='application/zip')
                     response['Content-Disposition'] = f'attachment; filename="{filename}"'
+                    response['Accept-Ranges'] = 'none'
                     return response
                 else:
                     return Response(
@@ -615,16 +731,8 @@ class TestBucketConnectionView(APIView):
         try:
             bucket = Bucket.objects.get(id=bucket_id)
 
-            s3_client = boto3.client(
-                "s3",
-                aws_access_key_id=bucket.access_key,
-                aws_secret_access_key=bucket.secret_key,
-                region_name=bucket.region,
-                endpoint_url=bucket.endpoint,
-            )
-
             # Try to list objects in the specific bucket to confirm connection
-            s3_client.list_objects_v2(Bucket=bucket.bucket_name, MaxKeys=1)
+            bucket.s3_client.list_objects_v2(Bucket=bucket.bucket_name, MaxKeys=1)
 
             return Response(data={"success": True, "message": "Connexion réussie"})
 
@@ -657,16 +765,47 @@ class AuditDatasetView(APIView, TaskViewMixin):
     def post(self, request, dataset_id):
         """
         Launch an audit task for a dataset.
+
+        If the dataset content is unchanged since the last audit, the stored
+        report is returned immediately unless ``force`` is set. ``mode`` selects
+        the audit mode ("memory", "streaming", "incremental" or "quick").
         """
         try:
+            dataset = DataSet.objects.get(id=dataset_id)
+            force = str(request.data.get("force", "false")).lower() in ("1", "true", "yes")
+            mode = request.data.get("mode") or None
+            if mode is not None and mode not in AUDIT_MODES:
+                return self._format_task_response(
+                    status="failed",
+                    message="Mode d'audit non supporté",
+                    task_id=None,
+                    error=f"Mode d'audit non supporté: {mode}",
+                    http_status=status.HTTP_400_BAD_REQUEST,
+                )
+            if not force:
+                cached = get_cached_report(dataset, dataset_fingerprint(dataset))
+                if cached is not None:
+                    # Un miss est comptabilisé par la tâche elle-même
+                    record_cache_result(hit=True)
+                    return self._format_task_response(
+                        status="completed",
+                        message="Audit servi depuis le cache",
+                        task_id=None,
+                        result=TaskResult(
+                            error=False, results=cached.report, message="Audit servi depuis le cache"
+                        ).dict(),
+                    )
             return self.launch_task(
                 task_func=audit_dataset_task,
                 task_kwargs={
                     "dataset_id": dataset_id,
                     "save_report": False,
+                    "mode": mode,
+                    "force": force,
                 },
                 success_message="Audit lancé avec succès",
-                error_message="Erreur lors du lancement de l'audit"
+                error_message="Erreur lors du lancement de l'audit",
+                link_to=dataset,
             )
         except DataSet.DoesNotExist:
             return self._format_task_response(
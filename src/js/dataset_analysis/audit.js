@@ -74,7 +74,7 @@ export function initializeAnalysis() {
         
         launchButton.addEventListener('click', function(e) {
             e.preventDefault();
-            launchAnalysis();
+            launchAnalysis(launchButton.getAttribute('data-mode'));
         });
     }
     
@@ -95,8 +95,9 @@ export function initializeAnalysis() {
 
 /**
  * Launch audit analysis
+ * @param {string|null} mode - Audit mode ("quick" for a sampled audit followed by a full one)
  */
-function launchAnalysis() {
+function launchAnalysis(mode = null) {
     const launchButton = document.getElementById(AUDIT_CONFIG.launchBtn);
     
     if (!launchButton) {
@@ -142,6 +143,11 @@ function launchAnalysis() {
         (errorMessage, errorDetails) => {
             showAnalysisError(errorMessage, errorDetails, null);
             showLaunchButton();
+        },
+        mode ? { mode } : {},
+        (results) => {
+            showAnalysisResults(results);
+            showRelaunchButton();
         }
     );
 }
@@ -360,6 +366,15 @@ function createAuditAccordion(results) {
     }
     
     accordionHtml += '</div>';
+    if (results.sampling) {
+        const sampling = results.sampling;
+        accordionHtml = `
+            <div class="alert alert-warning py-2">
+                <i class="fas fa-flask"></i> Estimation sur ${sampling.sample_size.toLocaleString()} lignes
+                sur ${sampling.population_size.toLocaleString()} (intervalles de confiance à ${Math.round(sampling.confidence_level * 100)} %).
+            </div>
+        ` + accordionHtml;
+    }
     resultsDiv.innerHTML = accordionHtml;
     
     if (results.basic_info) fillBasicInfoContent(results.basic_info);
@@ -464,11 +479,11 @@ function fillDescriptiveStatsContent(descriptiveStats) {
         tableRows += `
             <tr>
                 <td>${column}</td>
-                <td>${formatNumber(stats.mean)}</td>
+                <td>${formatNumber(stats.mean)}${formatInterval(stats.mean_ci)}</td>
                 <td>${formatNumber(stats.std)}</td>
                 <td>${formatNumber(stats.min)}</td>
                 <td>${formatNumber(stats.max)}</td>
-                <td>${formatNumber(stats.median)}</td>
+                <td>${formatNumber(stats.median)}${formatInterval(stats.median_ci)}</td>
             </tr>
         `;
     });
@@ -494,6 +509,14 @@ function fillDescriptiveStatsContent(descriptiveStats) {
     `;
 }
 
+/**
+ * Format a confidence interval reported by a quick audit
+ */
+function formatInterval(interval) {
+    if (!interval) return '';
+    return `<br><small class="text-muted">[${formatNumber(interval.lower)} ; ${formatNumber(interval.upper)}]</small>`;
+}
+
 /**
  * Fill categorical stats content
  */
@@ -3,7 +3,7 @@
  * Gestion des tâches et fonctions utilitaires
  */
 
-import { getCookie, pollTaskStatus, launchTaskAndPoll } from '../task.js';
+import { getCookie, followTaskEvents, pollTaskStatus, launchTaskAndPoll } from '../task.js';
 
 /**
  * Handle standardized API responses
@@ -192,97 +192,107 @@ export function pollAnalysisStatus(type, config, datasetId, taskId, onComplete,
         const maxAttempts = 60;
         let attempts = 0;
         
-        const checkStatus = () => {
-            attempts++;
+        let streaming = false;
+        
+        const handleStatus = (data) => {
+            const response = handleStandardizedResponse(data);
             
-            fetch(`${endpoint}?task_id=${taskId}`, {
-                method: 'GET',
-                headers: {
-                    'X-CSRFToken': getCookie("csrftoken"),
-                    'Accept': 'application/json'
-                }
-            })
-            .then(response => response.json())
-            .then(data => {
-                const response = handleStandardizedResponse(data);
-                
-                if (response.isValid) {
-                    if (response.status === 'pending') {
-                        if (element) {
-                            element.innerHTML = '<i class="fas fa-clock"></i> En attente...';
-                        }
-                        if (attempts < maxAttempts) {
-                            setTimeout(checkStatus, 2000);
-                        } else {
-                            onError('Timeout: La tâche prend trop de temps', null, null);
-                            if (element && originalText) {
-                                element.innerHTML = originalText;
-                                element.style.pointerEvents = 'auto';
-                            }
-                        }
-                    } else if (response.status === 'running') {
-                        if (element) {
-                            element.innerHTML = '<i class="fas fa-spinner fa-spin"></i> En cours...';
-                        }
-                        if (attempts < maxAttempts) {
-                            setTimeout(checkStatus, 2000);
-                        } else {
-                            onError('Timeout: La tâche prend trop de temps', null, null);
-                            if (element && originalText) {
-                                element.innerHTML = originalText;
-                                element.style.pointerEvents = 'auto';
-                            }
-                        }
-                    } else if (response.status === 'completed') {
-                        if (element) {
-                            element.innerHTML = '<i class="fas fa-check"></i> Terminé';
-                        }
-                        onComplete(response.result);
-                    } else if (response.status === 'failed') {
+            if (response.isValid) {
+                if (response.status === 'pending') {
+                    if (element) {
+                        element.innerHTML = '<i class="fas fa-clock"></i> En attente...';
+                    }
+                    if (streaming) {
+                        return;
+                    }
+                    if (attempts < maxAttempts) {
+                        setTimeout(checkStatus, 2000);
+                    } else {
+                        onError('Timeout: La tâche prend trop de temps', null, null);
                         if (element && originalText) {
                             element.innerHTML = originalText;
                             element.style.pointerEvents = 'auto';
                         }
-                        let errorMessage = response.error || response.message || `L'analyse a échoué`;
-                        let errorDetails = null;
-                        
-                        if (response.result) {
-                            errorDetails = response.result;
-                            if (response.result.error) {
-                                errorMessage = response.result.error;
-                            } else if (response.result.detail) {
-                                errorMessage = response.result.detail;
-                            } else if (response.result.message) {
-                                errorMessage = response.result.message;
-                            }
-                        }
-                        
-                        onError(errorMessage, errorDetails, {
-                            task_id: response.task_id,
-                            status: response.status,
-                            message: response.message
-                        });
+                    }
+                } else if (response.status === 'running') {
+                    if (element) {
+                        element.innerHTML = '<i class="fas fa-spinner fa-spin"></i> En cours...';
+                    }
+                    if (streaming) {
+                        return;
+                    }
+                    if (attempts < maxAttempts) {
+                        setTimeout(checkStatus, 2000);
                     } else {
+                        onError('Timeout: La tâche prend trop de temps', null, null);
                         if (element && originalText) {
                             element.innerHTML = originalText;
                             element.style.pointerEvents = 'auto';
                         }
-                        onError(`Statut inconnu: ${response.status}`, null, {
-                            task_id: response.task_id,
-                            status: response.status
-                        });
                     }
+                } else if (response.status === 'completed') {
+                    if (element) {
+                        element.innerHTML = '<i class="fas fa-check"></i> Terminé';
+                    }
+                    onComplete(response.result);
+                } else if (response.status === 'failed') {
+                    if (element && originalText) {
+                        element.innerHTML = originalText;
+                        element.style.pointerEvents = 'auto';
+                    }
+                    let errorMessage = response.error || response.message || `L'analyse a échoué`;
+                    let errorDetails = null;
+                    
+                    if (response.result) {
+                        errorDetails = response.result;
+                        if (response.result.error) {
+                            errorMessage = response.result.error;
+                        } else if (response.result.detail) {
+                            errorMessage = response.result.detail;
+                        } else if (response.result.message) {
+                            errorMessage = response.result.message;
+                        }
+                    }
+                    
+                    onError(errorMessage, errorDetails, {
+                        task_id: response.task_id,
+                        status: response.status,
+                        message: response.message
+                    });
                 } else {
                     if (element && originalText) {
                         element.innerHTML = originalText;
                         element.style.pointerEvents = 'auto';
                     }
-                    onError(response.error || `Statut de tâche inattendu`, null, {
+                    onError(`Statut inconnu: ${response.status}`, null, {
                         task_id: response.task_id,
                         status: response.status
                     });
                 }
+            } else {
+                if (element && originalText) {
+                    element.innerHTML = originalText;
+                    element.style.pointerEvents = 'auto';
+                }
+                onError(response.error || `Statut de tâche inattendu`, null, {
+                    task_id: response.task_id,
+                    status: response.status
+                });
+            }
+        };
+        
+        const checkStatus = () => {
+            attempts++;
+            
+            fetch(`${endpoint}?task_id=${taskId}`, {
+                method: 'GET',
+                headers: {
+                    'X-CSRFToken': getCookie("csrftoken"),
+                    'Accept': 'application/json'
+                }
             })
+            .then(response => response.json())
+            .then(handleStatus)
             .catch(error => {
                 console.error(`Erreur lors de la vérification du statut:`, error);
                 if (element && originalText) {
@@ -293,7 +303,11 @@ export function pollAnalysisStatus(type, config, datasetId, taskId, onComplete,
             });
         };
         
-        checkStatus();
+        // Suivre les événements poussés par le serveur, ou à défaut interroger le statut
+        followTaskEvents(taskId, (data) => {
+            streaming = true;
+            handleStatus(data);
+        }, checkStatus);
     };
     
     // Démarrer le polling adapté
@@ -303,7 +317,7 @@ export function pollAnalysisStatus(type, config, datasetId, taskId, onComplete,
 /**
  * Launch analysis task
  */
-export function launchAnalysisTask(analysisUrl, onSuccess, onError) {
+export function launchAnalysisTask(analysisUrl, onSuccess, onError, payload = {}, onCompleted = null) {
     return fetch(analysisUrl, {
         method: 'POST',
         headers: {
@@ -311,6 +325,7 @@ export function launchAnalysisTask(analysisUrl, onSuccess, onError) {
             'Content-Type': 'application/json',
             'X-CSRFToken': getCookie('csrftoken')
         },
+        body: JSON.stringify(payload),
     })
     .then(response => response.json())
     .then(data => {
@@ -319,6 +334,9 @@ export function launchAnalysisTask(analysisUrl, onSuccess, onError) {
         if (response.isValid) {
             if (response.status === 'pending' && response.task_id) {
                 onSuccess(response.task_id);
+            } else if (response.status === 'completed' && response.result && onCompleted) {
+                // Résultat déjà disponible (cache), aucune tâche lancée
+                onCompleted(response.result);
             } else if (response.status === 'failed') {
                 throw new Error(response.error || response.message || `Erreur lors du lancement de l'analyse`);
             } else {
@@ -14,6 +14,39 @@ function getCookie(name) {
     return cookieValue;
 }
 
+// URL du flux Server-Sent Events d'une tâche
+function taskEventsUrl(taskId) {
+    return `/ml_app/api/tasks/${taskId}/events/`;
+}
+
+// Suit les changements d'état d'une tâche poussés par le serveur (SSE).
+// onData reçoit chaque état (même format que les réponses de statut) ;
+// onUnavailable est appelé si le flux ne peut pas être ouvert, pour revenir au polling.
+function followTaskEvents(taskId, onData, onUnavailable) {
+    if (!window.EventSource) {
+        onUnavailable();
+        return null;
+    }
+    const source = new EventSource(taskEventsUrl(taskId));
+    let received = false;
+    source.onmessage = (event) => {
+        received = true;
+        const data = JSON.parse(event.data);
+        if (data.status === 'completed' || data.status === 'failed') {
+            source.close();
+        }
+        onData(data);
+    };
+    source.onerror = () => {
+        // Après un premier événement, EventSource se reconnecte tout seul
+        if (!received) {
+            source.close();
+            onUnavailable();
+        }
+    };
+    return source;
+}
+
 // Fonction pour vérifier le statut d'une tâche d'upload
 function pollUploadStatus(taskId, downloadLink, originalText) {
     const maxAttempts = 60; // 5 minutes max (60 * 5 secondes)
@@ -23,6 +56,52 @@ function pollUploadStatus(taskId, downloadLink, originalText) {
     const datasetIdMatch = downloadLink.href.match(/\/datasets\/(\d+)\/download/);
     const datasetId = datasetIdMatch ? datasetIdMatch[1] : '1';
     
+    let streaming = false;
+    
+    const handleStatus = (data) => {
+        console.log('Upload status:', data);
+        
+        if (data.status === 'pending') {
+            downloadLink.innerHTML = '<i class="fas fa-clock"></i> En attente...';
+            if (streaming) {
+                return;
+            }
+            if (attempts < maxAttempts) {
+                setTimeout(checkStatus, 5000); // Vérifier toutes les 5 secondes
+            } else {
+                alert('Timeout: La tâche d\'upload prend trop de temps');
+                downloadLink.innerHTML = originalText;
+                downloadLink.style.pointerEvents = 'auto';
+            }
+        } else if (data.status === 'running') {
+            downloadLink.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Upload en cours...';
+            if (streaming) {
+                return;
+            }
+            if (attempts < maxAttempts) {
+                setTimeout(checkStatus, 5000); // Vérifier toutes les 5 secondes
+            } else {
+                alert('Timeout: La tâche d\'upload prend trop de temps');
+                downloadLink.innerHTML = originalText;
+                downloadLink.style.pointerEvents = 'auto';
+            }
+        } else if (data.status === 'completed') {
+            downloadLink.innerHTML = '<i class="fas fa-check"></i> Terminé';
+            setTimeout(() => {
+                alert('Dataset uploadé avec succès vers S3 !');
+                window.location.reload(); // Recharger la page pour mettre à jour l'état
+            }, 1000);
+        } else if (data.status === 'failed') {
+            downloadLink.innerHTML = originalText;
+            downloadLink.style.pointerEvents = 'auto';
+            alert('Erreur lors de l\'upload: ' + (data.error || 'Erreur inconnue'));
+        } else {
+            downloadLink.innerHTML = originalText;
+            downloadLink.style.pointerEvents = 'auto';
+            alert('Statut inconnu: ' + data.status);
+        }
+    };
+    
     const checkStatus = () => {
         attempts++;
         
@@ -37,43 +116,7 @@ function pollUploadStatus(taskId, downloadLink, originalText) {
             }
         })
         .then(response => response.json())
-        .then(data => {
-            console.log('Upload status:', data);
-            
-            if (data.status === 'pending') {
-                downloadLink.innerHTML = '<i class="fas fa-clock"></i> En attente...';
-                if (attempts < maxAttempts) {
-                    setTimeout(checkStatus, 5000); // Vérifier toutes les 5 secondes
-                } else {
-                    alert('Timeout: La tâche d\'upload prend trop de temps');
-                    downloadLink.innerHTML = originalText;
-                    downloadLink.style.pointerEvents = 'auto';
-                }
-            } else if (data.status === 'running') {
-                downloadLink.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Upload en cours...';
-                if (attempts < maxAttempts) {
-                    setTimeout(checkStatus, 5000); // Vérifier toutes les 5 secondes
-                } else {
-                    alert('Timeout: La tâche d\'upload prend trop de temps');
-                    downloadLink.innerHTML = originalText;
-                    downloadLink.style.pointerEvents = 'auto';
-                }
-            } else if (data.status === 'completed') {
-                downloadLink.innerHTML = '<i class="fas fa-check"></i> Terminé';
-                setTimeout(() => {
-                    alert('Dataset uploadé avec succès vers S3 !');
-                    window.location.reload(); // Recharger la page pour mettre à jour l'état
-                }, 1000);
-            } else if (data.status === 'failed') {
-                downloadLink.innerHTML = originalText;
-                downloadLink.style.pointerEvents = 'auto';
-                alert('Erreur lors de l\'upload: ' + (data.error || 'Erreur inconnue'));
-            } else {
-                downloadLink.innerHTML = originalText;
-                downloadLink.style.pointerEvents = 'auto';
-                alert('Statut inconnu: ' + data.status);
-            }
-        })
+        .then(handleStatus)
         .catch(error => {
             console.error('Erreur lors de la vérification du statut:', error);
             downloadLink.innerHTML = originalText;
@@ -82,8 +125,11 @@ function pollUploadStatus(taskId, downloadLink, originalText) {
         });
     };
     
-    // Démarrer la vérification
-    checkStatus();
+    // Suivre les événements poussés par le serveur, ou à défaut interroger le statut
+    followTaskEvents(taskId, (data) => {
+        streaming = true;
+        handleStatus(data);
+    }, checkStatus);
 }
 
 // Fonction générique pour vérifier le statut d'une tâche
@@ -91,68 +137,78 @@ function pollTaskStatus(taskId, endpoint, element, originalText, taskName = "Tâ
     const maxAttempts = 60; // 5 minutes max (60 * 5 secondes)
     let attempts = 0;
     
-    const checkStatus = () => {
-        attempts++;
+    let streaming = false;
+    
+    const handleStatus = (data) => {
+        console.log(`${taskName} status:`, data);
         
-        fetch(`${endpoint}?task_id=${taskId}`, {
-            method: 'GET',
-            headers: {
-                'X-CSRFToken': getCookie("csrftoken"),
-                'Accept': 'application/json'
+        if (data.status === 'pending') {
+            if (element) {
+                element.innerHTML = '<i class="fas fa-clock"></i> En attente...';
             }
-        })
-        .then(response => response.json())
-        .then(data => {
-            console.log(`${taskName} status:`, data);
-            
-            if (data.status === 'pending') {
-                if (element) {
-                    element.innerHTML = '<i class="fas fa-clock"></i> En attente...';
-                }
-                if (attempts < maxAttempts) {
-                    setTimeout(checkStatus, 5000);
-                } else {
-                    alert(`Timeout: La ${taskName.toLowerCase()} prend trop de temps`);
-                    if (element && originalText) {
-                        element.innerHTML = originalText;
-                        element.style.pointerEvents = 'auto';
-                    }
-                }
-            } else if (data.status === 'running') {
-                if (element) {
-                    element.innerHTML = '<i class="fas fa-spinner fa-spin"></i> En cours...';
-                }
-                if (attempts < maxAttempts) {
-                    setTimeout(checkStatus, 5000);
-                } else {
-                    alert(`Timeout: La ${taskName.toLowerCase()} prend trop de temps`);
-                    if (element && originalText) {
-                        element.innerHTML = originalText;
-                        element.style.pointerEvents = 'auto';
-                    }
-                }
-            } else if (data.status === 'completed') {
-                if (element) {
-                    element.innerHTML = '<i class="fas fa-check"></i> Terminé';
-                }
-                setTimeout(() => {
-                    alert(`${taskName} terminée avec succès !`);
-                    window.location.reload();
-                }, 1000);
-            } else if (data.status === 'failed') {
+            if (streaming) {
+                return;
+            }
+            if (attempts < maxAttempts) {
+                setTimeout(checkStatus, 5000);
+            } else {
+                alert(`Timeout: La ${taskName.toLowerCase()} prend trop de temps`);
                 if (element && originalText) {
                     element.innerHTML = originalText;
                     element.style.pointerEvents = 'auto';
                 }
-                alert(`Erreur lors de la ${taskName.toLowerCase()}: ` + (data.error || 'Erreur inconnue'));
+            }
+        } else if (data.status === 'running') {
+            if (element) {
+                element.innerHTML = '<i class="fas fa-spinner fa-spin"></i> En cours...';
+            }
+            if (streaming) {
+                return;
+            }
+            if (attempts < maxAttempts) {
+                setTimeout(checkStatus, 5000);
             } else {
+                alert(`Timeout: La ${taskName.toLowerCase()} prend trop de temps`);
                 if (element && originalText) {
                     element.innerHTML = originalText;
                     element.style.pointerEvents = 'auto';
                 }
-                alert('Statut inconnu: ' + data.status);
+            }
+        } else if (data.status === 'completed') {
+            if (element) {
+                element.innerHTML = '<i class="fas fa-check"></i> Terminé';
+            }
+            setTimeout(() => {
+                alert(`${taskName} terminée avec succès !`);
+                window.location.reload();
+            }, 1000);
+        } else if (data.status === 'failed') {
+            if (element && originalText) {
+                element.innerHTML = originalText;
+                element.style.pointerEvents = 'auto';
+            }
+            alert(`Erreur lors de la ${taskName.toLowerCase()}: ` + (data.error || 'Erreur inconnue'));
+        } else {
+            if (element && originalText) {
+                element.innerHTML = originalText;
+                element.style.pointerEvents = 'auto';
+            }
+            alert('Statut inconnu: ' + data.status);
+        }
+    };
+    
+    const checkStatus = () => {
+        attempts++;
+        
+        fetch(`${endpoint}?task_id=${taskId}`, {
+            method: 'GET',
+            headers: {
+                'X-CSRFToken': getCookie("csrftoken"),
+                'Accept': 'application/json'
             }
         })
+        .then(response => response.json())
+        .then(handleStatus)
         .catch(error => {
             console.error(`Erreur lors de la vérification du statut de la ${taskName.toLowerCase()}:`, error);
             if (element && originalText) {
@@ -163,8 +219,11 @@ function pollTaskStatus(taskId, endpoint, element, originalText, taskName = "Tâ
         });
     };
     
-    // Démarrer la vérification
-    checkStatus();
+    // Suivre les événements poussés par le serveur, ou à défaut interroger le statut
+    followTaskEvents(taskId, (data) => {
+        streaming = true;
+        handleStatus(data);
+    }, checkStatus);
 }
 
 // Fonction pour récupérer le statut d'une tâche (utilisée par train.js)
@@ -232,6 +291,7 @@ function launchTaskAndPoll(taskEndpoint, taskData, element, originalText, taskNa
 
 export {
     getCookie,
+    followTaskEvents,
     pollUploadStatus,
     pollTaskStatus,
     launchTaskAndPoll,